@@ -18,6 +18,7 @@ from dataclasses import dataclass, field
 import torch
 
 from lerobot.robots.config import RobotConfig
+from lerobot.transport.serialization import ENCODINGS
 
 from .constants import (
     DEFAULT_FPS,
@@ -64,6 +65,24 @@ class PolicyServerConfig:
         default=DEFAULT_OBS_QUEUE_TIMEOUT, metadata={"help": "Timeout for observation queue in seconds"}
     )
 
+    # Batching configuration. Observations of concurrent clients are stacked into a single policy call.
+    max_batch_size: int = field(
+        default=1, metadata={"help": "Maximum number of clients' observations run through the policy at once"}
+    )
+    batch_timeout: float = field(
+        default=0.01,
+        metadata={"help": "Maximum time to wait for other clients' observations to fill a batch, in seconds"},
+    )
+    max_clients: int = field(default=4, metadata={"help": "Maximum number of concurrently connected clients"})
+    client_timeout: float = field(
+        default=10.0,
+        metadata={"help": "Time after which a client not sending any request is disconnected, in seconds"},
+    )
+    metrics_log_interval: float = field(
+        default=10.0,
+        metadata={"help": "Interval at which throughput and latency metrics are logged, in seconds"},
+    )
+
     def __post_init__(self):
         """Validate configuration after initialization."""
         if self.port < 1 or self.port > 65535:
@@ -78,6 +97,18 @@ class PolicyServerConfig:
         if self.obs_queue_timeout < 0:
             raise ValueError(f"obs_queue_timeout must be non-negative, got {self.obs_queue_timeout}")
 
+        if self.max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be positive, got {self.max_batch_size}")
+
+        if self.batch_timeout < 0:
+            raise ValueError(f"batch_timeout must be non-negative, got {self.batch_timeout}")
+
+        if self.max_clients < 1:
+            raise ValueError(f"max_clients must be positive, got {self.max_clients}")
+
+        if self.client_timeout <= 0:
+            raise ValueError(f"client_timeout must be positive, got {self.client_timeout}")
+
     @classmethod
     def from_dict(cls, config_dict: dict) -> "PolicyServerConfig":
         """Create a PolicyServerConfig from a dictionary."""
@@ -96,6 +127,11 @@ class PolicyServerConfig:
             "fps": self.fps,
             "environment_dt": self.environment_dt,
             "inference_latency": self.inference_latency,
+            "max_batch_size": self.max_batch_size,
+            "batch_timeout": self.batch_timeout,
+            "max_clients": self.max_clients,
+            "client_timeout": self.client_timeout,
+            "metrics_log_interval": self.metrics_log_interval,
         }
 
 
@@ -131,12 +167,34 @@ class RobotClientConfig:
     chunk_size_threshold: float = field(default=0.5, metadata={"help": "Threshold for chunk size control"})
     fps: int = field(default=DEFAULT_FPS, metadata={"help": "Frames per second"})
 
+    # Latency compensation configuration. When enabled, observations are also sent as soon as the actions left in
+    # the queue last less than the estimated observation -> action chunk latency, to avoid running out of actions.
+    latency_compensation: bool = field(
+        default=False, metadata={"help": "Send observations early enough to hide the measured latency"}
+    )
+    latency_ema_alpha: float = field(
+        default=0.1, metadata={"help": "Smoothing factor of the moving latency estimate"}
+    )
+    latency_std_factor: float = field(
+        default=2.0,
+        metadata={
+            "help": "Number of standard deviations added to the average latency to cover latency spikes"
+        },
+    )
+
     # Aggregate function configuration (CLI-compatible)
     aggregate_fn_name: str = field(
         default="weighted_average",
         metadata={"help": f"Name of aggregate function to use. Options: {list(AGGREGATE_FUNCTIONS.keys())}"},
     )
 
+    # Observation serialization configuration
+    image_encoding: str = field(
+        default="raw",
+        metadata={"help": f"Encoding of the camera frames sent to the server. Options: {ENCODINGS}"},
+    )
+    jpeg_quality: int = field(default=90, metadata={"help": "JPEG quality, if image_encoding is 'jpeg'"})
+
     # Debug configuration
     debug_visualize_queue_size: bool = field(
         default=False, metadata={"help": "Visualize the action queue size"}
@@ -170,6 +228,18 @@ class RobotClientConfig:
         if self.actions_per_chunk <= 0:
             raise ValueError(f"actions_per_chunk must be positive, got {self.actions_per_chunk}")
 
+        if self.latency_ema_alpha <= 0 or self.latency_ema_alpha > 1:
+            raise ValueError(f"latency_ema_alpha must be in (0, 1], got {self.latency_ema_alpha}")
+
+        if self.latency_std_factor < 0:
+            raise ValueError(f"latency_std_factor must be non-negative, got {self.latency_std_factor}")
+
+        if self.image_encoding not in ENCODINGS:
+            raise ValueError(f"image_encoding must be one of {ENCODINGS}, got {self.image_encoding}")
+
+        if self.jpeg_quality < 0 or self.jpeg_quality > 100:
+            raise ValueError(f"jpeg_quality must be between 0 and 100, got {self.jpeg_quality}")
+
         self.aggregate_fn = get_aggregate_function(self.aggregate_fn_name)
 
     @classmethod
@@ -188,6 +258,11 @@ class RobotClientConfig:
             "fps": self.fps,
             "actions_per_chunk": self.actions_per_chunk,
             "task": self.task,
+            "latency_compensation": self.latency_compensation,
+            "latency_ema_alpha": self.latency_ema_alpha,
+            "latency_std_factor": self.latency_std_factor,
+            "image_encoding": self.image_encoding,
+            "jpeg_quality": self.jpeg_quality,
             "debug_visualize_queue_size": self.debug_visualize_queue_size,
             "aggregate_fn_name": self.aggregate_fn_name,
         }
@@ -14,10 +14,12 @@
 
 import logging
 import logging.handlers
+import math
 import os
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
 
 import torch
 
@@ -34,6 +36,7 @@ from lerobot.policies import (  # noqa: F401
     VQBeTConfig,
 )
 from lerobot.robots.robot import Robot
+from lerobot.transport.serialization import deserialize, serialize
 from lerobot.utils.constants import OBS_IMAGES, OBS_STATE, OBS_STR
 from lerobot.utils.utils import init_logging
 
@@ -48,6 +51,9 @@ LeRobotObservation = dict[str, torch.Tensor]
 # observation, ready for policy inference (image keys resized)
 Observation = dict[str, torch.Tensor]
 
+# prefix of the raw observation keys in serialized TimedObservations
+OBSERVATION_WIRE_PREFIX = "observation/"
+
 
 def visualize_action_queue_size(action_queue_size: list[int]) -> None:
     import matplotlib.pyplot as plt
@@ -171,6 +177,33 @@ def prepare_raw_observation(
     return {**state_dict, **image_dict}
 
 
+def collate_observations(observations: list[Observation]) -> Observation:
+    """Stack preprocessed observations (each with a batch dimension) into a single batch.
+
+    Tensors of different shapes (e.g. language tokens of different lengths) are right-padded with zeros to the
+    largest shape, and lists (e.g. task instructions) are concatenated.
+    """
+    batch = {}
+    for key, value in observations[0].items():
+        values = [observation[key] for observation in observations]
+        if isinstance(value, torch.Tensor):
+            shape = [max(dims) for dims in zip(*(v.shape[1:] for v in values), strict=True)]
+            padded_values = []
+            for v in values:
+                if list(v.shape[1:]) != shape:
+                    padded = v.new_zeros((v.shape[0], *shape))
+                    padded[tuple(slice(0, dim) for dim in v.shape)] = v
+                    v = padded
+                padded_values.append(v)
+            batch[key] = torch.cat(padded_values, dim=0)
+        elif isinstance(value, list):
+            batch[key] = [item for v in values for item in v]
+        else:
+            batch[key] = value
+
+    return batch
+
+
 def get_logger(name: str, log_to_file: bool = True) -> logging.Logger:
     """
     Get a logger using the standardized logging setup from utils.py.
@@ -261,6 +294,108 @@ class FPSTracker:
         self.total_obs_count = 0
 
 
+@dataclass
+class LatencyEstimator:
+    """Moving estimate of the latency between capturing an observation and receiving its action chunk.
+
+    Tracks exponential moving averages of the latency and of its variance, and estimates the latency as the
+    average plus `std_factor` standard deviations, to cover most of the latency spikes.
+    """
+
+    alpha: float = 0.1
+    std_factor: float = 2.0
+    mean: float | None = None
+    var: float = 0.0
+
+    def update(self, latency: float) -> None:
+        if self.mean is None:
+            self.mean = latency
+            return
+        delta = latency - self.mean
+        self.mean += self.alpha * delta
+        self.var = (1 - self.alpha) * (self.var + self.alpha * delta**2)
+
+    def estimate(self) -> float:
+        """Estimated latency in seconds, 0 until the first measurement"""
+        if self.mean is None:
+            return 0.0
+        return self.mean + self.std_factor * self.var**0.5
+
+    def reset(self):
+        """Reset the latency estimate"""
+        self.mean = None
+        self.var = 0.0
+
+
+def ready_to_send_observation(
+    queue_size: int,
+    chunk_size: int,
+    chunk_size_threshold: float,
+    latency_estimate: float | None = None,
+    environment_dt: float | None = None,
+) -> bool:
+    """Whether a new observation should be sent to the policy server.
+
+    Observations are sent once the action queue is less than `chunk_size_threshold` full. With a latency
+    estimate, they are also sent as soon as the actions left in the queue last less than the estimated latency
+    (plus one control step), so that the next chunk is received before the queue runs empty.
+    """
+    if queue_size / chunk_size <= chunk_size_threshold:
+        return True
+    if latency_estimate is None:
+        return False
+    return queue_size <= math.ceil(latency_estimate / environment_dt) + 1
+
+
+@dataclass
+class BatchedInferenceMetrics:
+    """Utility class to track the throughput of the policy server and the latency of each client."""
+
+    start_time: float = field(default_factory=time.perf_counter)
+    num_batches: int = 0
+    num_chunks: int = 0
+    total_inference_time: float = 0.0
+    chunks_per_client: dict[str, int] = field(default_factory=dict)
+    total_latency_per_client: dict[str, float] = field(default_factory=dict)
+
+    def record_batch(self, batch_size: int, inference_time: float) -> None:
+        self.num_batches += 1
+        self.num_chunks += batch_size
+        self.total_inference_time += inference_time
+
+    def record_chunk(self, client_id: str, latency: float) -> None:
+        """Record the time between the reception of a client's observation and its action chunk being ready"""
+        self.chunks_per_client[client_id] = self.chunks_per_client.get(client_id, 0) + 1
+        self.total_latency_per_client[client_id] = self.total_latency_per_client.get(client_id, 0.0) + latency
+
+    def summary(self) -> dict[str, Any]:
+        """Calculate the throughput and average batch size, inference time and per-client latency"""
+        elapsed = time.perf_counter() - self.start_time
+        return {
+            "chunks_per_second": self.num_chunks / elapsed if elapsed > 1e-6 else 0.0,
+            "avg_batch_size": self.num_chunks / self.num_batches if self.num_batches > 0 else 0.0,
+            "avg_inference_ms": 1000 * self.total_inference_time / self.num_batches
+            if self.num_batches > 0
+            else 0.0,
+            "clients": {
+                client_id: {
+                    "chunks": num_chunks,
+                    "avg_latency_ms": 1000 * self.total_latency_per_client[client_id] / num_chunks,
+                }
+                for client_id, num_chunks in self.chunks_per_client.items()
+            },
+        }
+
+    def reset(self):
+        """Reset the metrics"""
+        self.start_time = time.perf_counter()
+        self.num_batches = 0
+        self.num_chunks = 0
+        self.total_inference_time = 0.0
+        self.chunks_per_client = {}
+        self.total_latency_per_client = {}
+
+
 @dataclass
 class RemotePolicyConfig:
     policy_type: str
@@ -271,6 +406,54 @@ class RemotePolicyConfig:
     rename_map: dict[str, str] = field(default_factory=dict)
 
 
+def timed_observation_to_bytes(
+    obs: TimedObservation, image_encoding: str = "raw", jpeg_quality: int = 90
+) -> bytes:
+    """Serialize a TimedObservation with the typed wire format of `lerobot.transport.serialization`"""
+    data = {
+        "timestamp": obs.get_timestamp(),
+        "timestep": obs.get_timestep(),
+        "must_go": obs.must_go,
+        **{f"{OBSERVATION_WIRE_PREFIX}{k}": v for k, v in obs.get_observation().items()},
+    }
+    return serialize(data, image_encoding=image_encoding, jpeg_quality=jpeg_quality)
+
+
+def bytes_to_timed_observation(buffer: bytes) -> TimedObservation:
+    data = deserialize(buffer)
+    return TimedObservation(
+        timestamp=data["timestamp"],
+        timestep=data["timestep"],
+        must_go=data["must_go"],
+        observation={
+            k.removeprefix(OBSERVATION_WIRE_PREFIX): v
+            for k, v in data.items()
+            if k.startswith(OBSERVATION_WIRE_PREFIX)
+        },
+    )
+
+
+def action_chunk_to_bytes(action_chunk: list[TimedAction]) -> bytes:
+    """Serialize a chunk of TimedAction with the typed wire format of `lerobot.transport.serialization`"""
+    return serialize(
+        {
+            "timestamps": [action.get_timestamp() for action in action_chunk],
+            "timesteps": [action.get_timestep() for action in action_chunk],
+            "actions": torch.stack([action.get_action() for action in action_chunk]),
+        }
+    )
+
+
+def bytes_to_action_chunk(buffer: bytes) -> list[TimedAction]:
+    data = deserialize(buffer)
+    return [
+        TimedAction(timestamp=timestamp, timestep=timestep, action=action)
+        for timestamp, timestep, action in zip(
+            data["timestamps"], data["timesteps"], data["actions"], strict=True
+        )
+    ]
+
+
 def _compare_observation_states(obs1_state: torch.Tensor, obs2_state: torch.Tensor, atol: float) -> bool:
     """Check if two observation states are similar, under a tolerance threshold"""
     return bool(torch.linalg.norm(obs1_state - obs2_state) < atol)
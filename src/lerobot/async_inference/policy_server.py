@@ -20,16 +20,20 @@ python -m lerobot.async_inference.policy_server \
      --port=8080 \
      --fps=30 \
      --inference_latency=0.033 \
-     --obs_queue_timeout=1
+     --obs_queue_timeout=1 \
+     --max_batch_size=4 \
+     --batch_timeout=0.01
 ```
 """
 
+import contextlib
 import logging
 import pickle  # nosec
 import threading
 import time
+from collections import OrderedDict
 from concurrent import futures
-from dataclasses import asdict
+from dataclasses import asdict, dataclass, field
 from pprint import pformat
 from queue import Empty, Queue
 from typing import Any
@@ -48,22 +52,53 @@ from lerobot.transport import (
     services_pb2_grpc,  # type: ignore
 )
 from lerobot.transport.utils import receive_bytes_in_chunks
+from lerobot.utils.constants import BATCH_SOURCES
 
 from .configs import PolicyServerConfig
 from .constants import SUPPORTED_POLICIES
 from .helpers import (
+    BatchedInferenceMetrics,
     FPSTracker,
     Observation,
     RemotePolicyConfig,
     TimedAction,
     TimedObservation,
+    action_chunk_to_bytes,
+    bytes_to_timed_observation,
+    collate_observations,
     get_logger,
     observations_similar,
     raw_observation_to_observation,
 )
 
 
+@dataclass
+class ClientState:
+    """State of a robot client connected to the policy server."""
+
+    client_id: str
+    lerobot_features: dict[str, dict] | None = None
+    actions_per_chunk: int | None = None
+    # latest observation received and not run through the policy yet, with its reception time
+    pending_observation: tuple[TimedObservation, float] | None = None
+    # only the latest action chunk is kept until the client gets it
+    action_queue: Queue = field(default_factory=lambda: Queue(maxsize=1))
+    predicted_timesteps: set[int] = field(default_factory=set)
+    last_processed_obs: TimedObservation | None = None
+    # timestep of the latest observation whose batch failed, only retried once
+    retried_timestep: int | None = None
+    last_seen: float = field(default_factory=time.perf_counter)
+
+
 class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
+    """Serves action chunks to (possibly many) robot clients.
+
+    Each client is identified by its gRPC peer and has its own observation and action queues. An inference
+    thread gathers the latest observations of up to `max_batch_size` clients, waiting at most `batch_timeout`
+    for the batch to fill, and runs them through the policy in a single call. Clients are served in
+    round-robin order, so that no client starves when more clients than `max_batch_size` are waiting.
+    """
+
     prefix = "policy_server"
     logger = get_logger(prefix)
 
@@ -74,18 +109,20 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
         # FPS measurement
         self.fps_tracker = FPSTracker(target_fps=config.fps)
 
-        self.observation_queue = Queue(maxsize=1)
+        # Clients are ordered from the least to the most recently served, and `_clients_condition` is
+        # notified whenever a new observation is pending
+        self._clients: OrderedDict[str, ClientState] = OrderedDict()
+        self._clients_condition = threading.Condition()
 
-        self._predicted_timesteps_lock = threading.Lock()
-        self._predicted_timesteps = set()
-
-        self.last_processed_obs = None
+        self.metrics = BatchedInferenceMetrics()
+        self._last_metrics_log = time.perf_counter()
+        self._inference_thread = None
 
         # Attributes will be set by SendPolicyInstructions
+        self._policy_lock = threading.Lock()
+        self._policy_specs = None
         self.device = None
         self.policy_type = None
-        self.lerobot_features = None
-        self.actions_per_chunk = None
         self.policy = None
         self.preprocessor: PolicyProcessorPipeline[dict[str, Any], dict[str, Any]] | None = None
         self.postprocessor: PolicyProcessorPipeline[PolicyAction, PolicyAction] | None = None
@@ -98,20 +135,47 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
     def policy_image_features(self):
         return self.policy.config.image_features
 
-    def _reset_server(self) -> None:
-        """Flushes server state when new client connects."""
-        # only running inference on the latest observation received by the server
-        self.shutdown_event.set()
-        self.observation_queue = Queue(maxsize=1)
+    def _get_client(self, context) -> ClientState:
+        """Get the state of the client making a request, registering the client if it is unknown."""
+        client_id = context.peer()
+        with self._clients_condition:
+            if client_id not in self._clients:
+                self._clients[client_id] = ClientState(client_id)
+            client = self._clients[client_id]
+        client.last_seen = time.perf_counter()
+        return client
+
+    def _remove_inactive_clients(self) -> None:
+        with self._clients_condition:
+            now = time.perf_counter()
+            for client_id, client in list(self._clients.items()):
+                if now - client.last_seen > self.config.client_timeout:
+                    self.logger.info(
+                        f"Client {client_id} inactive for {now - client.last_seen:.1f}s, removing it"
+                    )
+                    del self._clients[client_id]
 
-        with self._predicted_timesteps_lock:
-            self._predicted_timesteps = set()
+    def _reset_server(self) -> None:
+        """Flushes the state of all clients."""
+        with self._clients_condition:
+            self._clients = OrderedDict()
+            self._clients_condition.notify_all()
+        self.metrics.reset()
 
     def Ready(self, request, context):  # noqa: N802
         client_id = context.peer()
-        self.logger.info(f"Client {client_id} connected and ready")
-        self._reset_server()
-        self.shutdown_event.clear()
+        self._remove_inactive_clients()
+
+        with self._clients_condition:
+            if client_id not in self._clients and len(self._clients) >= self.config.max_clients:
+                context.abort(
+                    grpc.StatusCode.RESOURCE_EXHAUSTED,
+                    f"Server already serving the maximum number of clients ({self.config.max_clients})",
+                )
+            # a (re)connecting client starts from a fresh state
+            self._clients[client_id] = ClientState(client_id)
+
+        self.logger.info(f"Client {client_id} connected and ready ({len(self._clients)} client(s) connected)")
 
         return services_pb2.Empty()
 
@@ -122,7 +186,7 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
             self.logger.warning("Server is not running. Ignoring policy instructions.")
             return services_pb2.Empty()
 
-        client_id = context.peer()
+        client = self._get_client(context)
 
         policy_specs = pickle.loads(request.data)  # nosec
 
@@ -136,17 +200,50 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
             )
 
         self.logger.info(
-            f"Receiving policy instructions from {client_id} | "
+            f"Receiving policy instructions from {client.client_id} | "
             f"Policy type: {policy_specs.policy_type} | "
             f"Pretrained name or path: {policy_specs.pretrained_name_or_path} | "
             f"Actions per chunk: {policy_specs.actions_per_chunk} | "
             f"Device: {policy_specs.device}"
         )
 
+        # All clients share the same policy, which is only loaded if it differs from the one already served
+        specs = (
+            policy_specs.policy_type,
+            policy_specs.pretrained_name_or_path,
+            policy_specs.device,
+            policy_specs.rename_map,
+        )
+        with self._clients_condition:
+            other_clients = [
+                client_id
+                for client_id, other in self._clients.items()
+                if client_id != client.client_id and other.lerobot_features is not None
+            ]
+        with self._policy_lock:
+            if specs != self._policy_specs:
+                if self._policy_specs is not None and len(other_clients) > 0:
+                    # Swapping the policy would change the network driving the other robots mid-run
+                    context.abort(
+                        grpc.StatusCode.FAILED_PRECONDITION,
+                        f"Client {client.client_id} requested a different policy than the one served to "
+                        f"{other_clients}",
+                    )
+                self._load_policy(policy_specs)
+                self._policy_specs = specs
+
+        client.lerobot_features = policy_specs.lerobot_features
+        client.actions_per_chunk = policy_specs.actions_per_chunk
+
+        if self._inference_thread is None or not self._inference_thread.is_alive():
+            self._inference_thread = threading.Thread(target=self._inference_loop, daemon=True)
+            self._inference_thread.start()
+
+        return services_pb2.Empty()
+
+    def _load_policy(self, policy_specs: RemotePolicyConfig) -> None:
         self.device = policy_specs.device
         self.policy_type = policy_specs.policy_type  # act, pi0, etc.
-        self.lerobot_features = policy_specs.lerobot_features
-        self.actions_per_chunk = policy_specs.actions_per_chunk
 
         policy_class = get_policy_class(self.policy_type)
 
@@ -170,19 +267,17 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
 
         self.logger.info(f"Time taken to put policy on {self.device}: {end - start:.4f} seconds")
 
-        return services_pb2.Empty()
-
     def SendObservations(self, request_iterator, context):  # noqa: N802
         """Receive observations from the robot client"""
-        client_id = context.peer()
-        self.logger.debug(f"Receiving observations from {client_id}")
+        client = self._get_client(context)
+        self.logger.debug(f"Receiving observations from {client.client_id}")
 
         receive_time = time.time()  # comparing timestamps so need time.time()
         start_deserialize = time.perf_counter()
         received_bytes = receive_bytes_in_chunks(
             request_iterator, None, self.shutdown_event, self.logger
         )  # blocking call while looping over request_iterator
-        timed_observation = pickle.loads(received_bytes)  # nosec
+        timed_observation = bytes_to_timed_observation(received_bytes)
         deserialize_time = time.perf_counter() - start_deserialize
 
         self.logger.debug(f"Received observation #{timed_observation.get_timestep()}")
@@ -194,8 +289,8 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
         fps_metrics = self.fps_tracker.calculate_fps_metrics(obs_timestamp)
 
         self.logger.debug(
-            f"Received observation #{obs_timestep} | "
-            f"Avg FPS: {fps_metrics['avg_fps']:.2f} | "  # fps at which observations are received from client
+            f"Received observation #{obs_timestep} from {client.client_id} | "
+            f"Avg FPS: {fps_metrics['avg_fps']:.2f} | "  # fps at which observations are received from clients
             f"Target: {fps_metrics['target_fps']:.2f} | "
             f"One-way latency: {(receive_time - obs_timestamp) * 1000:.2f}ms"
         )
@@ -207,7 +302,8 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
         )
 
         if not self._enqueue_observation(
-            timed_observation  # wrapping a RawObservation
+            client,
+            timed_observation,  # wrapping a RawObservation
         ):
             self.logger.debug(f"Observation #{obs_timestep} has been filtered out")
 
@@ -216,41 +312,24 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
     def GetActions(self, request, context):  # noqa: N802
         """Returns actions to the robot client. Actions are sent as a single
         chunk, containing multiple actions."""
-        client_id = context.peer()
-        self.logger.debug(f"Client {client_id} connected for action streaming")
+        client = self._get_client(context)
+        self.logger.debug(f"Client {client.client_id} connected for action streaming")
 
-        # Generate action based on the most recent observation and its timestep
+        # Wait for the action chunk predicted from the client's most recent observation
         try:
             getactions_starts = time.perf_counter()
-            obs = self.observation_queue.get(timeout=self.config.obs_queue_timeout)
-            self.logger.info(
-                f"Running inference for observation #{obs.get_timestep()} (must_go: {obs.must_go})"
-            )
-
-            with self._predicted_timesteps_lock:
-                self._predicted_timesteps.add(obs.get_timestep())
+            action_chunk = client.action_queue.get(timeout=self.config.obs_queue_timeout)
 
             start_time = time.perf_counter()
-            action_chunk = self._predict_action_chunk(obs)
-            inference_time = time.perf_counter() - start_time
-
-            start_time = time.perf_counter()
-            actions_bytes = pickle.dumps(action_chunk)  # nosec
+            actions_bytes = action_chunk_to_bytes(action_chunk)
             serialize_time = time.perf_counter() - start_time
 
             # Create and return the action chunk
             actions = services_pb2.Actions(data=actions_bytes)
 
-            self.logger.info(
-                f"Action chunk #{obs.get_timestep()} generated | "
-                f"Total time: {(inference_time + serialize_time) * 1000:.2f}ms"
-            )
-
             self.logger.debug(
-                f"Action chunk #{obs.get_timestep()} generated | "
-                f"Inference time: {inference_time:.2f}s |"
-                f"Serialize time: {serialize_time:.2f}s |"
-                f"Total time: {inference_time + serialize_time:.2f}s"
+                f"Action chunk #{action_chunk[0].get_timestep()} sent to {client.client_id} | "
+                f"Serialize time: {serialize_time:.2f}s"
             )
 
             time.sleep(
@@ -259,7 +338,7 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
 
             return actions
 
-        except Empty:  # no observation added to queue in obs_queue_timeout
+        except Empty:  # no action chunk predicted in obs_queue_timeout
             return services_pb2.Empty()
 
         except Exception as e:
@@ -267,16 +346,15 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
 
             return services_pb2.Empty()
 
-    def _obs_sanity_checks(self, obs: TimedObservation, previous_obs: TimedObservation) -> bool:
+    def _obs_sanity_checks(
+        self, client: ClientState, obs: TimedObservation, previous_obs: TimedObservation
+    ) -> bool:
         """Check if the observation is valid to be processed by the policy"""
-        with self._predicted_timesteps_lock:
-            predicted_timesteps = self._predicted_timesteps
-
-        if obs.get_timestep() in predicted_timesteps:
+        if obs.get_timestep() in client.predicted_timesteps:
             self.logger.debug(f"Skipping observation #{obs.get_timestep()} - Timestep predicted already!")
             return False
 
-        elif observations_similar(obs, previous_obs, lerobot_features=self.lerobot_features):
+        elif observations_similar(obs, previous_obs, lerobot_features=client.lerobot_features):
             self.logger.debug(
                 f"Skipping observation #{obs.get_timestep()} - Observation too similar to last obs predicted!"
             )
@@ -285,31 +363,153 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
         else:
             return True
 
-    def _enqueue_observation(self, obs: TimedObservation) -> bool:
+    def _enqueue_observation(self, client: ClientState, obs: TimedObservation) -> bool:
         """Enqueue an observation if it must go through processing, otherwise skip it.
         Observations not in queue are never run through the policy network"""
 
-        if (
-            obs.must_go
-            or self.last_processed_obs is None
-            or self._obs_sanity_checks(obs, self.last_processed_obs)
-        ):
-            last_obs = self.last_processed_obs.get_timestep() if self.last_processed_obs else "None"
-            self.logger.debug(
-                f"Enqueuing observation. Must go: {obs.must_go} | Last processed obs: {last_obs}"
-            )
+        with self._clients_condition:
+            if (
+                obs.must_go
+                or client.last_processed_obs is None
+                or self._obs_sanity_checks(client, obs, client.last_processed_obs)
+            ):
+                last_obs = client.last_processed_obs.get_timestep() if client.last_processed_obs else "None"
+                self.logger.debug(
+                    f"Enqueuing observation. Must go: {obs.must_go} | Last processed obs: {last_obs}"
+                )
+
+                # Only running inference on the latest observation received from each client
+                if client.pending_observation is not None:
+                    self.logger.debug("Observation queue was full, removed oldest observation")
+
+                client.pending_observation = (obs, time.perf_counter())
+                self._clients_condition.notify_all()
+                return True
+
+        return False
 
-            # If queue is full, get the old observation to make room
-            if self.observation_queue.full():
-                # pops from queue
-                _ = self.observation_queue.get_nowait()
-                self.logger.debug("Observation queue was full, removed oldest observation")
+    def _num_pending_observations(self) -> int:
+        return sum(client.pending_observation is not None for client in self._clients.values())
 
-            # Now put the new observation (never blocks as queue is non-full here)
-            self.observation_queue.put(obs)
-            return True
+    def _gather_batch(self) -> list[tuple[ClientState, TimedObservation, float, TimedObservation | None]]:
+        """Wait for the observations to run through the policy in a single batch.
 
-        return False
+        Once an observation is pending, waits at most `batch_timeout` for the other clients' observations, then
+        takes the pending observations of (at most `max_batch_size`) clients, least recently served first.
+        Each observation comes with its reception time and the client's previous `last_processed_obs`, to roll
+        back the client's state if the observation is not served (see `_rollback_observation`).
+        """
+        with self._clients_condition:
+            if not self._clients_condition.wait_for(
+                lambda: not self.running or self._num_pending_observations() > 0,
+                timeout=self.config.obs_queue_timeout,
+            ):
+                return []
+
+            deadline = time.perf_counter() + self.config.batch_timeout
+            while self.running and self._num_pending_observations() < min(
+                self.config.max_batch_size, len(self._clients)
+            ):
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._clients_condition.wait(timeout=remaining)
+
+            batch = []
+            for client in list(self._clients.values()):
+                if len(batch) == self.config.max_batch_size:
+                    break
+                if client.pending_observation is None:
+                    continue
+
+                obs, receive_time = client.pending_observation
+                batch.append((client, obs, receive_time, client.last_processed_obs))
+                client.pending_observation = None
+                client.predicted_timesteps.add(obs.get_timestep())
+                client.last_processed_obs = obs
+                # moving served clients last for the next batches to start with the others
+                self._clients.move_to_end(client.client_id)
+
+        return batch
+
+    def _rollback_observation(
+        self,
+        client: ClientState,
+        obs: TimedObservation,
+        receive_time: float,
+        previous_obs: TimedObservation | None,
+        retry: bool,
+    ) -> None:
+        """Undo the state changes of `_gather_batch` for an observation that was not served.
+
+        With `retry`, the observation is pending again, unless the client sent a newer one meanwhile or it was
+        already retried once.
+        """
+        with self._clients_condition:
+            client.predicted_timesteps.discard(obs.get_timestep())
+            if client.last_processed_obs is obs:
+                client.last_processed_obs = previous_obs
+            if retry and client.pending_observation is None and client.retried_timestep != obs.get_timestep():
+                client.retried_timestep = obs.get_timestep()
+                client.pending_observation = (obs, receive_time)
+                self._clients_condition.notify_all()
+
+    def _inference_loop(self) -> None:
+        """Run batches of the clients' observations through the policy, until the server stops."""
+        while self.running:
+            # Disconnected clients would otherwise make every batch wait for `batch_timeout`
+            self._remove_inactive_clients()
+            batch = self._gather_batch()
+            if len(batch) == 0:
+                continue
+
+            self.logger.info(
+                "Running inference for observations "
+                + ", ".join(f"#{obs.get_timestep()} (must_go: {obs.must_go})" for _, obs, _, _ in batch)
+                + f" of {len(batch)} client(s)"
+            )
+
+            try:
+                start_time = time.perf_counter()
+                with self._policy_lock:
+                    action_chunks = self._predict_action_chunks(
+                        [(client, obs) for client, obs, _, _ in batch]
+                    )
+                inference_time = time.perf_counter() - start_time
+            except Exception as e:
+                self.logger.error(f"Error in inference loop, retrying the observations later: {e}")
+                for client, obs, receive_time, previous_obs in batch:
+                    self._rollback_observation(client, obs, receive_time, previous_obs, retry=True)
+                continue
+
+            ready_time = time.perf_counter()
+            num_served = 0
+            for (client, obs, receive_time, previous_obs), action_chunk in zip(
+                batch, action_chunks, strict=True
+            ):
+                if action_chunk is None:
+                    # The observation could not be prepared, it would fail again
+                    self._rollback_observation(client, obs, receive_time, previous_obs, retry=False)
+                    continue
+                # Only keeping the latest action chunk until the client gets it
+                with contextlib.suppress(Empty):
+                    client.action_queue.get_nowait()
+                client.action_queue.put(action_chunk)
+                self.metrics.record_chunk(client.client_id, ready_time - receive_time)
+                num_served += 1
+
+            if num_served == 0:
+                continue
+
+            self.metrics.record_batch(num_served, inference_time)
+            self.logger.info(
+                f"Action chunks for {num_served} client(s) generated | "
+                f"Inference time: {inference_time * 1000:.2f}ms"
+            )
+
+            if ready_time - self._last_metrics_log > self.config.metrics_log_interval:
+                self.logger.info(f"Inference metrics: {pformat(self.metrics.summary())}")
+                self._last_metrics_log = ready_time
 
     def _time_action_chunk(self, t_0: float, action_chunk: list[torch.Tensor], i_0: int) -> list[TimedAction]:
         """Turn a chunk of actions into a list of TimedAction instances,
@@ -321,42 +521,61 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
             for i, action in enumerate(action_chunk)
         ]
 
-    def _get_action_chunk(self, observation: dict[str, torch.Tensor]) -> torch.Tensor:
-        """Get an action chunk from the policy. The chunk contains only"""
+    def _get_action_chunk(self, observation: dict[str, torch.Tensor], actions_per_chunk: int) -> torch.Tensor:
+        """Get an action chunk from the policy. The chunk contains only the first `actions_per_chunk` actions."""
         chunk = self.policy.predict_action_chunk(observation)
         if chunk.ndim != 3:
             chunk = chunk.unsqueeze(0)  # adding batch dimension, now shape is (B, chunk_size, action_dim)
 
-        return chunk[:, : self.actions_per_chunk, :]
+        return chunk[:, :actions_per_chunk, :]
 
-    def _predict_action_chunk(self, observation_t: TimedObservation) -> list[TimedAction]:
-        """Predict an action chunk based on an observation.
+    def _predict_action_chunks(
+        self, batch: list[tuple[ClientState, TimedObservation]]
+    ) -> list[list[TimedAction] | None]:
+        """Predict the action chunks of a batch of observations, sent by different clients.
 
         Pipeline:
-        1. Convert raw observation to LeRobot format
-        2. Apply preprocessor (tokenization, normalization, batching, device placement)
-        3. Run policy inference to get action chunk
+        1. Convert raw observations to LeRobot format
+        2. Apply preprocessor (tokenization, normalization, batching, device placement) and stack observations
+        3. Run policy inference to get action chunks
         4. Apply postprocessor (unnormalization, device movement)
-        5. Convert to TimedAction list
+        5. Convert to TimedAction lists
+
+        The observations failing steps 1 or 2 (e.g. a client that did not send its policy instructions, or a
+        malformed frame) are dropped from the batch, their action chunk being None.
         """
-        """1. Prepare observation"""
+        """1. Prepare observations and 2. Apply preprocessor"""
         start_prepare = time.perf_counter()
-        observation: Observation = raw_observation_to_observation(
-            observation_t.get_observation(),
-            self.lerobot_features,
-            self.policy_image_features,
-        )
-        prepare_time = time.perf_counter() - start_prepare
-
-        """2. Apply preprocessor"""
-        start_preprocess = time.perf_counter()
-        observation = self.preprocessor(observation)
-        self.last_processed_obs: TimedObservation = observation_t
-        preprocessing_time = time.perf_counter() - start_preprocess
-
-        """3. Get action chunk"""
+        served: list[int] = []
+        preprocessed: list[Observation] = []
+        for i, (client, observation_t) in enumerate(batch):
+            try:
+                observation = raw_observation_to_observation(
+                    observation_t.get_observation(),
+                    client.lerobot_features,
+                    self.policy_image_features,
+                )
+                preprocessed.append(self.preprocessor(observation))
+                served.append(i)
+            except Exception as e:
+                self.logger.error(
+                    f"Dropping observation #{observation_t.get_timestep()} of {client.client_id}: {e}"
+                )
+        preprocessing_time = time.perf_counter() - start_prepare
+
+        action_chunks: list[list[TimedAction] | None] = [None] * len(batch)
+        if len(served) == 0:
+            return action_chunks
+        observation = collate_observations(preprocessed)
+        batch = [batch[i] for i in served]
+        # Lets policies caching inputs across calls (e.g. PI0 prefix cache) tell apart the clients' batches
+        observation[BATCH_SOURCES] = tuple(client.client_id for client, _ in batch)
+
+        """3. Get action chunks"""
         start_inference = time.perf_counter()
-        action_tensor = self._get_action_chunk(observation)
+        action_tensor = self._get_action_chunk(
+            observation, max(client.actions_per_chunk for client, _ in batch)
+        )
         inference_time = time.perf_counter() - start_inference
         self.logger.info(
             f"Preprocessing and inference took {inference_time:.4f}s, action shape: {action_tensor.shape}"
@@ -377,36 +596,41 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
             processed_action = self.postprocessor(single_action)
             processed_actions.append(processed_action)
 
-        # Stack back to (B, chunk_size, action_dim), then remove batch dim
-        action_tensor = torch.stack(processed_actions, dim=1).squeeze(0)
+        # Stack back to (B, chunk_size, action_dim)
+        action_tensor = torch.stack(processed_actions, dim=1)
         self.logger.debug(f"Postprocessed action shape: {action_tensor.shape}")
 
-        """5. Convert to TimedAction list"""
-        action_chunk = self._time_action_chunk(
-            observation_t.get_timestamp(), list(action_tensor), observation_t.get_timestep()
-        )
+        """5. Convert to TimedAction lists"""
+        for row, (i, (client, observation_t)) in enumerate(zip(served, batch, strict=True)):
+            action_chunks[i] = self._time_action_chunk(
+                observation_t.get_timestamp(),
+                list(action_tensor[row, : client.actions_per_chunk]),
+                observation_t.get_timestep(),
+            )
         postprocess_stops = time.perf_counter()
         postprocessing_time = postprocess_stops - start_postprocess
 
+        timesteps = ", ".join(str(observation_t.get_timestep()) for _, observation_t in batch)
         self.logger.info(
-            f"Observation {observation_t.get_timestep()} | "
-            f"Total time: {1000 * (postprocess_stops - start_prepare):.2f}ms"
+            f"Observations {timesteps} | Total time: {1000 * (postprocess_stops - start_prepare):.2f}ms"
         )
 
         self.logger.debug(
-            f"Observation {observation_t.get_timestep()} | "
-            f"Prepare time: {1000 * prepare_time:.2f}ms | "
-            f"Preprocessing time: {1000 * preprocessing_time:.2f}ms | "
+            f"Observations {timesteps} | "
+            f"Prepare and preprocessing time: {1000 * preprocessing_time:.2f}ms | "
             f"Inference time: {1000 * inference_time:.2f}ms | "
             f"Postprocessing time: {1000 * postprocessing_time:.2f}ms | "
             f"Total time: {1000 * (postprocess_stops - start_prepare):.2f}ms"
         )
 
-        return action_chunk
+        return action_chunks
 
     def stop(self):
         """Stop the server"""
+        self.shutdown_event.set()
         self._reset_server()
+        if self._inference_thread is not None:
+            self._inference_thread.join()
         self.logger.info("Server stopping...")
 
 
@@ -423,7 +647,8 @@ def serve(cfg: PolicyServerConfig):
     policy_server = PolicyServer(cfg)
 
     # Setup and start gRPC server
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    # Each client keeps up to two requests running concurrently (observations and actions)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2 * cfg.max_clients + 2))
     services_pb2_grpc.add_AsyncInferenceServicer_to_server(policy_server, server)
     server.add_insecure_port(f"{cfg.host}:{cfg.port}")
 
@@ -68,13 +68,17 @@ from .constants import SUPPORTED_ROBOTS
 from .helpers import (
     Action,
     FPSTracker,
+    LatencyEstimator,
     Observation,
     RawObservation,
     RemotePolicyConfig,
     TimedAction,
     TimedObservation,
+    bytes_to_action_chunk,
     get_logger,
     map_robot_keys_to_lerobot_features,
+    ready_to_send_observation,
+    timed_observation_to_bytes,
     visualize_action_queue_size,
 )
 
@@ -129,6 +133,14 @@ class RobotClient:
         # FPS measurement
         self.fps_tracker = FPSTracker(target_fps=self.config.fps)
 
+        # Observation -> action chunk latency measurement, and control steps without actions to perform
+        self.latency_estimator = LatencyEstimator(
+            alpha=config.latency_ema_alpha, std_factor=config.latency_std_factor
+        )
+        self.queue_underflows = 0
+        self.underflow_steps = 0
+        self._underflowing = False
+
         self.logger.info("Robot connected and ready")
 
         # Use an event for thread-safe coordination
@@ -192,7 +204,9 @@ class RobotClient:
             raise ValueError("Input observation needs to be a TimedObservation!")
 
         start_time = time.perf_counter()
-        observation_bytes = pickle.dumps(obs)
+        observation_bytes = timed_observation_to_bytes(
+            obs, image_encoding=self.config.image_encoding, jpeg_quality=self.config.jpeg_quality
+        )
         serialize_time = time.perf_counter() - start_time
         self.logger.debug(f"Observation serialization time: {serialize_time:.6f}s")
 
@@ -232,37 +246,37 @@ class RobotClient:
                 return x2
 
         future_action_queue = Queue()
+        # Holding the lock while merging, so that no action is popped in the meantime and then queued again
         with self.action_queue_lock:
-            internal_queue = self.action_queue.queue
+            current_action_queue = {
+                action.get_timestep(): action.get_action() for action in self.action_queue.queue
+            }
 
-        current_action_queue = {action.get_timestep(): action.get_action() for action in internal_queue}
-
-        for new_action in incoming_actions:
             with self.latest_action_lock:
                 latest_action = self.latest_action
 
-            # New action is older than the latest action in the queue, skip it
-            if new_action.get_timestep() <= latest_action:
-                continue
-
-            # If the new action's timestep is not in the current action queue, add it directly
-            elif new_action.get_timestep() not in current_action_queue:
-                future_action_queue.put(new_action)
-                continue
-
-            # If the new action's timestep is in the current action queue, aggregate it
-            # TODO: There is probably a way to do this with broadcasting of the two action tensors
-            future_action_queue.put(
-                TimedAction(
-                    timestamp=new_action.get_timestamp(),
-                    timestep=new_action.get_timestep(),
-                    action=aggregate_fn(
-                        current_action_queue[new_action.get_timestep()], new_action.get_action()
-                    ),
+            for new_action in incoming_actions:
+                # New action is older than the latest action in the queue, skip it
+                if new_action.get_timestep() <= latest_action:
+                    continue
+
+                # If the new action's timestep is not in the current action queue, add it directly
+                elif new_action.get_timestep() not in current_action_queue:
+                    future_action_queue.put(new_action)
+                    continue
+
+                # If the new action's timestep is in the current action queue, aggregate it
+                # TODO: There is probably a way to do this with broadcasting of the two action tensors
+                future_action_queue.put(
+                    TimedAction(
+                        timestamp=new_action.get_timestamp(),
+                        timestep=new_action.get_timestep(),
+                        action=aggregate_fn(
+                            current_action_queue[new_action.get_timestep()], new_action.get_action()
+                        ),
+                    )
                 )
-            )
 
-        with self.action_queue_lock:
             self.action_queue = future_action_queue
 
     def receive_actions(self, verbose: bool = False):
@@ -282,11 +296,20 @@ class RobotClient:
 
                 # Deserialize bytes back into list[TimedAction]
                 deserialize_start = time.perf_counter()
-                timed_actions = pickle.loads(actions_chunk.data)  # nosec
+                timed_actions = bytes_to_action_chunk(actions_chunk.data)
                 deserialize_time = time.perf_counter() - deserialize_start
 
                 self.action_chunk_size = max(self.action_chunk_size, len(timed_actions))
 
+                # The first action is timestamped with the capture time of its observation, on the client clock
+                if len(timed_actions) > 0:
+                    latency = receive_time - timed_actions[0].get_timestamp()
+                    self.latency_estimator.update(latency)
+                    self.logger.debug(
+                        f"Observation->action latency: {latency * 1000:.2f}ms | "
+                        f"Estimate: {self.latency_estimator.estimate() * 1000:.2f}ms"
+                    )
+
                 # Calculate network latency if we have matching observations
                 if len(timed_actions) > 0 and verbose:
                     with self.latest_action_lock:
@@ -358,15 +381,15 @@ class RobotClient:
         get_start = time.perf_counter()
         with self.action_queue_lock:
             self.action_queue_size.append(self.action_queue.qsize())
-            # Get action from queue
+            # Get action from queue, marking it as performed before incoming chunks can be merged in the queue
             timed_action = self.action_queue.get_nowait()
+            with self.latest_action_lock:
+                self.latest_action = timed_action.get_timestep()
         get_end = time.perf_counter() - get_start
 
         _performed_action = self.robot.send_action(
             self._action_tensor_to_action_dict(timed_action.get_action())
         )
-        with self.latest_action_lock:
-            self.latest_action = timed_action.get_timestep()
 
         if verbose:
             with self.action_queue_lock:
@@ -387,7 +410,30 @@ class RobotClient:
     def _ready_to_send_observation(self):
         """Flags when the client is ready to send an observation"""
         with self.action_queue_lock:
-            return self.action_queue.qsize() / self.action_chunk_size <= self._chunk_size_threshold
+            queue_size = self.action_queue.qsize()
+
+        return ready_to_send_observation(
+            queue_size,
+            self.action_chunk_size,
+            self._chunk_size_threshold,
+            latency_estimate=self.latency_estimator.estimate() if self.config.latency_compensation else None,
+            environment_dt=self.config.environment_dt,
+        )
+
+    def _track_queue_underflow(self, action_performed: bool):
+        """Count the control steps without any action to perform, once the first actions were received"""
+        if action_performed or self.action_chunk_size < 0:
+            self._underflowing = False
+            return
+
+        self.underflow_steps += 1
+        if not self._underflowing:
+            self.queue_underflows += 1
+            self._underflowing = True
+            self.logger.warning(
+                f"Action queue ran empty ({self.queue_underflows} time(s) so far) | "
+                f"Latency estimate: {self.latency_estimator.estimate() * 1000:.2f}ms"
+            )
 
     def control_loop_observation(self, task: str, verbose: bool = False) -> RawObservation:
         try:
@@ -451,8 +497,10 @@ class RobotClient:
         while self.running:
             control_loop_start = time.perf_counter()
             """Control loop: (1) Performing actions, when available"""
-            if self.actions_available():
+            action_performed = self.actions_available()
+            if action_performed:
                 _performed_action = self.control_loop_action(verbose)
+            self._track_queue_underflow(action_performed)
 
             """Control loop: (2) Streaming observations to the remote policy server"""
             if self._ready_to_send_observation():
@@ -490,6 +538,10 @@ def async_client(cfg: RobotClientConfig):
         finally:
             client.stop()
             action_receiver_thread.join()
+            client.logger.info(
+                f"Action queue ran empty {client.queue_underflows} time(s), "
+                f"for a total of {client.underflow_steps} control step(s)"
+            )
             if cfg.debug_visualize_queue_size:
                 visualize_action_queue_size(client.action_queue_size)
             client.logger.info("Client stopped")
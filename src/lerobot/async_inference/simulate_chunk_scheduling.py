@@ -0,0 +1,182 @@
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Simulate the action chunk scheduling of the RobotClient, without robot nor policy server, to tune it.
+
+The control loop runs at `fps`: it performs the next queued action (or idles, counting a queue underflow) and
+sends an observation whenever the client would. The policy server runs one inference at a time, on the latest
+observation received, and each observation -> action chunk latency is replayed from a file (one latency in
+seconds per line, e.g. measured by the RobotClient) or sampled from a log-normal distribution.
+
+Example:
+```shell
+python -m lerobot.async_inference.simulate_chunk_scheduling \
+    --fps=30 \
+    --actions_per_chunk=50 \
+    --chunk_size_threshold=0.5 \
+    --latency_mean=0.25 \
+    --latency_std=0.08
+```
+"""
+
+import argparse
+import itertools
+import math
+from collections.abc import Iterator
+
+import numpy as np
+
+from .helpers import LatencyEstimator, ready_to_send_observation
+
+RESULT_KEYS = [
+    "queue_underflows",
+    "underflow_steps",
+    "underflow_ratio",
+    "avg_queue_size",
+    "observations_sent",
+    "inferences",
+]
+
+
+def sample_latencies(mean: float, std: float, seed: int) -> Iterator[float]:
+    """Endlessly sample log-normal latencies of the given mean and standard deviation."""
+    rng = np.random.default_rng(seed)
+    sigma = math.sqrt(math.log(1 + (std / mean) ** 2))
+    mu = math.log(mean) - sigma**2 / 2
+    while True:
+        yield float(rng.lognormal(mu, sigma))
+
+
+def replay_latencies(path: str) -> Iterator[float]:
+    """Endlessly replay the latencies (in seconds, one per line) of a file."""
+    with open(path) as f:
+        latencies = [float(line) for line in f if line.strip()]
+    if len(latencies) == 0:
+        raise ValueError(f"No latency found in {path}")
+    return itertools.cycle(latencies)
+
+
+def simulate(
+    latencies: Iterator[float],
+    fps: int,
+    actions_per_chunk: int,
+    chunk_size_threshold: float,
+    num_steps: int,
+    latency_estimator: LatencyEstimator | None = None,
+) -> dict[str, float]:
+    """Simulate `num_steps` control steps, returning the queue underflow and inference counters."""
+    environment_dt = 1 / fps
+    action_queue: list[int] = []
+    latest_action = -1
+    action_chunk_size = -1
+
+    # (capture time, timestep) of the observation waiting for the server, and of the one being processed
+    pending_observation = None
+    inference = None  # (chunk ready time, capture time, timestep)
+
+    queue_underflows = underflow_steps = num_observations = num_inferences = 0
+    underflowing = False
+    queue_sizes = []
+    for step in range(num_steps):
+        now = step * environment_dt
+
+        # Receive the action chunk, if ready, keeping only the actions not performed yet
+        if inference is not None and inference[0] <= now:
+            _, capture_time, obs_timestep = inference
+            if latency_estimator is not None:
+                latency_estimator.update(now - capture_time)
+            action_chunk_size = max(action_chunk_size, actions_per_chunk)
+            action_queue = [
+                t for t in range(obs_timestep, obs_timestep + actions_per_chunk) if t > latest_action
+            ]
+            inference = None
+
+        # The server runs inference on the latest observation received, once done with the previous one
+        if inference is None and pending_observation is not None:
+            capture_time, obs_timestep = pending_observation
+            inference = (max(now, capture_time) + next(latencies), capture_time, obs_timestep)
+            pending_observation = None
+            num_inferences += 1
+
+        # Perform an action, if any
+        queue_sizes.append(len(action_queue))
+        if len(action_queue) > 0:
+            latest_action = action_queue.pop(0)
+            underflowing = False
+        elif action_chunk_size > 0:
+            underflow_steps += 1
+            queue_underflows += not underflowing
+            underflowing = True
+
+        # Send an observation, if ready
+        if ready_to_send_observation(
+            len(action_queue),
+            action_chunk_size,
+            chunk_size_threshold,
+            latency_estimate=latency_estimator.estimate() if latency_estimator is not None else None,
+            environment_dt=environment_dt,
+        ):
+            pending_observation = (now, max(latest_action, 0))
+            num_observations += 1
+
+    return {
+        "queue_underflows": queue_underflows,
+        "underflow_steps": underflow_steps,
+        "underflow_ratio": underflow_steps / num_steps,
+        "avg_queue_size": float(np.mean(queue_sizes)),
+        "observations_sent": num_observations,
+        "inferences": num_inferences,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--actions_per_chunk", type=int, default=50)
+    parser.add_argument("--chunk_size_threshold", type=float, default=0.5)
+    parser.add_argument("--num_steps", type=int, default=9000, help="Number of simulated control steps.")
+    parser.add_argument("--latencies_path", type=str, default=None, help="File of latencies to replay.")
+    parser.add_argument("--latency_mean", type=float, default=0.25, help="Average latency, in seconds.")
+    parser.add_argument("--latency_std", type=float, default=0.08, help="Latency std, in seconds.")
+    parser.add_argument("--latency_ema_alpha", type=float, default=0.1)
+    parser.add_argument("--latency_std_factor", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'scheduling':<24}" + "".join(f"{key:>20}" for key in RESULT_KEYS))
+    for latency_compensation in [False, True]:
+        latencies = (
+            replay_latencies(args.latencies_path)
+            if args.latencies_path is not None
+            else sample_latencies(args.latency_mean, args.latency_std, args.seed)
+        )
+        results = simulate(
+            latencies,
+            fps=args.fps,
+            actions_per_chunk=args.actions_per_chunk,
+            chunk_size_threshold=args.chunk_size_threshold,
+            num_steps=args.num_steps,
+            latency_estimator=LatencyEstimator(args.latency_ema_alpha, args.latency_std_factor)
+            if latency_compensation
+            else None,
+        )
+        name = "latency compensation" if latency_compensation else "threshold only"
+        print(f"{name:<24}" + "".join(f"{results[key]:>20.3f}" for key in RESULT_KEYS))
+
+
+if __name__ == "__main__":
+    main()
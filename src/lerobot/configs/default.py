@@ -16,8 +16,9 @@
 
 from dataclasses import dataclass, field
 
+from lerobot.datasets.frame_cache import VideoFrameCacheConfig
 from lerobot.datasets.transforms import ImageTransformsConfig
-from lerobot.datasets.video_utils import get_safe_default_codec
+from lerobot.datasets.video_utils import DEFAULT_VIDEO_DECODER_CACHE_SIZE, get_safe_default_codec
 
 
 @dataclass
@@ -35,6 +36,17 @@ class DatasetConfig:
     use_imagenet_stats: bool = True
     video_backend: str = field(default_factory=get_safe_default_codec)
     streaming: bool = False
+    # Serve numeric columns (state, action, index, etc.) from memory-mapped .npy files shared by all workers.
+    use_mmap_columns: bool = False
+    # Shuffle blocks of this many adjacent frames instead of single frames, so that video frames shared by
+    # samples of a batch are decoded only once. 1 disables block shuffling.
+    sampler_block_size: int = 1
+    # Maximum number of video decoders (and open video files) kept alive by each DataLoader worker. Least
+    # recently used decoders are closed beyond that. None means unbounded.
+    video_decoder_cache_size: int | None = DEFAULT_VIDEO_DECODER_CACHE_SIZE
+    frame_cache: VideoFrameCacheConfig = field(default_factory=VideoFrameCacheConfig)
+    # Return video frames as uint8 and convert them to float on the device, in the policy preprocessor.
+    return_uint8_frames: bool = False
 
 
 @dataclass
@@ -75,6 +75,10 @@ class PreTrainedConfig(draccus.ChoiceRegistry, HubMixin, abc.ABC):  # type: igno
     # Either the repo ID of a model hosted on the Hub or a path to a directory containing weights
     # saved using `Policy.save_pretrained`. If not provided, the policy is initialized from scratch.
     pretrained_path: Path | None = None
+    # Action chunking policies only. When set, the next action chunk is predicted in a background thread as soon
+    # as at most this many actions are left in the queue, so that selecting an action never waits for inference
+    # (see `PreTrainedPolicy.select_action_with_prefetch`).
+    chunk_prefetch_threshold: int | None = None
 
     def __post_init__(self) -> None:
         if not self.device or not is_torch_device_available(self.device):
@@ -82,6 +86,11 @@ class PreTrainedConfig(draccus.ChoiceRegistry, HubMixin, abc.ABC):  # type: igno
             logger.warning(f"Device '{self.device}' is not available. Switching to '{auto_device}'.")
             self.device = auto_device.type
 
+        if self.chunk_prefetch_threshold is not None and self.chunk_prefetch_threshold < 0:
+            raise ValueError(
+                f"`chunk_prefetch_threshold` must be non-negative. Got {self.chunk_prefetch_threshold}."
+            )
+
         # Automatically deactivate AMP if necessary
         if self.use_amp and not is_amp_available(self.device):
             logger.warning(
@@ -13,7 +13,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
+import PIL.Image
 
 from lerobot.datasets.utils import load_image_as_numpy
 
@@ -53,12 +57,15 @@ class RunningQuantileStats:
         """
         batch = batch.reshape(-1, batch.shape[-1])
         num_elements, vector_length = batch.shape
+        # Reductions over contiguous memory are much faster than over the strided columns of `batch`, so
+        # statistics are computed on its transpose, one row per vector dimension.
+        columns = np.ascontiguousarray(batch.T)
 
         if self._count == 0:
-            self._mean = np.mean(batch, axis=0)
-            self._mean_of_squares = np.mean(batch**2, axis=0)
-            self._min = np.min(batch, axis=0)
-            self._max = np.max(batch, axis=0)
+            self._mean = np.mean(columns, axis=1)
+            self._mean_of_squares = np.mean(columns**2, axis=1)
+            self._min = np.min(columns, axis=1)
+            self._max = np.max(columns, axis=1)
             self._histograms = [np.zeros(self._num_quantile_bins) for _ in range(vector_length)]
             self._bin_edges = [
                 np.linspace(self._min[i] - 1e-10, self._max[i] + 1e-10, self._num_quantile_bins + 1)
@@ -68,8 +75,8 @@ class RunningQuantileStats:
             if vector_length != self._mean.size:
                 raise ValueError("The length of new vectors does not match the initialized vector length.")
 
-            new_max = np.max(batch, axis=0)
-            new_min = np.min(batch, axis=0)
+            new_max = np.max(columns, axis=1)
+            new_min = np.min(columns, axis=1)
             max_changed = np.any(new_max > self._max)
             min_changed = np.any(new_min < self._min)
             self._max = np.maximum(self._max, new_max)
@@ -80,8 +87,8 @@ class RunningQuantileStats:
 
         self._count += num_elements
 
-        batch_mean = np.mean(batch, axis=0)
-        batch_mean_of_squares = np.mean(batch**2, axis=0)
+        batch_mean = np.mean(columns, axis=1)
+        batch_mean_of_squares = np.mean(columns**2, axis=1)
 
         # Update running mean and mean of squares
         self._mean += (batch_mean - self._mean) * (num_elements / self._count)
@@ -89,7 +96,7 @@ class RunningQuantileStats:
             num_elements / self._count
         )
 
-        self._update_histograms(batch)
+        self._update_histograms(columns)
 
     def get_statistics(self) -> dict[str, np.ndarray]:
         """Compute and return the statistics of the vectors processed so far.
@@ -148,48 +155,40 @@ class RunningQuantileStats:
             self._histograms[i] = new_hist
             self._bin_edges[i] = new_edges
 
-    def _update_histograms(self, batch: np.ndarray) -> None:
-        """Update histograms with new vectors."""
-        for i in range(batch.shape[1]):
-            hist, _ = np.histogram(batch[:, i], bins=self._bin_edges[i])
+    def _update_histograms(self, columns: np.ndarray) -> None:
+        """Update histograms with new vectors, given as contiguous columns of shape (vector_length, N)."""
+        for i in range(columns.shape[0]):
+            hist, _ = np.histogram(columns[i], bins=self._bin_edges[i])
             self._histograms[i] += hist
 
     def _compute_quantiles(self) -> list[np.ndarray]:
-        """Compute quantiles based on histograms."""
+        """Compute quantiles based on histograms, for all the vector dimensions at once."""
+        cumsum = np.cumsum(np.stack(self._histograms), axis=1)
+        edges = np.stack(self._bin_edges)
+        num_bins = cumsum.shape[1]
+        dims = np.arange(cumsum.shape[0])
+
         results = []
         for q in self._quantile_list:
             target_count = q * self._count
-            q_values = []
-
-            for hist, edges in zip(self._histograms, self._bin_edges, strict=True):
-                q_value = self._compute_single_quantile(hist, edges, target_count)
-                q_values.append(q_value)
-
-            results.append(np.array(q_values))
+            # Same as `np.searchsorted(cumsum[i], target_count)` for each dimension i
+            idx = (cumsum < target_count).sum(axis=1)
+
+            # Linear interpolation within the bin
+            bin_idx = np.clip(idx, 1, num_bins - 1)
+            count_before = cumsum[dims, bin_idx - 1]
+            count_in_bin = cumsum[dims, bin_idx] - count_before
+            with np.errstate(divide="ignore", invalid="ignore"):
+                fraction = (target_count - count_before) / count_in_bin
+                q_values = edges[dims, bin_idx] + fraction * (edges[dims, bin_idx + 1] - edges[dims, bin_idx])
+
+            # If no samples in this bin, use the bin edge
+            q_values = np.where(count_in_bin == 0, edges[dims, bin_idx], q_values)
+            q_values = np.where(idx == 0, edges[:, 0], q_values)
+            q_values = np.where(idx >= num_bins, edges[:, -1], q_values)
+            results.append(q_values)
         return results
 
-    def _compute_single_quantile(self, hist: np.ndarray, edges: np.ndarray, target_count: float) -> float:
-        """Compute a single quantile value from histogram and bin edges."""
-        cumsum = np.cumsum(hist)
-        idx = np.searchsorted(cumsum, target_count)
-
-        if idx == 0:
-            return edges[0]
-        if idx >= len(cumsum):
-            return edges[-1]
-
-        # If not edge case, interpolate within the bin
-        count_before = cumsum[idx - 1]
-        count_in_bin = cumsum[idx] - count_before
-
-        # If no samples in this bin, use the bin edge
-        if count_in_bin == 0:
-            return edges[idx]
-
-        # Linear interpolation within the bin
-        fraction = (target_count - count_before) / count_in_bin
-        return edges[idx] + fraction * (edges[idx + 1] - edges[idx])
-
 
 def estimate_num_samples(
     dataset_len: int, min_num_samples: int = 100, max_num_samples: int = 10_000, power: float = 0.75
@@ -227,14 +226,35 @@ def auto_downsample_height_width(img: np.ndarray, target_size: int = 150, max_si
     return img[:, ::downsample_factor, ::downsample_factor]
 
 
-def sample_images(image_paths: list[str]) -> np.ndarray:
+def downsample_image_for_stats(image: np.ndarray | PIL.Image.Image) -> np.ndarray:
+    """Convert an image, (C, H, W), (H, W, C) or (H, W), uint8 or float in [0, 1], to the downsampled (C, H, W)
+    uint8 array `sample_images` would load from its file."""
+    if isinstance(image, PIL.Image.Image):
+        image = np.asarray(image.convert("RGB"))
+    if image.ndim == 2:
+        # Grayscale (H, W) -> (1, H, W)
+        image = image[None]
+    elif image.shape[-1] in (1, 3, 4) and image.shape[0] not in (1, 3, 4):
+        # (H, W, C) -> (C, H, W)
+        image = image.transpose(2, 0, 1)
+    image = auto_downsample_height_width(image)
+    if image.dtype != np.uint8:
+        image = (image * 255).astype(np.uint8)
+    return np.ascontiguousarray(image)
+
+
+def sample_images(image_paths: list[str] | list[np.ndarray]) -> np.ndarray:
+    """Sample images to compute stats on, given their paths or as (C, H, W) uint8 arrays already in memory."""
     sampled_indices = sample_indices(len(image_paths))
 
     images = None
     for i, idx in enumerate(sampled_indices):
         path = image_paths[idx]
         # we load as uint8 to reduce memory usage
-        img = load_image_as_numpy(path, dtype=np.uint8, channel_first=True)
+        if isinstance(path, np.ndarray):
+            img = path
+        else:
+            img = load_image_as_numpy(path, dtype=np.uint8, channel_first=True)
         img = auto_downsample_height_width(img)
 
         if images is None:
@@ -474,10 +494,31 @@ def get_feature_stats(
     return stats
 
 
+def _compute_feature_stats(data: list[str] | np.ndarray, dtype: str, quantile_list: list[float]) -> dict:
+    if dtype in ["image", "video"]:
+        # Images may already be sampled, as a (N, C, H, W) uint8 array
+        ep_ft_array = data if isinstance(data, np.ndarray) else sample_images(data)
+        axes_to_reduce = (0, 2, 3)
+        keepdims = True
+    else:
+        ep_ft_array = data
+        axes_to_reduce = 0
+        keepdims = data.ndim == 1
+
+    stats = get_feature_stats(
+        ep_ft_array, axis=axes_to_reduce, keepdims=keepdims, quantile_list=quantile_list
+    )
+
+    if dtype in ["image", "video"]:
+        stats = {k: v if k == "count" else np.squeeze(v / 255.0, axis=0) for k, v in stats.items()}
+    return stats
+
+
 def compute_episode_stats(
     episode_data: dict[str, list[str] | np.ndarray],
     features: dict,
     quantile_list: list[float] | None = None,
+    num_workers: int | None = None,
 ) -> dict:
     """Compute comprehensive statistics for all features in an episode.
 
@@ -486,11 +527,16 @@ def compute_episode_stats(
     - Numerical arrays: Computes per-feature statistics
     - Strings: Skipped (no statistics computed)
 
+    Features are processed concurrently in a thread pool, since image decoding and NumPy release the GIL.
+
     Args:
         episode_data: Dictionary mapping feature names to data
-            - For images/videos: list of file paths
+            - For images/videos: list of file paths, or of (C, H, W) uint8 arrays, or a (N, C, H, W) uint8
+              array of already sampled images
             - For numerical data: numpy arrays
         features: Dictionary describing each feature's dtype and shape
+        num_workers: Number of threads. Defaults to one per feature, up to the number of CPUs. Set to 1 to
+            process features sequentially.
 
     Returns:
         Dictionary mapping feature names to their statistics dictionaries.
@@ -503,30 +549,18 @@ def compute_episode_stats(
     if quantile_list is None:
         quantile_list = DEFAULT_QUANTILES
 
-    ep_stats = {}
-    for key, data in episode_data.items():
-        if features[key]["dtype"] == "string":
-            continue
+    keys = [key for key in episode_data if features[key]["dtype"] != "string"]
+    if num_workers is None:
+        num_workers = min(len(keys), os.cpu_count() or 1)
 
-        if features[key]["dtype"] in ["image", "video"]:
-            ep_ft_array = sample_images(data)
-            axes_to_reduce = (0, 2, 3)
-            keepdims = True
-        else:
-            ep_ft_array = data
-            axes_to_reduce = 0
-            keepdims = data.ndim == 1
-
-        ep_stats[key] = get_feature_stats(
-            ep_ft_array, axis=axes_to_reduce, keepdims=keepdims, quantile_list=quantile_list
-        )
+    def compute(key: str) -> dict:
+        return _compute_feature_stats(episode_data[key], features[key]["dtype"], quantile_list)
 
-        if features[key]["dtype"] in ["image", "video"]:
-            ep_stats[key] = {
-                k: v if k == "count" else np.squeeze(v / 255.0, axis=0) for k, v in ep_stats[key].items()
-            }
+    if num_workers <= 1:
+        return {key: compute(key) for key in keys}
 
-    return ep_stats
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        return dict(zip(keys, executor.map(compute, keys), strict=True))
 
 
 def _validate_stat_value(value: np.ndarray, key: str, feature_key: str) -> None:
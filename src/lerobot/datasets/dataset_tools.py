@@ -21,22 +21,32 @@ This module provides utilities for:
 - Splitting datasets into multiple smaller datasets
 - Adding/removing features from datasets
 - Merging datasets (wrapper around aggregate functionality)
+- Recomputing dataset statistics
 """
 
+import io
 import logging
 import shutil
+import threading
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import datasets
 import numpy as np
 import pandas as pd
+import PIL.Image
 import pyarrow.parquet as pq
 import torch
 from tqdm import tqdm
 
 from lerobot.datasets.aggregate import aggregate_datasets
-from lerobot.datasets.compute_stats import aggregate_stats
+from lerobot.datasets.compute_stats import (
+    aggregate_stats,
+    compute_episode_stats,
+    downsample_image_for_stats,
+    sample_indices,
+)
 from lerobot.datasets.lerobot_dataset import LeRobotDataset, LeRobotDatasetMetadata
 from lerobot.datasets.utils import (
     DATA_DIR,
@@ -44,6 +54,7 @@ from lerobot.datasets.utils import (
     DEFAULT_DATA_FILE_SIZE_IN_MB,
     DEFAULT_DATA_PATH,
     DEFAULT_EPISODES_PATH,
+    flatten_dict,
     get_parquet_file_size_in_mb,
     load_episodes,
     update_chunk_file_indices,
@@ -51,6 +62,7 @@ from lerobot.datasets.utils import (
     write_stats,
     write_tasks,
 )
+from lerobot.datasets.video_utils import VideoDecoderCache, decode_video_frames
 from lerobot.utils.constants import HF_LEROBOT_HOME
 
 
@@ -440,6 +452,134 @@ def remove_feature(
     )
 
 
+def recompute_dataset_stats(
+    dataset: LeRobotDataset, num_workers: int = 8
+) -> dict[str, dict[str, np.ndarray]]:
+    """Recompute the statistics of every episode of a dataset from its files, and the dataset statistics.
+
+    Episodes are processed concurrently by `num_workers` threads, since parquet reading, image and video
+    decoding and NumPy release the GIL. Images are sampled like when recording, and video frames are decoded
+    at the sampled timestamps only. The episode statistics are written back to the episodes metadata, and the
+    aggregated statistics to `meta/stats.json`.
+
+    Args:
+        dataset: The LeRobotDataset to update in place.
+        num_workers: Number of threads processing episodes.
+
+    Returns:
+        The aggregated dataset statistics.
+    """
+    meta = dataset.meta
+    if meta.episodes is None:
+        meta.episodes = load_episodes(meta.root)
+
+    stats_keys = [key for key, ft in meta.features.items() if ft["dtype"] != "string"]
+    parquet_keys = [key for key in stats_keys if meta.features[key]["dtype"] != "video"]
+
+    episodes_by_data_file: dict[tuple[int, int], list[int]] = {}
+    for ep_idx in range(meta.total_episodes):
+        ep = meta.episodes[ep_idx]
+        episodes_by_data_file.setdefault((ep["data/chunk_index"], ep["data/file_index"]), []).append(ep_idx)
+
+    # torchcodec decoders are not thread-safe, and episodes share video files: each thread has its own decoders
+    thread_local = threading.local()
+    decoder_caches: list[VideoDecoderCache] = []
+
+    def get_decoder_cache() -> VideoDecoderCache:
+        if not hasattr(thread_local, "decoder_cache"):
+            thread_local.decoder_cache = VideoDecoderCache(max_size=max(1, len(meta.video_keys)))
+            decoder_caches.append(thread_local.decoder_cache)
+        return thread_local.decoder_cache
+
+    episodes_stats = {}
+    try:
+        with (
+            ThreadPoolExecutor(max_workers=num_workers) as executor,
+            tqdm(total=meta.total_episodes, desc="Computing episodes stats") as pbar,
+        ):
+            for (chunk_idx, file_idx), ep_indices in episodes_by_data_file.items():
+                data_path = meta.root / meta.data_path.format(chunk_index=chunk_idx, file_index=file_idx)
+                df = pd.read_parquet(data_path, columns=list(dict.fromkeys([*parquet_keys, "episode_index"])))
+                episodes_df = dict(iter(df.groupby("episode_index")))
+
+                def compute(ep_idx: int, episodes_df: dict = episodes_df) -> dict:
+                    return _compute_episode_stats_from_files(
+                        dataset, ep_idx, episodes_df[ep_idx], stats_keys, get_decoder_cache()
+                    )
+
+                for ep_idx, ep_stats in zip(ep_indices, executor.map(compute, ep_indices), strict=True):
+                    episodes_stats[ep_idx] = ep_stats
+                    pbar.update()
+    finally:
+        for decoder_cache in decoder_caches:
+            decoder_cache.clear()
+
+    _write_episodes_stats(meta, episodes_stats)
+    meta.episodes = load_episodes(meta.root)
+
+    stats = aggregate_stats([episodes_stats[ep_idx] for ep_idx in range(meta.total_episodes)])
+    write_stats(stats, meta.root)
+    meta.stats = stats
+    return stats
+
+
+def _compute_episode_stats_from_files(
+    dataset: LeRobotDataset,
+    ep_idx: int,
+    ep_df: pd.DataFrame,
+    stats_keys: list[str],
+    decoder_cache: VideoDecoderCache | None = None,
+) -> dict:
+    meta = dataset.meta
+    ep = meta.episodes[ep_idx]
+    ep_length = ep["length"]
+    sampled = sample_indices(ep_length)
+
+    episode_data = {}
+    for key in stats_keys:
+        dtype = meta.features[key]["dtype"]
+        if dtype == "video":
+            video_path = meta.root / meta.get_video_file_path(ep_idx, key)
+            timestamps = [ep[f"videos/{key}/from_timestamp"] + idx / meta.fps for idx in sampled]
+            frames = decode_video_frames(
+                video_path,
+                timestamps,
+                dataset.tolerance_s,
+                dataset.video_backend,
+                decoder_cache=decoder_cache,
+                return_uint8=True,
+            )
+            episode_data[key] = np.stack([downsample_image_for_stats(frame) for frame in frames.numpy()])
+        elif dtype == "image":
+            images = []
+            for value in ep_df[key].iloc[sampled]:
+                source = io.BytesIO(value["bytes"]) if value.get("bytes") else value["path"]
+                with PIL.Image.open(source) as image:
+                    images.append(downsample_image_for_stats(image))
+            episode_data[key] = np.stack(images)
+        else:
+            episode_data[key] = np.stack(ep_df[key].to_numpy())
+
+    return compute_episode_stats(episode_data, meta.features, num_workers=1)
+
+
+def _write_episodes_stats(meta: LeRobotDatasetMetadata, episodes_stats: dict[int, dict]) -> None:
+    """Replace the `stats/*` columns of the episodes metadata files."""
+    episodes_by_meta_file: dict[tuple[int, int], list[int]] = {}
+    for ep_idx in episodes_stats:
+        ep = meta.episodes[ep_idx]
+        key = (ep["meta/episodes/chunk_index"], ep["meta/episodes/file_index"])
+        episodes_by_meta_file.setdefault(key, []).append(ep_idx)
+
+    for chunk_idx, file_idx in episodes_by_meta_file:
+        path = meta.root / DEFAULT_EPISODES_PATH.format(chunk_index=chunk_idx, file_index=file_idx)
+        df = pd.read_parquet(path)
+        flat_stats = [flatten_dict({"stats": episodes_stats[ep_idx]}) for ep_idx in df["episode_index"]]
+        for column in flat_stats[0]:
+            df[column] = [ep_stats[column].tolist() for ep_stats in flat_stats]
+        df.to_parquet(path, index=False)
+
+
 def _fractions_to_episode_indices(
     total_episodes: int,
     splits: dict[str, float],
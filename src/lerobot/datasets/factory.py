@@ -98,6 +98,10 @@ def make_dataset(cfg: TrainPipelineConfig) -> LeRobotDataset | MultiLeRobotDatas
                 image_transforms=image_transforms,
                 revision=cfg.dataset.revision,
                 video_backend=cfg.dataset.video_backend,
+                use_mmap_columns=cfg.dataset.use_mmap_columns,
+                video_decoder_cache_size=cfg.dataset.video_decoder_cache_size,
+                frame_cache_config=cfg.dataset.frame_cache,
+                return_uint8_frames=cfg.dataset.return_uint8_frames,
             )
         else:
             dataset = StreamingLeRobotDataset(
@@ -108,6 +112,7 @@ def make_dataset(cfg: TrainPipelineConfig) -> LeRobotDataset | MultiLeRobotDatas
                 image_transforms=image_transforms,
                 revision=cfg.dataset.revision,
                 max_num_shards=cfg.num_workers,
+                video_decoder_cache_size=cfg.dataset.video_decoder_cache_size,
             )
     else:
         raise NotImplementedError("The MultiLeRobotDataset isn't supported for now.")
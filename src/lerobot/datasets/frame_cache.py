@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import hashlib
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import torch
+from torchvision.transforms.v2 import functional as F  # noqa: N812
+
+from lerobot.datasets.video_utils import VideoDecoderCache, decode_video_frames_batch
+
+
+@dataclass
+class VideoFrameCacheConfig:
+    """Cache of decoded video frames, to turn the decoding of later epochs into plain memory copies.
+
+    Frames are stored as uint8 and keyed by (video file, frame index). A RAM tier keeps the most recently used
+    frames of each process: it is not shared, each DataLoader worker holding its own frames within its part of
+    the budget. An optional disk tier spills the decoded frames to memory-mapped shard files (ideally on a
+    local NVMe drive), which are shared by all DataLoader workers through the page cache.
+    """
+
+    # Set this flag to `true` to cache decoded frames.
+    enable: bool = False
+    # Total size of the in-memory tier, in MB, split evenly between the DataLoader workers. 0 disables it.
+    ram_size_mb: int = 1024
+    # Directory of the on-disk tier. None disables it.
+    disk_dir: str | None = None
+    # Maximum size of the on-disk tier, in MB. Once reached, new frames are no longer spilled to disk (shards of
+    # videos that changed since are not reclaimed: clear `disk_dir` to do so).
+    disk_size_mb: int = 50 * 1024
+    # (height, width) frames are resized to before being cached. None keeps the original resolution.
+    resolution: tuple[int, int] | None = None
+    # Number of frames stored in each on-disk shard file.
+    frames_per_shard: int = 256
+
+
+class VideoFrameCache:
+    """Two-tier (RAM + disk) cache of decoded uint8 video frames.
+
+    The on-disk tier stores, for each video file, shard files holding `frames_per_shard` frames each. Every
+    row of a shard is a validity byte followed by the frame pixels, so that a frame and its validity always
+    live in the same file. Shards are created atomically and filled concurrently by all processes. The shards
+    of a video are keyed by its path, size and modification time (read once per process), so that a video
+    re-recorded or re-encoded at the same path gets new shards instead of serving stale frames.
+
+    The RAM tier of each process gets `config.ram_size_mb` divided by the number of DataLoader workers, when
+    the cache is created in one of them.
+
+    Args:
+        config: Cache configuration.
+        fps: Frame rate of the videos, used to convert timestamps into frame indices.
+    """
+
+    def __init__(self, config: VideoFrameCacheConfig, fps: int):
+        self.config = config
+        self.fps = fps
+        worker_info = torch.utils.data.get_worker_info()
+        num_workers = worker_info.num_workers if worker_info is not None else 1
+        self.max_ram_bytes = config.ram_size_mb * 1024**2 // num_workers
+        self.max_disk_bytes = config.disk_size_mb * 1024**2
+        self.disk_dir = Path(config.disk_dir) if config.disk_dir is not None else None
+
+        self._ram: OrderedDict[tuple[str, int], torch.Tensor] = OrderedDict()
+        self._ram_bytes = 0
+        self._shards: dict[tuple[str, int], np.memmap] = {}
+        self._frame_shapes: dict[str, tuple[int, int, int]] = {}
+        self._video_dirs: dict[str, Path] = {}
+        self._disk_full = False
+        self.hits = 0
+        self.misses = 0
+
+    def _video_dir(self, video_path: str) -> Path:
+        if video_path not in self._video_dirs:
+            stat = os.stat(video_path)
+            key = f"{video_path}:{stat.st_size}:{stat.st_mtime_ns}"
+            self._video_dirs[video_path] = self.disk_dir / hashlib.sha1(key.encode()).hexdigest()[:16]
+        return self._video_dirs[video_path]
+
+    def _get_frame_shape(self, video_path: str) -> tuple[int, int, int] | None:
+        """Frame shape of the shards of a video, looked up from existing shard files until one is found.
+
+        A missing shape is not remembered, as the shards of the video may be written by other processes.
+        """
+        if video_path not in self._frame_shapes:
+            for fpath in self._video_dir(video_path).glob("shard-*.npy"):
+                self._frame_shapes[video_path] = tuple(
+                    int(dim) for dim in fpath.stem.split("-")[-1].split("x")
+                )
+                break
+        return self._frame_shapes.get(video_path)
+
+    def _disk_usage(self) -> int:
+        """Size in bytes of the shard files of the on-disk tier, written by any process."""
+        return sum(fpath.stat().st_size for fpath in self.disk_dir.glob("*/shard-*.npy"))
+
+    def _get_shard(
+        self, video_path: str, shard_idx: int, frame_shape: tuple[int, int, int], create: bool
+    ) -> np.memmap | None:
+        key = (video_path, shard_idx)
+        if key in self._shards:
+            return self._shards[key]
+
+        video_dir = self._video_dir(video_path)
+        fpath = video_dir / f"shard-{shard_idx:06d}-{'x'.join(str(dim) for dim in frame_shape)}.npy"
+        if not fpath.is_file():
+            if not create or self._disk_full:
+                return None
+            shard_bytes = self.config.frames_per_shard * (1 + int(np.prod(frame_shape)))
+            if self._disk_usage() + shard_bytes > self.max_disk_bytes:
+                # Shards are never evicted, so the tier stays full
+                self._disk_full = True
+                return None
+            video_dir.mkdir(parents=True, exist_ok=True)
+            tmp_fpath = video_dir / f"{fpath.stem}.{os.getpid()}.tmp"
+            np.lib.format.open_memmap(
+                tmp_fpath,
+                mode="w+",
+                dtype=np.uint8,
+                shape=(self.config.frames_per_shard, 1 + int(np.prod(frame_shape))),
+            ).flush()
+            try:
+                # The first process to create the shard wins, the others use it.
+                os.link(tmp_fpath, fpath)
+            except FileExistsError:
+                pass
+            finally:
+                tmp_fpath.unlink()
+
+        self._shards[key] = np.load(fpath, mmap_mode="r+")
+        return self._shards[key]
+
+    def _put_ram(self, key: tuple[str, int], frame: torch.Tensor) -> None:
+        if frame.nbytes > self.max_ram_bytes:
+            return
+        if key in self._ram:
+            self._ram.move_to_end(key)
+            return
+        self._ram[key] = frame
+        self._ram_bytes += frame.nbytes
+        while self._ram_bytes > self.max_ram_bytes:
+            _, evicted = self._ram.popitem(last=False)
+            self._ram_bytes -= evicted.nbytes
+
+    def get(self, video_path: str, timestamp: float) -> torch.Tensor | None:
+        """Return the cached (C, H, W) uint8 frame at `timestamp`, or None."""
+        frame_idx = round(timestamp * self.fps)
+        key = (video_path, frame_idx)
+        if key in self._ram:
+            self._ram.move_to_end(key)
+            self.hits += 1
+            return self._ram[key]
+
+        frame_shape = self._get_frame_shape(video_path) if self.disk_dir is not None else None
+        if frame_shape is not None:
+            shard_idx, row = divmod(frame_idx, self.config.frames_per_shard)
+            shard = self._get_shard(video_path, shard_idx, frame_shape, create=False)
+            if shard is not None and shard[row, 0] == 1:
+                frame = torch.from_numpy(shard[row, 1:].reshape(frame_shape).copy())
+                self._put_ram(key, frame)
+                self.hits += 1
+                return frame
+
+        self.misses += 1
+        return None
+
+    def put(self, video_path: str, timestamp: float, frame: torch.Tensor) -> torch.Tensor:
+        """Cache a decoded (C, H, W) frame (uint8, or float in [0, 1]) and return its cached uint8 version."""
+        if frame.dtype != torch.uint8:
+            frame = (frame * 255).round().to(torch.uint8)
+        if self.config.resolution is not None and tuple(frame.shape[-2:]) != tuple(self.config.resolution):
+            frame = F.resize(frame, list(self.config.resolution), antialias=True)
+        frame = frame.contiguous()
+
+        frame_idx = round(timestamp * self.fps)
+        self._put_ram((video_path, frame_idx), frame)
+
+        if self.disk_dir is not None:
+            frame_shape = tuple(frame.shape)
+            self._frame_shapes[video_path] = frame_shape
+            shard_idx, row = divmod(frame_idx, self.config.frames_per_shard)
+            shard = self._get_shard(video_path, shard_idx, frame_shape, create=True)
+            if shard is not None:
+                shard[row, 1:] = frame.numpy().reshape(-1)
+                # Written last, so that other processes never read a partially written frame.
+                shard[row, 0] = 1
+        return frame
+
+    def decode_batch(
+        self,
+        requests: list[tuple[Path | str, list[float]]],
+        tolerance_s: float,
+        backend: str | None = None,
+        decoder_cache: VideoDecoderCache | None = None,
+    ) -> list[torch.Tensor]:
+        """Same as `decode_video_frames_batch`, but serving frames from the cache when possible.
+
+        Only frames missing from the cache are decoded, and they are added to the cache. Frames are returned
+        as uint8 tensors of shape (N, C, H, W).
+        """
+        results = []
+        missing = []
+        for request_idx, (video_path, timestamps) in enumerate(requests):
+            frames = [self.get(str(video_path), ts) for ts in timestamps]
+            missing_positions = [i for i, frame in enumerate(frames) if frame is None]
+            if len(missing_positions) > 0:
+                missing.append((request_idx, missing_positions))
+            results.append(frames)
+
+        if len(missing) > 0:
+            decoded = decode_video_frames_batch(
+                [
+                    (requests[request_idx][0], [requests[request_idx][1][i] for i in positions])
+                    for request_idx, positions in missing
+                ],
+                tolerance_s,
+                backend,
+                decoder_cache=decoder_cache,
+                return_uint8=True,
+            )
+            for (request_idx, positions), frames in zip(missing, decoded, strict=True):
+                video_path, timestamps = requests[request_idx]
+                for i, frame in zip(positions, frames, strict=True):
+                    results[request_idx][i] = self.put(str(video_path), timestamps[i], frame)
+
+        return [torch.stack(frames) for frames in results]
+
+    def stats(self) -> dict[str, int | float]:
+        """Return the hit/miss counters and the size of the RAM tier."""
+        num_requests = self.hits + self.misses
+        return {
+            "ram_frames": len(self._ram),
+            "ram_bytes": self._ram_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / num_requests if num_requests > 0 else 0.0,
+        }
@@ -13,9 +13,14 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import logging
 import multiprocessing
 import queue
+import sys
 import threading
+import time
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
 from pathlib import Path
 
 import numpy as np
@@ -104,21 +109,94 @@ def write_image(image: np.ndarray | PIL.Image.Image, fpath: Path, compress_level
         print(f"Error writing image {fpath}: {e}")
 
 
-def worker_thread_loop(queue: queue.Queue):
+@dataclass
+class SharedImageSlot:
+    """Reference to an image stored in a slot of a `SharedImageRingBuffer`, sent instead of the image itself."""
+
+    shm_name: str
+    slot: int
+    shape: tuple[int, ...]
+    dtype: str
+
+
+class SharedImageRingBuffer:
+    """
+    Preallocated shared memory slots holding images of a given shape and dtype, in which the recording process
+    copies images so that only their slot index is sent to the writer processes, instead of the pickled image.
+    Slots are released by the writer processes once the image is written.
+    """
+
+    def __init__(self, shape: tuple[int, ...], dtype: np.dtype, num_slots: int):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.num_slots = num_slots
+        self.slot_nbytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self.shm = shared_memory.SharedMemory(create=True, size=self.slot_nbytes * num_slots)
+        self.free_slots = list(range(num_slots))
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def write(self, image: np.ndarray) -> SharedImageSlot:
+        slot = self.free_slots.pop()
+        slot_array = np.ndarray(
+            self.shape, dtype=self.dtype, buffer=self.shm.buf, offset=slot * self.slot_nbytes
+        )
+        slot_array[...] = image
+        return SharedImageSlot(self.name, slot, self.shape, self.dtype.str)
+
+    def release(self, slot: int) -> None:
+        self.free_slots.append(slot)
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+
+# Shared memory attached by each writer process, by name
+_attached_shared_memory: dict[str, shared_memory.SharedMemory] = {}
+_attached_shared_memory_lock = threading.Lock()
+
+
+def _get_shared_image(image_slot: SharedImageSlot) -> np.ndarray:
+    with _attached_shared_memory_lock:
+        shm = _attached_shared_memory.get(image_slot.shm_name)
+        if shm is None:
+            if sys.version_info >= (3, 13):
+                shm = shared_memory.SharedMemory(name=image_slot.shm_name, track=False)
+            else:
+                shm = shared_memory.SharedMemory(name=image_slot.shm_name)
+                # The recording process owns and unlinks the shared memory, not this one
+                resource_tracker.unregister(shm._name, "shared_memory")
+            _attached_shared_memory[image_slot.shm_name] = shm
+
+    dtype = np.dtype(image_slot.dtype)
+    slot_nbytes = int(np.prod(image_slot.shape)) * dtype.itemsize
+    return np.ndarray(image_slot.shape, dtype=dtype, buffer=shm.buf, offset=image_slot.slot * slot_nbytes)
+
+
+def worker_thread_loop(queue: queue.Queue, released_slots: multiprocessing.Queue | None = None):
     while True:
         item = queue.get()
         if item is None:
             queue.task_done()
             break
         image_array, fpath = item
-        write_image(image_array, fpath)
+        if isinstance(image_array, SharedImageSlot):
+            try:
+                write_image(_get_shared_image(image_array), fpath)
+            finally:
+                released_slots.put((image_array.shm_name, image_array.slot))
+        else:
+            write_image(image_array, fpath)
         queue.task_done()
 
 
-def worker_process(queue: queue.Queue, num_threads: int):
+def worker_process(queue: queue.Queue, num_threads: int, released_slots: multiprocessing.Queue | None = None):
     threads = []
     for _ in range(num_threads):
-        t = threading.Thread(target=worker_thread_loop, args=(queue,))
+        t = threading.Thread(target=worker_thread_loop, args=(queue, released_slots))
         t.daemon = True
         t.start()
         threads.append(t)
@@ -139,16 +217,28 @@ class AsyncImageWriter:
     The optimal number of processes and threads depends on your computer capabilities.
     We advise to use 4 threads per camera with 0 processes. If the fps is not stable, try to increase or lower
     the number of threads. If it is still not stable, try to use 1 subprocess, or more.
+
+    With subprocesses, numpy images are copied into `num_shared_slots` shared memory slots per image shape
+    rather than pickled through the queue. When all the slots are in use, `save_image` blocks until the
+    subprocesses release one: see `stats()` for how often and how long that happened.
     """
 
-    def __init__(self, num_processes: int = 0, num_threads: int = 1):
+    def __init__(self, num_processes: int = 0, num_threads: int = 1, num_shared_slots: int = 32):
         self.num_processes = num_processes
         self.num_threads = num_threads
+        self.num_shared_slots = num_shared_slots
         self.queue = None
         self.threads = []
         self.processes = []
+        self.ring_buffers: dict[tuple, SharedImageRingBuffer] = {}
+        self.released_slots = None
         self._stopped = False
 
+        self.num_shared_images = 0
+        self.num_backpressure_waits = 0
+        self.backpressure_wait_s = 0.0
+        self.max_slots_in_use = 0
+
         if num_threads <= 0 and num_processes <= 0:
             raise ValueError("Number of threads and processes must be greater than zero.")
 
@@ -163,8 +253,11 @@ class AsyncImageWriter:
         else:
             # Use multiprocessing
             self.queue = multiprocessing.JoinableQueue()
+            self.released_slots = multiprocessing.Queue()
             for _ in range(self.num_processes):
-                p = multiprocessing.Process(target=worker_process, args=(self.queue, self.num_threads))
+                p = multiprocessing.Process(
+                    target=worker_process, args=(self.queue, self.num_threads, self.released_slots)
+                )
                 p.daemon = True
                 p.start()
                 self.processes.append(p)
@@ -173,8 +266,50 @@ class AsyncImageWriter:
         if isinstance(image, torch.Tensor):
             # Convert tensor to numpy array to minimize main process time
             image = image.cpu().numpy()
+        if self.num_processes > 0 and self.num_shared_slots > 0 and isinstance(image, np.ndarray):
+            image = self._write_shared_image(image)
         self.queue.put((image, fpath))
 
+    def _write_shared_image(self, image: np.ndarray) -> SharedImageSlot:
+        key = (image.shape, image.dtype.str)
+        if key not in self.ring_buffers:
+            self.ring_buffers[key] = SharedImageRingBuffer(image.shape, image.dtype, self.num_shared_slots)
+        ring_buffer = self.ring_buffers[key]
+
+        self._collect_released_slots(block=False)
+        if len(ring_buffer.free_slots) == 0:
+            # Backpressure: wait for the subprocesses to write images and release their slots
+            self.num_backpressure_waits += 1
+            start = time.perf_counter()
+            while len(ring_buffer.free_slots) == 0:
+                self._collect_released_slots(block=True)
+            self.backpressure_wait_s += time.perf_counter() - start
+
+        self.num_shared_images += 1
+        self.max_slots_in_use = max(
+            self.max_slots_in_use, self.num_shared_slots - len(ring_buffer.free_slots) + 1
+        )
+        return ring_buffer.write(image)
+
+    def _collect_released_slots(self, block: bool) -> None:
+        ring_buffers = {ring_buffer.name: ring_buffer for ring_buffer in self.ring_buffers.values()}
+        try:
+            while True:
+                shm_name, slot = self.released_slots.get(block=block)
+                ring_buffers[shm_name].release(slot)
+                block = False
+        except queue.Empty:
+            pass
+
+    def stats(self) -> dict[str, int | float]:
+        """Return the number of images sent through shared memory and the time spent waiting for free slots."""
+        return {
+            "num_shared_images": self.num_shared_images,
+            "num_backpressure_waits": self.num_backpressure_waits,
+            "backpressure_wait_s": self.backpressure_wait_s,
+            "max_slots_in_use": self.max_slots_in_use,
+        }
+
     def wait_until_done(self):
         self.queue.join()
 
@@ -198,4 +333,12 @@ class AsyncImageWriter:
             self.queue.close()
             self.queue.join_thread()
 
+            if self.num_backpressure_waits > 0:
+                logging.info(f"Image writer waited for free shared memory slots: {self.stats()}")
+            for ring_buffer in self.ring_buffers.values():
+                ring_buffer.close()
+            self.ring_buffers = {}
+            self.released_slots.close()
+            self.released_slots.join_thread()
+
         self._stopped = True
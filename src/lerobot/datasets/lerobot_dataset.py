@@ -14,10 +14,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import contextlib
+import copy
 import logging
+import multiprocessing
 import shutil
 import tempfile
 from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
 
 import datasets
@@ -32,19 +35,28 @@ import torch.utils
 from huggingface_hub import HfApi, snapshot_download
 from huggingface_hub.errors import RevisionNotFoundError
 
-from lerobot.datasets.compute_stats import aggregate_stats, compute_episode_stats
+from lerobot.datasets.compute_stats import (
+    aggregate_stats,
+    compute_episode_stats,
+    downsample_image_for_stats,
+    sample_indices,
+)
+from lerobot.datasets.frame_cache import VideoFrameCache, VideoFrameCacheConfig
 from lerobot.datasets.image_writer import AsyncImageWriter, write_image
 from lerobot.datasets.utils import (
     DEFAULT_EPISODES_PATH,
     DEFAULT_FEATURES,
     DEFAULT_IMAGE_PATH,
+    DEFAULT_MMAP_DIR,
     INFO_PATH,
     _validate_feature_names,
+    arrow_column_to_torch,
     check_delta_timestamps,
     check_version_compatibility,
     create_empty_dataset_info,
     create_lerobot_dataset_card,
     embed_images,
+    export_mmap_columns,
     flatten_dict,
     get_delta_indices,
     get_file_size_in_mb,
@@ -54,6 +66,7 @@ from lerobot.datasets.utils import (
     is_valid_version,
     load_episodes,
     load_info,
+    load_mmap_columns,
     load_nested_dataset,
     load_stats,
     load_tasks,
@@ -66,9 +79,13 @@ from lerobot.datasets.utils import (
     write_tasks,
 )
 from lerobot.datasets.video_utils import (
+    DEFAULT_VIDEO_DECODER_CACHE_SIZE,
+    StreamingVideoEncoder,
+    VideoDecoderCache,
     VideoFrame,
     concatenate_video_files,
     decode_video_frames,
+    decode_video_frames_batch,
     encode_video_frames,
     get_safe_default_codec,
     get_video_duration_in_s,
@@ -77,6 +94,18 @@ from lerobot.datasets.video_utils import (
 from lerobot.utils.constants import HF_LEROBOT_HOME
 
 CODEBASE_VERSION = "v3.0"
+# Maximum number of downsampled frames of each camera kept in memory to compute the stats of an episode
+MAX_STATS_FRAMES_IN_MEMORY = 1000
+
+
+def _encode_episode_video_frames(imgs_dir: Path, video_path: Path, fps: int) -> Path:
+    """Encode the frames of an episode stored as png into a video, then remove the frames.
+
+    Defined at module level so that it can be run by the background video encoding processes.
+    """
+    encode_video_frames(imgs_dir, video_path, fps, overwrite=True)
+    shutil.rmtree(imgs_dir)
+    return video_path
 
 
 class LeRobotDatasetMetadata:
@@ -95,6 +124,8 @@ class LeRobotDatasetMetadata:
         self.latest_episode = None
         self.metadata_buffer: list[dict] = []
         self.metadata_buffer_size = metadata_buffer_size
+        # Info and stats to write once the metadata of a deferred episode is saved, by episode index
+        self._deferred_episodes: dict[int, tuple[dict, dict]] = {}
 
         try:
             if force_cache_sync:
@@ -398,7 +429,8 @@ class LeRobotDatasetMetadata:
         episode_tasks: list[str],
         episode_stats: dict[str, dict],
         episode_metadata: dict,
-    ) -> None:
+        defer_metadata: bool = False,
+    ) -> dict:
         episode_dict = {
             "episode_index": episode_index,
             "tasks": episode_tasks,
@@ -406,18 +438,31 @@ class LeRobotDatasetMetadata:
         }
         episode_dict.update(episode_metadata)
         episode_dict.update(flatten_dict({"stats": episode_stats}))
-        self._save_episode_metadata(episode_dict)
 
         # Update info
         self.info["total_episodes"] += 1
         self.info["total_frames"] += episode_length
         self.info["total_tasks"] = len(self.tasks)
         self.info["splits"] = {"train": f"0:{self.info['total_episodes']}"}
-
-        write_info(self.info, self.root)
-
         self.stats = aggregate_stats([self.stats, episode_stats]) if self.stats is not None else episode_stats
-        write_stats(self.stats, self.root)
+
+        if defer_metadata:
+            # The caller saves the episode with `save_deferred_episode`, once the missing entries of its metadata
+            # (e.g. those of videos encoded in the background) are known. Until then, the info and stats on disk
+            # do not account for the episode either.
+            self._deferred_episodes[episode_index] = (copy.deepcopy(self.info), self.stats)
+        else:
+            self._save_episode_metadata(episode_dict)
+            write_info(self.info, self.root)
+            write_stats(self.stats, self.root)
+        return episode_dict
+
+    def save_deferred_episode(self, episode_dict: dict) -> None:
+        """Write the metadata of an episode saved with `defer_metadata`, along with the matching info and stats."""
+        info, stats = self._deferred_episodes.pop(episode_dict["episode_index"])
+        self._save_episode_metadata(episode_dict)
+        write_info(info, self.root)
+        write_stats(stats, self.root)
 
     def update_video_info(self, video_key: str | None = None) -> None:
         """
@@ -536,6 +581,7 @@ class LeRobotDatasetMetadata:
         obj.latest_episode = None
         obj.metadata_buffer = []
         obj.metadata_buffer_size = metadata_buffer_size
+        obj._deferred_episodes = {}
         return obj
 
 
@@ -553,6 +599,11 @@ class LeRobotDataset(torch.utils.data.Dataset):
         download_videos: bool = True,
         video_backend: str | None = None,
         batch_encoding_size: int = 1,
+        use_mmap_columns: bool = False,
+        video_decoder_cache_size: int | None = DEFAULT_VIDEO_DECODER_CACHE_SIZE,
+        frame_cache_config: VideoFrameCacheConfig | None = None,
+        return_uint8_frames: bool = False,
+        streaming_encoding: bool = False,
     ):
         """
         2 modes are available for instantiating this class, depending on 2 different use cases:
@@ -665,6 +716,23 @@ class LeRobotDataset(torch.utils.data.Dataset):
                 You can also use the 'pyav' decoder used by Torchvision, which used to be the default option, or 'video_reader' which is another decoder of Torchvision.
             batch_encoding_size (int, optional): Number of episodes to accumulate before batch encoding videos.
                 Set to 1 for immediate encoding (default), or higher for batched encoding. Defaults to 1.
+            use_mmap_columns (bool, optional): Serve numeric columns (state, action, index, timestamp, etc.)
+                from contiguous memory-mapped .npy files exported next to the parquet files in 'data/mmap',
+                instead of going through the Hugging Face formatting. Pages are shared across DataLoader
+                workers, which reduces their memory footprint. Defaults to False.
+            video_decoder_cache_size (int | None, optional): Maximum number of video decoders (and open video
+                files) kept alive by each process when decoding with torchcodec. Least recently used decoders
+                are closed beyond that. None means unbounded. Defaults to 64.
+            frame_cache_config (VideoFrameCacheConfig | None, optional): Configuration of the cache of decoded
+                video frames (RAM and on-disk uint8 tiers), which makes decoding in later epochs a memory
+                copy. Defaults to None (no cache).
+            return_uint8_frames (bool, optional): Return video frames as uint8 in [0, 255] instead of float32 in
+                [0, 1], which divides by 4 the volume of data sent from DataLoader workers and to the GPU. The
+                conversion to float is then expected to happen on the device, with `ImageToFloatProcessorStep`.
+                Defaults to False.
+            streaming_encoding (bool, optional): When recording, encode the frames of video features as they
+                are added with 'add_frame()', instead of writing them as png files and encoding them when the
+                episode is saved. Defaults to False.
         """
         super().__init__()
         self.repo_id = repo_id
@@ -678,9 +746,25 @@ class LeRobotDataset(torch.utils.data.Dataset):
         self.delta_indices = None
         self.batch_encoding_size = batch_encoding_size
         self.episodes_since_last_encoding = 0
+        self.use_mmap_columns = use_mmap_columns
+        self._mmap_keys = None
+        self._mmap_columns = None
+        self._hf_fallback_dataset = None
+        self.video_decoder_cache_size = video_decoder_cache_size
+        # Created lazily in each process, as decoders and open files can't be shared with DataLoader workers
+        self.video_decoder_cache = None
+        self.frame_cache_config = frame_cache_config
+        self.frame_cache = None
+        self.return_uint8_frames = return_uint8_frames
 
         # Unused attributes
         self.image_writer = None
+        self.video_encoder = None
+        self._pending_video_encodings = {}
+        self.streaming_encoding = streaming_encoding
+        self._streaming_encoders = {}
+        self._stats_frames = {}
+        self._stats_frames_stride = 1
         self.episode_buffer = None
         self.writer = None
         self.latest_episode = None
@@ -711,6 +795,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
                 self.revision = get_safe_version(self.repo_id, self.revision)
             self.download(download_videos)
             self.hf_dataset = self.load_hf_dataset()
+        self._export_mmap_columns()
 
         # Setup delta_indices
         if self.delta_timestamps is not None:
@@ -724,6 +809,18 @@ class LeRobotDataset(torch.utils.data.Dataset):
             writer.close()
             self.writer = None
 
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # Memory maps are reopened lazily in each DataLoader worker rather than pickled with their content.
+        state["_mmap_columns"] = None
+        state["video_decoder_cache"] = None
+        state["frame_cache"] = None
+        state["video_encoder"] = None
+        state["_pending_video_encodings"] = {}
+        state["_streaming_encoders"] = {}
+        state["_stats_frames"] = {}
+        return state
+
     def __del__(self):
         """
         Trust the user to call .finalize() but as an added safety check call the parquet writer to stop when calling the destructor
@@ -742,7 +839,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
         upload_large_folder: bool = False,
         **card_kwargs,
     ) -> None:
-        ignore_patterns = ["images/"]
+        ignore_patterns = ["images/", f"{DEFAULT_MMAP_DIR}/"]
         if not push_videos:
             ignore_patterns.append("videos/")
 
@@ -834,6 +931,42 @@ class LeRobotDataset(torch.utils.data.Dataset):
         hf_dataset.set_transform(hf_transform_to_torch)
         return hf_dataset
 
+    def _export_mmap_columns(self) -> None:
+        """Export numeric columns to memory-mapped files when `use_mmap_columns` is enabled."""
+        self._mmap_keys = None
+        self._mmap_columns = None
+        self._hf_fallback_dataset = None
+        if not self.use_mmap_columns or self.hf_dataset is None or len(self.hf_dataset) == 0:
+            return
+        if self.hf_dataset._indices is not None:
+            logging.warning("Memory-mapped columns are not supported with an indices mapping, skipping.")
+            return
+
+        self._mmap_keys = export_mmap_columns(self.hf_dataset, self.root / DEFAULT_MMAP_DIR)
+        fallback_keys = [key for key in self.hf_dataset.column_names if key not in self._mmap_keys]
+        if len(fallback_keys) > 0:
+            self._hf_fallback_dataset = self.hf_dataset.select_columns(fallback_keys)
+
+    def _get_mmap_columns(self) -> dict[str, np.ndarray] | None:
+        """Memory-mapped numeric columns, opened lazily so that each process maps the files itself."""
+        if self._mmap_keys is None:
+            return None
+        if self._mmap_columns is None:
+            self._mmap_columns = load_mmap_columns(self.root / DEFAULT_MMAP_DIR, self._mmap_keys)
+        return self._mmap_columns
+
+    def _get_hf_item(self, idx: int) -> dict:
+        """Read a single row, using memory-mapped columns when available."""
+        mmap_columns = self._get_mmap_columns()
+        if mmap_columns is None:
+            return self.hf_dataset[idx]
+
+        # `array[idx, ...]` is a view (0-dim for scalar columns), so no data is copied here.
+        item = {key: torch.from_numpy(array[idx, ...]) for key, array in mmap_columns.items()}
+        if self._hf_fallback_dataset is not None:
+            item.update(self._hf_fallback_dataset[idx])
+        return item
+
     def _check_cached_episodes_sufficient(self) -> bool:
         """Check if the cached dataset contains all requested episodes and their video files."""
         if self.hf_dataset is None or len(self.hf_dataset) == 0:
@@ -932,6 +1065,10 @@ class LeRobotDataset(torch.utils.data.Dataset):
         query_timestamps = {}
         for key in self.meta.video_keys:
             if query_indices is not None and key in query_indices:
+                mmap_columns = self._get_mmap_columns()
+                if mmap_columns is not None and "timestamp" in mmap_columns:
+                    query_timestamps[key] = mmap_columns["timestamp"][query_indices[key]].tolist()
+                    continue
                 timestamps = self.hf_dataset[query_indices[key]]["timestamp"]
                 query_timestamps[key] = torch.stack(timestamps).tolist()
             else:
@@ -952,15 +1089,51 @@ class LeRobotDataset(torch.utils.data.Dataset):
             Dict with stacked tensors of queried data (video keys excluded)
         """
         result: dict = {}
+        mmap_columns = self._get_mmap_columns() or {}
         for key, q_idx in query_indices.items():
             if key in self.meta.video_keys:
                 continue
+            if key in mmap_columns:
+                result[key] = torch.from_numpy(mmap_columns[key][q_idx])
+                continue
             try:
                 result[key] = torch.stack(self.hf_dataset[key][q_idx])
             except (KeyError, TypeError, IndexError):
                 result[key] = torch.stack(self.hf_dataset[q_idx][key])
         return result
 
+    def _get_video_decoder_cache(self) -> VideoDecoderCache:
+        if self.video_decoder_cache is None:
+            self.video_decoder_cache = VideoDecoderCache(max_size=self.video_decoder_cache_size)
+        return self.video_decoder_cache
+
+    def _get_frame_cache(self) -> VideoFrameCache | None:
+        if self.frame_cache_config is None or not self.frame_cache_config.enable:
+            return None
+        if self.frame_cache is None:
+            self.frame_cache = VideoFrameCache(self.frame_cache_config, self.fps)
+        return self.frame_cache
+
+    def _decode_video_requests(self, requests: list[tuple[Path, list[float]]]) -> list[torch.Tensor]:
+        """Decode (video_path, timestamps) requests, going through the frame cache when enabled."""
+        decoder_cache = self._get_video_decoder_cache()
+        frame_cache = self._get_frame_cache()
+        if frame_cache is None:
+            return decode_video_frames_batch(
+                requests,
+                self.tolerance_s,
+                self.video_backend,
+                decoder_cache=decoder_cache,
+                return_uint8=self.return_uint8_frames,
+            )
+        frames = frame_cache.decode_batch(
+            requests, self.tolerance_s, self.video_backend, decoder_cache=decoder_cache
+        )
+        if self.return_uint8_frames:
+            return frames
+        # Same format as the decoding functions: float32 in [0,1] range
+        return [f.type(torch.float32) / 255 for f in frames]
+
     def _query_videos(self, query_timestamps: dict[str, list[float]], ep_idx: int) -> dict[str, torch.Tensor]:
         """Note: When using data workers (e.g. DataLoader with num_workers>0), do not call this function
         in the main process (e.g. by using a second Dataloader with num_workers=0). It will result in a
@@ -977,11 +1150,46 @@ class LeRobotDataset(torch.utils.data.Dataset):
             shifted_query_ts = [from_timestamp + ts for ts in query_ts]
 
             video_path = self.root / self.meta.get_video_file_path(ep_idx, vid_key)
-            frames = decode_video_frames(video_path, shifted_query_ts, self.tolerance_s, self.video_backend)
+            if self._get_frame_cache() is not None:
+                frames = self._decode_video_requests([(video_path, shifted_query_ts)])[0]
+            else:
+                frames = decode_video_frames(
+                    video_path,
+                    shifted_query_ts,
+                    self.tolerance_s,
+                    self.video_backend,
+                    decoder_cache=self._get_video_decoder_cache(),
+                    return_uint8=self.return_uint8_frames,
+                )
             item[vid_key] = frames.squeeze(0)
 
         return item
 
+    def _query_videos_batch(
+        self, query_timestamps: list[dict[str, list[float]]], ep_indices: list[int]
+    ) -> dict[str, torch.Tensor]:
+        """Batched version of `_query_videos`, returning frames stacked over the batch for each video key.
+
+        Requests of the whole batch are handed at once to `decode_video_frames_batch`, which decodes frames
+        shared between samples (e.g. adjacent frames with overlapping `delta_timestamps`) only once.
+        """
+        requests = []
+        for sample_ts, ep_idx in zip(query_timestamps, ep_indices, strict=True):
+            ep = self.meta.episodes[ep_idx]
+            for vid_key, query_ts in sample_ts.items():
+                from_timestamp = ep[f"videos/{vid_key}/from_timestamp"]
+                video_path = self.root / self.meta.get_video_file_path(ep_idx, vid_key)
+                requests.append((video_path, [from_timestamp + ts for ts in query_ts]))
+
+        frames = iter(self._decode_video_requests(requests))
+        samples_frames = [
+            {vid_key: next(frames).squeeze(0) for vid_key in sample_ts} for sample_ts in query_timestamps
+        ]
+        return {
+            vid_key: torch.stack([sample_frames[vid_key] for sample_frames in samples_frames])
+            for vid_key in self.meta.video_keys
+        }
+
     def _ensure_hf_dataset_loaded(self):
         """Lazy load the HF dataset only when needed for reading."""
         if self._lazy_loading or self.hf_dataset is None:
@@ -991,6 +1199,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
                 self._writer_closed_for_reading = True
             self.hf_dataset = self.load_hf_dataset()
             self._lazy_loading = False
+            self._export_mmap_columns()
 
     def __len__(self):
         return self.num_frames
@@ -998,7 +1207,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
     def __getitem__(self, idx) -> dict:
         # Ensure dataset is loaded when we actually need to read from it
         self._ensure_hf_dataset_loaded()
-        item = self.hf_dataset[idx]
+        item = self._get_hf_item(idx)
         ep_idx = item["episode_index"].item()
 
         query_indices = None
@@ -1025,6 +1234,121 @@ class LeRobotDataset(torch.utils.data.Dataset):
         item["task"] = self.meta.tasks.iloc[task_idx].name
         return item
 
+    def _get_episode_bounds(self) -> tuple[np.ndarray, np.ndarray]:
+        """Episode start/end indices as arrays indexable by episode index, cached until episodes are added."""
+        num_episodes = len(self.meta.episodes)
+        if getattr(self, "_episode_bounds", None) is None or len(self._episode_bounds[0]) != num_episodes:
+            self._episode_bounds = (
+                np.asarray(self.meta.episodes["dataset_from_index"], dtype=np.int64),
+                np.asarray(self.meta.episodes["dataset_to_index"], dtype=np.int64),
+            )
+        return self._episode_bounds
+
+    def _get_batch_query_indices(
+        self, idx: np.ndarray, ep_idx: np.ndarray
+    ) -> tuple[dict[str, np.ndarray], dict[str, torch.Tensor]]:
+        """Vectorized version of `_get_query_indices` for a batch of indices.
+
+        Returns query indices of shape (B, T) for each key and the matching (B, T) padding masks.
+        """
+        from_indices, to_indices = self._get_episode_bounds()
+        ep_start = from_indices[ep_idx][:, None]
+        ep_end = to_indices[ep_idx][:, None]
+        query_indices = {}
+        padding = {}
+        for key, delta_idx in self.delta_indices.items():
+            target = idx[:, None] + np.asarray(delta_idx, dtype=np.int64)[None, :]
+            query_indices[key] = np.clip(target, ep_start, ep_end - 1)
+            padding[f"{key}_is_pad"] = torch.from_numpy((target < ep_start) | (target >= ep_end))
+        return query_indices, padding
+
+    def _take_hf_columns(self, keys: list[str], rows: np.ndarray) -> dict:
+        """Gather `rows` of the given hf_dataset columns with one Arrow `take` per column.
+
+        Numeric columns are converted to tensors in one shot. Other columns (images, strings, ArrayND) go
+        through the regular Hugging Face formatting, and are stacked when possible.
+        """
+        if self.hf_dataset._indices is not None:
+            # Map rows through the indices mapping created by e.g. `Dataset.select`.
+            rows = self.hf_dataset._indices.column(0).to_numpy()[rows]
+
+        result = {}
+        fallback_keys = []
+        mmap_columns = self._get_mmap_columns() or {}
+        for key in keys:
+            if key in mmap_columns:
+                result[key] = torch.from_numpy(mmap_columns[key][rows])
+                continue
+            tensor = arrow_column_to_torch(self.hf_dataset.data.column(key).take(rows))
+            if tensor is None:
+                fallback_keys.append(key)
+            else:
+                result[key] = tensor
+
+        if len(fallback_keys) > 0:
+            formatted = self.hf_dataset.select_columns(fallback_keys)[rows.tolist()]
+            for key in fallback_keys:
+                values = formatted[key]
+                result[key] = torch.stack(values) if isinstance(values[0], torch.Tensor) else values
+        return result
+
+    def __getitems__(self, indices: list[int]) -> list[dict]:
+        """Batched counterpart of `__getitem__`, used by `torch.utils.data.DataLoader` when auto-batching.
+
+        The samples are fetched together with `get_batch`, then split into one dict per sample as expected by
+        the DataLoader's `collate_fn`. Wrap the dataset in `lerobot.datasets.utils.CollatedBatchDataset` to skip
+        the split and the collation.
+        """
+        batch = self.get_batch(indices)
+        return [{key: values[i] for key, values in batch.items()} for i in range(len(indices))]
+
+    def get_batch(self, indices: list[int]) -> dict:
+        """Fetch the samples at `indices` as an already collated batch.
+
+        Delta-window indices and padding masks are computed for the whole batch at once with NumPy, each
+        parquet column is gathered with a single Arrow `take` and every tensor of the returned dict has a
+        leading batch dimension (strings are returned as lists).
+        """
+        self._ensure_hf_dataset_loaded()
+        idx = np.asarray(indices, dtype=np.int64)
+        batch_size = len(idx)
+        item = self._take_hf_columns(list(self.hf_dataset.features), idx)
+        ep_idx = item["episode_index"].numpy()
+
+        query_indices = None
+        if self.delta_indices is not None:
+            query_indices, padding = self._get_batch_query_indices(idx, ep_idx)
+            for key, q_idx in query_indices.items():
+                if key in self.meta.video_keys:
+                    continue
+                values = self._take_hf_columns([key], q_idx.reshape(-1))[key]
+                item[key] = values.reshape(*q_idx.shape, *values.shape[1:])
+            item = {**item, **padding}
+
+        if len(self.meta.video_keys) > 0:
+            query_timestamps = {}
+            for key in self.meta.video_keys:
+                if query_indices is not None and key in query_indices:
+                    q_idx = query_indices[key]
+                    timestamps = self._take_hf_columns(["timestamp"], q_idx.reshape(-1))["timestamp"]
+                    query_timestamps[key] = timestamps.reshape(q_idx.shape).tolist()
+                else:
+                    query_timestamps[key] = item["timestamp"][:, None].tolist()
+
+            video_frames = self._query_videos_batch(
+                [{key: ts[i] for key, ts in query_timestamps.items()} for i in range(batch_size)],
+                ep_idx.tolist(),
+            )
+            item = {**video_frames, **item}
+
+        if self.image_transforms is not None:
+            for cam in self.meta.camera_keys:
+                item[cam] = torch.stack([self.image_transforms(frame) for frame in item[cam]])
+
+        # Add task as a string
+        item["task"] = self.meta.tasks.index[item["task_index"].numpy()].tolist()
+        return item
+
     def __repr__(self):
         feature_keys = list(self.features)
         return (
@@ -1040,9 +1364,14 @@ class LeRobotDataset(torch.utils.data.Dataset):
         """
         Close the parquet writers. This function needs to be called after data collection/conversion, else footer metadata won't be written to the parquet files.
         The dataset won't be valid and can't be loaded as ds = LeRobotDataset(repo_id=repo, root=HF_LEROBOT_HOME.joinpath(repo))
+        It also waits for the videos still being encoded in the background, if any.
         """
-        self._close_writer()
-        self.meta._close_writer()
+        try:
+            self.stop_video_encoder()
+        finally:
+            self._cancel_streaming_encoders()
+            self._close_writer()
+            self.meta._close_writer()
 
     def create_episode_buffer(self, episode_index: int | None = None) -> dict:
         current_ep_idx = self.meta.total_episodes if episode_index is None else episode_index
@@ -1102,6 +1431,11 @@ class LeRobotDataset(torch.utils.data.Dataset):
                 )
 
             if self.features[key]["dtype"] in ["image", "video"]:
+                self._add_stats_frame(key, frame[key], frame_index)
+
+            if self.features[key]["dtype"] == "video" and self.streaming_encoding:
+                self._add_streamed_video_frame(key, frame[key], frame_index)
+            elif self.features[key]["dtype"] in ["image", "video"]:
                 img_path = self._get_image_file_path(
                     episode_index=self.episode_buffer["episode_index"], image_key=key, frame_index=frame_index
                 )
@@ -1114,13 +1448,51 @@ class LeRobotDataset(torch.utils.data.Dataset):
 
         self.episode_buffer["size"] += 1
 
+        if any(len(frames) > MAX_STATS_FRAMES_IN_MEMORY for frames in self._stats_frames.values()):
+            # Keep every other frame for the stats, so that memory stays bounded for long episodes
+            self._stats_frames = {key: frames[::2] for key, frames in self._stats_frames.items()}
+            self._stats_frames_stride *= 2
+
+    def _add_stats_frame(self, key: str, image: np.ndarray | PIL.Image.Image, frame_index: int) -> None:
+        """Keep a downsampled copy of one every `_stats_frames_stride` frames, to compute the episode stats from
+        memory rather than by loading images back from disk."""
+        if frame_index % self._stats_frames_stride == 0:
+            self._stats_frames.setdefault(key, []).append(downsample_image_for_stats(image))
+
+    def _get_sampled_stats_frames(self, episode_length: int) -> dict[str, np.ndarray]:
+        """Frames kept in memory which are the closest to the ones `sample_images` would sample."""
+        sampled = {}
+        for key, frames in self._stats_frames.items():
+            positions = np.round(np.array(sample_indices(episode_length)) / self._stats_frames_stride)
+            positions = np.minimum(positions.astype(int), len(frames) - 1)
+            sampled[key] = np.stack([frames[pos] for pos in positions])
+        return sampled
+
+    def _add_streamed_video_frame(
+        self, video_key: str, image: np.ndarray | PIL.Image.Image, frame_index: int
+    ) -> None:
+        if frame_index == 0:
+            episode_index = self.episode_buffer["episode_index"]
+            temp_path = Path(tempfile.mkdtemp(dir=self.root)) / f"{video_key}_{episode_index:03d}.mp4"
+            self._streaming_encoders[video_key] = StreamingVideoEncoder(temp_path, self.fps)
+        self._streaming_encoders[video_key].add_frame(image)
+
+    def _cancel_streaming_encoders(self) -> None:
+        """Drop the videos being encoded for an episode which won't be saved."""
+        for encoder in self._streaming_encoders.values():
+            encoder.cancel()
+            shutil.rmtree(encoder.video_path.parent, ignore_errors=True)
+        self._streaming_encoders = {}
+
     def save_episode(self, episode_data: dict | None = None) -> None:
         """
         This will save to disk the current episode in self.episode_buffer.
 
         Video encoding is handled automatically based on batch_encoding_size:
-        - If batch_encoding_size == 1: Videos are encoded immediately after each episode
+        - If batch_encoding_size == 1: Videos are encoded immediately after each episode, or in the background
+          when a video encoder was started with 'start_video_encoder()'.
         - If batch_encoding_size > 1: Videos are encoded in batches.
+        With 'streaming_encoding', videos are instead already encoded when the episode is saved.
 
         Args:
             episode_data (dict | None, optional): Dict containing the episode data to save. If None, this will
@@ -1153,20 +1525,58 @@ class LeRobotDataset(torch.utils.data.Dataset):
                 continue
             episode_buffer[key] = np.stack(episode_buffer[key])
 
-        # Wait for image writer to end, so that episode stats over images can be computed
-        self._wait_image_writer()
-        ep_stats = compute_episode_stats(episode_buffer, self.features)
+        if episode_data is None and len(self._stats_frames) > 0:
+            # Images are sampled from the frames kept in memory, while the image writer finishes
+            ep_stats = compute_episode_stats(
+                {**episode_buffer, **self._get_sampled_stats_frames(episode_length)}, self.features
+            )
+            self._wait_image_writer()
+        else:
+            # Wait for image writer to end, so that episode stats over images can be computed
+            self._wait_image_writer()
+            ep_stats = compute_episode_stats(episode_buffer, self.features)
 
         ep_metadata = self._save_episode_data(episode_buffer)
         has_video_keys = len(self.meta.video_keys) > 0
-        use_batched_encoding = self.batch_encoding_size > 1
+        # Videos are encoded while recording, unless the episode data is provided directly
+        use_streaming_encoding = has_video_keys and self.streaming_encoding and episode_data is None
+        use_batched_encoding = self.batch_encoding_size > 1 and not use_streaming_encoding
+
+        use_background_encoding = (
+            has_video_keys
+            and not use_batched_encoding
+            and not use_streaming_encoding
+            and self.video_encoder is not None
+        )
 
-        if has_video_keys and not use_batched_encoding:
+        if use_streaming_encoding:
+            for video_key in self.meta.video_keys:
+                ep_path = self._streaming_encoders.pop(video_key).finish()
+                ep_metadata.update(self._save_episode_video(video_key, episode_index, ep_path=ep_path))
+        elif use_background_encoding:
+            # One encoding job per camera, running while the next episode is being recorded
+            video_encodings = {
+                video_key: self._submit_episode_video_encoding(video_key, episode_index)
+                for video_key in self.meta.video_keys
+            }
+        elif has_video_keys and not use_batched_encoding:
             for video_key in self.meta.video_keys:
                 ep_metadata.update(self._save_episode_video(video_key, episode_index))
 
-        # `meta.save_episode` need to be executed after encoding the videos
-        self.meta.save_episode(episode_index, episode_length, episode_tasks, ep_stats, ep_metadata)
+        # `meta.save_episode` need to be executed after encoding the videos. With background encoding, the
+        # episode metadata is only written once its videos are encoded, by `_collect_video_encodings`.
+        episode_dict = self.meta.save_episode(
+            episode_index,
+            episode_length,
+            episode_tasks,
+            ep_stats,
+            ep_metadata,
+            defer_metadata=use_background_encoding,
+        )
+
+        if use_background_encoding:
+            self._pending_video_encodings[episode_index] = (episode_dict, video_encodings)
+            self._collect_video_encodings(wait=False)
 
         if has_video_keys and use_batched_encoding:
             # Check if we should trigger batch encoding
@@ -1328,9 +1738,10 @@ class LeRobotDataset(torch.utils.data.Dataset):
 
         return metadata
 
-    def _save_episode_video(self, video_key: str, episode_index: int) -> dict:
-        # Encode episode frames into a temporary video
-        ep_path = self._encode_temporary_episode_video(video_key, episode_index)
+    def _save_episode_video(self, video_key: str, episode_index: int, ep_path: Path | None = None) -> dict:
+        # Encode episode frames into a temporary video, unless it was already encoded in the background
+        if ep_path is None:
+            ep_path = self._encode_temporary_episode_video(video_key, episode_index)
         ep_size_in_mb = get_file_size_in_mb(ep_path)
         ep_duration_in_s = get_video_duration_in_s(ep_path)
 
@@ -1401,6 +1812,11 @@ class LeRobotDataset(torch.utils.data.Dataset):
         return metadata
 
     def clear_episode_buffer(self, delete_images: bool = True) -> None:
+        # Drop the videos being encoded for the current episode, if it wasn't saved
+        self._cancel_streaming_encoders()
+        self._stats_frames = {}
+        self._stats_frames_stride = 1
+
         # Clean up image files for the current episode buffer
         if delete_images:
             # Wait for the async image writer to finish
@@ -1410,6 +1826,9 @@ class LeRobotDataset(torch.utils.data.Dataset):
             if isinstance(episode_index, np.ndarray):
                 episode_index = episode_index.item() if episode_index.size == 1 else episode_index[0]
             for cam_key in self.meta.camera_keys:
+                if episode_index in self._pending_video_encodings and cam_key in self.meta.video_keys:
+                    # Frames are removed by the background encoder once encoded
+                    continue
                 img_dir = self._get_image_file_dir(episode_index, cam_key)
                 if img_dir.is_dir():
                     shutil.rmtree(img_dir)
@@ -1442,17 +1861,85 @@ class LeRobotDataset(torch.utils.data.Dataset):
         if self.image_writer is not None:
             self.image_writer.wait_until_done()
 
+    def start_video_encoder(self, num_workers: int) -> None:
+        """
+        Encode the videos of saved episodes in a pool of background processes, so that 'save_episode()'
+        returns without waiting for the encoding and the next episode can be recorded meanwhile. Use one worker
+        per camera to encode all the videos of an episode in parallel.
+        """
+        if self.video_encoder is not None:
+            logging.warning(
+                "You are starting a new video encoder that is replacing an already existing one in the dataset."
+            )
+            self.stop_video_encoder()
+
+        # Spawned rather than forked, as the recording process runs camera and image writer threads
+        self.video_encoder = ProcessPoolExecutor(
+            max_workers=num_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def stop_video_encoder(self) -> None:
+        """Wait for the videos being encoded in the background, save them, and stop the encoding processes."""
+        try:
+            self._collect_video_encodings(wait=True)
+        finally:
+            if self.video_encoder is not None:
+                self.video_encoder.shutdown()
+                self.video_encoder = None
+
+    def _submit_episode_video_encoding(self, video_key: str, episode_index: int) -> tuple[Path, Future]:
+        temp_path = Path(tempfile.mkdtemp(dir=self.root)) / f"{video_key}_{episode_index:03d}.mp4"
+        img_dir = self._get_image_file_dir(episode_index, video_key)
+        return temp_path, self.video_encoder.submit(
+            _encode_episode_video_frames, img_dir, temp_path, self.fps
+        )
+
+    def _collect_video_encodings(self, wait: bool) -> None:
+        """
+        Add the videos encoded in the background to the dataset files and write the metadata of their episodes.
+        Episodes are processed in order, since the location of a video in the dataset files depends on the
+        previous one. If `wait` is False, this stops at the first episode whose videos are not encoded yet.
+        Videos whose background encoding failed are encoded again here from their frames, which are only removed
+        once encoded. If this fails too, the error is raised and the episode stays pending.
+        """
+        while len(self._pending_video_encodings) > 0:
+            episode_index = next(iter(self._pending_video_encodings))
+            episode_dict, video_encodings = self._pending_video_encodings[episode_index]
+            if not wait and not all(future.done() for _, future in video_encodings.values()):
+                break
+
+            ep_paths = {}
+            for video_key, (temp_path, future) in video_encodings.items():
+                # `exception()` waits for the encoding to finish
+                error = future.exception()
+                if error is None:
+                    ep_paths[video_key] = future.result()
+                    continue
+                logging.warning(
+                    f"Encoding the '{video_key}' video of episode {episode_index} in the background failed "
+                    f"({error!r}), encoding it again."
+                )
+                shutil.rmtree(temp_path.parent, ignore_errors=True)
+                ep_paths[video_key] = self._encode_temporary_episode_video(video_key, episode_index)
+                # Its frames are removed, so it must not be encoded again if the episode stays pending
+                encoded = Future()
+                encoded.set_result(ep_paths[video_key])
+                video_encodings[video_key] = (ep_paths[video_key], encoded)
+
+            for video_key, ep_path in ep_paths.items():
+                episode_dict.update(self._save_episode_video(video_key, episode_index, ep_path=ep_path))
+            self.meta.save_deferred_episode(episode_dict)
+            del self._pending_video_encodings[episode_index]
+
     def _encode_temporary_episode_video(self, video_key: str, episode_index: int) -> Path:
         """
         Use ffmpeg to convert frames stored as png into mp4 videos.
-        Note: `encode_video_frames` is a blocking call. Making it asynchronous shouldn't speedup encoding,
-        since video encoding with ffmpeg is already using multithreading.
+        Note: `encode_video_frames` is a blocking call. See 'start_video_encoder()' to encode videos in the
+        background instead, with one process per camera.
         """
         temp_path = Path(tempfile.mkdtemp(dir=self.root)) / f"{video_key}_{episode_index:03d}.mp4"
         img_dir = self._get_image_file_dir(episode_index, video_key)
-        encode_video_frames(img_dir, temp_path, self.fps, overwrite=True)
-        shutil.rmtree(img_dir)
-        return temp_path
+        return _encode_episode_video_frames(img_dir, temp_path, self.fps)
 
     @classmethod
     def create(
@@ -1468,6 +1955,8 @@ class LeRobotDataset(torch.utils.data.Dataset):
         image_writer_threads: int = 0,
         video_backend: str | None = None,
         batch_encoding_size: int = 1,
+        video_encoding_workers: int = 0,
+        streaming_encoding: bool = False,
     ) -> "LeRobotDataset":
         """Create a LeRobot Dataset from scratch in order to record data."""
         obj = cls.__new__(cls)
@@ -1484,12 +1973,21 @@ class LeRobotDataset(torch.utils.data.Dataset):
         obj.revision = None
         obj.tolerance_s = tolerance_s
         obj.image_writer = None
+        obj.video_encoder = None
+        obj._pending_video_encodings = {}
+        obj.streaming_encoding = streaming_encoding
+        obj._streaming_encoders = {}
+        obj._stats_frames = {}
+        obj._stats_frames_stride = 1
         obj.batch_encoding_size = batch_encoding_size
         obj.episodes_since_last_encoding = 0
 
         if image_writer_processes or image_writer_threads:
             obj.start_image_writer(image_writer_processes, image_writer_threads)
 
+        if video_encoding_workers:
+            obj.start_video_encoder(video_encoding_workers)
+
         # TODO(aliberts, rcadene, alexander-soare): Merge this with OnlineBuffer/DataBuffer
         obj.episode_buffer = obj.create_episode_buffer()
 
@@ -1506,6 +2004,15 @@ class LeRobotDataset(torch.utils.data.Dataset):
         obj._lazy_loading = False
         obj._recorded_frames = 0
         obj._writer_closed_for_reading = False
+        obj.use_mmap_columns = False
+        obj._mmap_keys = None
+        obj._mmap_columns = None
+        obj._hf_fallback_dataset = None
+        obj.video_decoder_cache_size = DEFAULT_VIDEO_DECODER_CACHE_SIZE
+        obj.video_decoder_cache = None
+        obj.frame_cache_config = None
+        obj.frame_cache = None
+        obj.return_uint8_frames = False
         return obj
 
 
@@ -27,6 +27,7 @@ class EpisodeAwareSampler:
         drop_n_first_frames: int = 0,
         drop_n_last_frames: int = 0,
         shuffle: bool = False,
+        block_size: int = 1,
     ):
         """Sampler that optionally incorporates episode boundary information.
 
@@ -38,19 +39,36 @@ class EpisodeAwareSampler:
             drop_n_first_frames: Number of frames to drop from the start of each episode.
             drop_n_last_frames: Number of frames to drop from the end of each episode.
             shuffle: Whether to shuffle the indices.
+            block_size: When shuffling, shuffle blocks of `block_size` adjacent frames of a same episode
+                instead of individual frames. Frames of a block are yielded in order, which lets
+                `decode_video_frames_batch` decode frames shared by samples of a batch only once. Defaults to
+                1 (plain per-frame shuffling).
         """
+        if block_size < 1:
+            raise ValueError(f"`block_size` must be a positive integer, got {block_size}.")
+
         indices = []
+        block_starts = []
         for episode_idx, (start_index, end_index) in enumerate(
             zip(dataset_from_indices, dataset_to_indices, strict=True)
         ):
             if episode_indices_to_use is None or episode_idx in episode_indices_to_use:
-                indices.extend(range(start_index + drop_n_first_frames, end_index - drop_n_last_frames))
+                episode_indices = range(start_index + drop_n_first_frames, end_index - drop_n_last_frames)
+                block_starts.extend(range(len(indices), len(indices) + len(episode_indices), block_size))
+                indices.extend(episode_indices)
 
         self.indices = indices
         self.shuffle = shuffle
+        self.block_size = block_size
+        self.block_starts = block_starts
 
     def __iter__(self) -> Iterator[int]:
-        if self.shuffle:
+        if self.shuffle and self.block_size > 1:
+            for i in torch.randperm(len(self.block_starts)).tolist():
+                start = self.block_starts[i]
+                end = self.block_starts[i + 1] if i + 1 < len(self.block_starts) else len(self.indices)
+                yield from self.indices[start:end]
+        elif self.shuffle:
             for i in torch.randperm(len(self.indices)):
                 yield self.indices[i]
         else:
@@ -34,6 +34,7 @@ from lerobot.datasets.utils import (
     safe_shard,
 )
 from lerobot.datasets.video_utils import (
+    DEFAULT_VIDEO_DECODER_CACHE_SIZE,
     VideoDecoderCache,
     decode_video_frames_torchcodec,
 )
@@ -94,6 +95,7 @@ class StreamingLeRobotDataset(torch.utils.data.IterableDataset):
         seed: int = 42,
         rng: np.random.Generator | None = None,
         shuffle: bool = True,
+        video_decoder_cache_size: int | None = DEFAULT_VIDEO_DECODER_CACHE_SIZE,
     ):
         """Initialize a StreamingLeRobotDataset.
 
@@ -112,6 +114,8 @@ class StreamingLeRobotDataset(torch.utils.data.IterableDataset):
             seed (int, optional): Reproducibility random seed.
             rng (np.random.Generator | None, optional): Random number generator.
             shuffle (bool, optional): Whether to shuffle the dataset across exhaustions. Defaults to True.
+            video_decoder_cache_size (int | None, optional): Maximum number of video decoders kept alive.
+                None means unbounded. Defaults to 64.
         """
         super().__init__()
         self.repo_id = repo_id
@@ -131,6 +135,7 @@ class StreamingLeRobotDataset(torch.utils.data.IterableDataset):
 
         # We cache the video decoders to avoid re-initializing them at each frame (avoiding a ~10x slowdown)
         self.video_decoder_cache = None
+        self.video_decoder_cache_size = video_decoder_cache_size
 
         self.root.mkdir(exist_ok=True, parents=True)
 
@@ -189,7 +194,7 @@ class StreamingLeRobotDataset(torch.utils.data.IterableDataset):
     # in parallel, feeding a queue from which this iterator will yield processed items.
     def __iter__(self) -> Iterator[dict[str, torch.Tensor]]:
         if self.video_decoder_cache is None:
-            self.video_decoder_cache = VideoDecoderCache()
+            self.video_decoder_cache = VideoDecoderCache(max_size=self.video_decoder_cache_size)
 
         # keep the same seed across exhaustions if shuffle is False, otherwise shuffle data across exhaustions
         rng = np.random.default_rng(self.seed) if not self.shuffle else self.rng
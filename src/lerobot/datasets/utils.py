@@ -17,6 +17,7 @@ import contextlib
 import importlib.resources
 import json
 import logging
+import uuid
 from collections import deque
 from collections.abc import Iterable, Iterator
 from pathlib import Path
@@ -28,6 +29,7 @@ import numpy as np
 import packaging.version
 import pandas
 import pandas as pd
+import pyarrow as pa
 import pyarrow.parquet as pq
 import torch
 from datasets import Dataset
@@ -63,6 +65,7 @@ DEFAULT_EPISODES_PATH = EPISODES_DIR + "/" + CHUNK_FILE_PATTERN + ".parquet"
 DEFAULT_DATA_PATH = DATA_DIR + "/" + CHUNK_FILE_PATTERN + ".parquet"
 DEFAULT_VIDEO_PATH = VIDEO_DIR + "/{video_key}/" + CHUNK_FILE_PATTERN + ".mp4"
 DEFAULT_IMAGE_PATH = "images/{image_key}/episode-{episode_index:06d}/frame-{frame_index:06d}.png"
+DEFAULT_MMAP_DIR = DATA_DIR + "/mmap"
 
 LEGACY_EPISODES_PATH = "meta/episodes.jsonl"
 LEGACY_EPISODES_STATS_PATH = "meta/episodes_stats.jsonl"
@@ -421,6 +424,163 @@ def hf_transform_to_torch(items_dict: dict[str, list[Any]]) -> dict[str, list[to
     return items_dict
 
 
+def arrow_column_to_torch(column: pa.Array | pa.ChunkedArray) -> torch.Tensor | None:
+    """Convert a numeric Arrow column into a single tensor without going through Python objects.
+
+    Scalar columns (e.g. 'timestamp', 'index') become a tensor of shape (N,) and fixed-length list columns
+    (e.g. 'observation.state', 'action') become a tensor of shape (N, D). The dtypes match the ones produced
+    row by row by `hf_transform_to_torch`.
+
+    Args:
+        column (pa.Array | pa.ChunkedArray): The Arrow column, typically the result of a `take`.
+
+    Returns:
+        torch.Tensor | None: The converted tensor, or None if the column is not a numeric scalar or
+            fixed-length list column (images, strings, ArrayND extension types), in which case callers should
+            fall back to the Hugging Face formatting.
+    """
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks()
+    num_rows = len(column)
+
+    values = column
+    while pa.types.is_list(values.type) or pa.types.is_fixed_size_list(values.type):
+        values = values.flatten()
+    if not (
+        pa.types.is_integer(values.type)
+        or pa.types.is_floating(values.type)
+        or pa.types.is_boolean(values.type)
+    ):
+        return None
+    if num_rows > 0 and len(values) % num_rows != 0:
+        # Ragged lists can't be stacked into a single tensor.
+        return None
+
+    array = values.to_numpy(zero_copy_only=False, writable=True)
+    # `torch.tensor` on python numbers, which `hf_transform_to_torch` relies on, gives int64 for integers and
+    # float32 for floats, whatever their width in the Arrow column.
+    if np.issubdtype(array.dtype, np.integer) and array.dtype != np.int64:
+        array = array.astype(np.int64)
+    elif np.issubdtype(array.dtype, np.floating) and array.dtype != np.float32:
+        array = array.astype(np.float32)
+    tensor = torch.from_numpy(array)
+    if column.type != values.type:
+        tensor = tensor.reshape(num_rows, -1)
+    return tensor
+
+
+def _mmap_source_signature(hf_dataset: Dataset) -> dict | None:
+    """Identify the files `hf_dataset` is read from (paths, sizes and modification times), None if in memory."""
+    if len(hf_dataset.cache_files) == 0:
+        return None
+    files = []
+    for cache_file in hf_dataset.cache_files:
+        stat = Path(cache_file["filename"]).stat()
+        files.append([cache_file["filename"], stat.st_size, stat.st_mtime_ns])
+    return {"num_rows": len(hf_dataset), "files": sorted(files)}
+
+
+def export_mmap_columns(hf_dataset: Dataset, mmap_dir: Path) -> list[str]:
+    """Export the numeric columns of `hf_dataset` to contiguous `.npy` files in `mmap_dir`.
+
+    Each column is written as `{mmap_dir}/{column}.npy`, chunk by chunk, with the same dtypes and shapes as
+    `arrow_column_to_torch`, along with a `{column}.json` signature of the files backing `hf_dataset`. Files
+    whose signature matches are not rewritten, while in-memory datasets, which can't be identified, are always
+    exported again. Files are written to a temporary path unique to the writer first and then renamed, so
+    that concurrent processes (e.g. DDP ranks) never read a partially written file nor overwrite each other's.
+
+    Args:
+        hf_dataset (Dataset): The dataset to export, without any indices mapping.
+        mmap_dir (Path): Directory in which to write the `.npy` files.
+
+    Returns:
+        list[str]: The names of the exported columns. Non-numeric columns (images, strings, ArrayND) are
+            skipped.
+    """
+    mmap_dir.mkdir(parents=True, exist_ok=True)
+    num_rows = len(hf_dataset)
+    signature = _mmap_source_signature(hf_dataset)
+
+    exported = []
+    for key in hf_dataset.column_names:
+        fpath = mmap_dir / f"{key}.npy"
+        signature_fpath = mmap_dir / f"{key}.json"
+        if signature is not None and fpath.is_file() and signature_fpath.is_file():
+            with open(signature_fpath) as f:
+                if json.load(f) == signature:
+                    exported.append(key)
+                    continue
+
+        chunks = hf_dataset.data.column(key).chunks
+        first = arrow_column_to_torch(chunks[0]) if len(chunks) > 0 else None
+        if first is None:
+            continue
+
+        tmp_suffix = uuid.uuid4().hex
+        tmp_fpath = mmap_dir / f"{key}.{tmp_suffix}.tmp.npy"
+        array = np.lib.format.open_memmap(
+            tmp_fpath, mode="w+", dtype=first.numpy().dtype, shape=(num_rows, *first.shape[1:])
+        )
+        start = 0
+        for chunk in chunks:
+            values = arrow_column_to_torch(chunk).numpy()
+            array[start : start + len(values)] = values
+            start += len(values)
+        array.flush()
+        del array
+        # The previous signature no longer describes the file
+        signature_fpath.unlink(missing_ok=True)
+        tmp_fpath.replace(fpath)
+        if signature is not None:
+            tmp_signature_fpath = mmap_dir / f"{key}.{tmp_suffix}.tmp.json"
+            with open(tmp_signature_fpath, "w") as f:
+                json.dump(signature, f)
+            tmp_signature_fpath.replace(signature_fpath)
+        exported.append(key)
+
+    return exported
+
+
+def load_mmap_columns(mmap_dir: Path, keys: list[str]) -> dict[str, np.ndarray]:
+    """Open the `.npy` files written by `export_mmap_columns` as copy-on-write memory maps.
+
+    Pages are shared between all processes mapping the same files (e.g. DataLoader workers), and arrays
+    are writable so that `torch.from_numpy` can wrap them without copies or warnings. Writes are private to
+    the process and never reach the files.
+    """
+    return {key: np.load(mmap_dir / f"{key}.npy", mmap_mode="c") for key in keys}
+
+
+def collate_batched_items(batch: dict | list) -> dict:
+    """`collate_fn` for DataLoaders over a `CollatedBatchDataset`.
+
+    Batches of a `CollatedBatchDataset` are already collated and passed through as is. Lists of samples (e.g.
+    coming from other datasets) are collated with the default collate function.
+    """
+    if isinstance(batch, dict):
+        return batch
+    return torch.utils.data.default_collate(batch)
+
+
+class CollatedBatchDataset(torch.utils.data.Dataset):
+    """Wrap a `LeRobotDataset` so that a DataLoader fetches each batch already collated, with `get_batch`.
+
+    To be used with `collate_fn=collate_batched_items`, which passes the batches through as is.
+    """
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+
+    def __len__(self):
+        return len(self.dataset)
+
+    def __getitem__(self, idx) -> dict:
+        return self.dataset[idx]
+
+    def __getitems__(self, indices: list[int]) -> dict:
+        return self.dataset.get_batch(indices)
+
+
 def is_valid_version(version: str) -> bool:
     """Check if a string is a valid PEP 440 version.
 
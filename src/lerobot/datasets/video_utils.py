@@ -16,22 +16,27 @@
 import glob
 import importlib
 import logging
+import queue
 import shutil
 import tempfile
 import warnings
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
-from threading import Lock
+from threading import Lock, Thread
 from typing import Any, ClassVar
 
 import av
 import fsspec
+import numpy as np
 import pyarrow as pa
 import torch
 import torchvision
 from datasets.features.features import register_feature
 from PIL import Image
 
+from lerobot.datasets.image_writer import image_array_to_pil_image
+
 
 def get_safe_default_codec():
     if importlib.util.find_spec("torchcodec"):
@@ -48,6 +53,8 @@ def decode_video_frames(
     timestamps: list[float],
     tolerance_s: float,
     backend: str | None = None,
+    decoder_cache: "VideoDecoderCache | None" = None,
+    return_uint8: bool = False,
 ) -> torch.Tensor:
     """
     Decodes video frames using the specified backend.
@@ -57,6 +64,9 @@ def decode_video_frames(
         timestamps (list[float]): List of timestamps to extract frames.
         tolerance_s (float): Allowed deviation in seconds for frame retrieval.
         backend (str, optional): Backend to use for decoding. Defaults to "torchcodec" when available in the platform; otherwise, defaults to "pyav"..
+        decoder_cache (VideoDecoderCache, optional): Decoder cache used by the "torchcodec" backend. Uses the
+            default process-wide cache if None.
+        return_uint8 (bool, optional): Return frames as uint8 in [0, 255] instead of float32 in [0, 1].
 
     Returns:
         torch.Tensor: Decoded frames.
@@ -66,9 +76,13 @@ def decode_video_frames(
     if backend is None:
         backend = get_safe_default_codec()
     if backend == "torchcodec":
-        return decode_video_frames_torchcodec(video_path, timestamps, tolerance_s)
+        return decode_video_frames_torchcodec(
+            video_path, timestamps, tolerance_s, decoder_cache=decoder_cache, return_uint8=return_uint8
+        )
     elif backend in ["pyav", "video_reader"]:
-        return decode_video_frames_torchvision(video_path, timestamps, tolerance_s, backend)
+        return decode_video_frames_torchvision(
+            video_path, timestamps, tolerance_s, backend, return_uint8=return_uint8
+        )
     else:
         raise ValueError(f"Unsupported video backend: {backend}")
 
@@ -79,6 +93,7 @@ def decode_video_frames_torchvision(
     tolerance_s: float,
     backend: str = "pyav",
     log_loaded_timestamps: bool = False,
+    return_uint8: bool = False,
 ) -> torch.Tensor:
     """Loads frames associated to the requested timestamps of a video
 
@@ -164,22 +179,43 @@ def decode_video_frames_torchvision(
     if log_loaded_timestamps:
         logging.info(f"{closest_ts=}")
 
-    # convert to the pytorch format which is float32 in [0,1] range (and channel first)
-    closest_frames = closest_frames.type(torch.float32) / 255
+    # convert to the pytorch format which is float32 in [0,1] range (and channel first), unless the conversion
+    # is deferred to the device (see `ImageToFloatProcessorStep`)
+    if not return_uint8:
+        closest_frames = closest_frames.type(torch.float32) / 255
 
     assert len(timestamps) == len(closest_frames)
     return closest_frames
 
 
+# Default maximum number of video decoders kept open by each process, shared by the datasets and training config
+DEFAULT_VIDEO_DECODER_CACHE_SIZE = 64
+
+
 class VideoDecoderCache:
-    """Thread-safe cache for video decoders to avoid expensive re-initialization."""
+    """Thread-safe LRU cache for video decoders to avoid expensive re-initialization.
+
+    Each cached entry keeps a torchcodec `VideoDecoder` and its underlying open file handle alive. When
+    `max_size` is set, the least recently used decoders are evicted (and their file handles closed) so that
+    the number of open files and decoders of a process stays bounded, e.g. in each DataLoader worker.
+    Hits, misses and evictions are counted to help sizing the cache.
 
-    def __init__(self):
-        self._cache: dict[str, tuple[Any, Any]] = {}
+    Args:
+        max_size: Maximum number of decoders to keep open. None means unbounded.
+    """
+
+    def __init__(self, max_size: int | None = None):
+        if max_size is not None and max_size < 1:
+            raise ValueError(f"`max_size` must be a positive integer or None, got {max_size}.")
+        self.max_size = max_size
+        self._cache: OrderedDict[str, tuple[Any, Any]] = OrderedDict()
         self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
     def get_decoder(self, video_path: str):
-        """Get a cached decoder or create a new one."""
+        """Get a cached decoder or create a new one, evicting the least recently used ones if needed."""
         if importlib.util.find_spec("torchcodec"):
             from torchcodec.decoders import VideoDecoder
         else:
@@ -188,12 +224,21 @@ class VideoDecoderCache:
         video_path = str(video_path)
 
         with self._lock:
-            if video_path not in self._cache:
-                file_handle = fsspec.open(video_path).__enter__()
-                decoder = VideoDecoder(file_handle, seek_mode="approximate")
-                self._cache[video_path] = (decoder, file_handle)
-
-            return self._cache[video_path][0]
+            if video_path in self._cache:
+                self.hits += 1
+                self._cache.move_to_end(video_path)
+                return self._cache[video_path][0]
+
+            self.misses += 1
+            while self.max_size is not None and len(self._cache) >= self.max_size:
+                _, (_, evicted_file_handle) = self._cache.popitem(last=False)
+                evicted_file_handle.close()
+                self.evictions += 1
+
+            file_handle = fsspec.open(video_path).__enter__()
+            decoder = VideoDecoder(file_handle, seek_mode="approximate")
+            self._cache[video_path] = (decoder, file_handle)
+            return decoder
 
     def clear(self):
         """Clear the cache and close file handles."""
@@ -207,6 +252,18 @@ class VideoDecoderCache:
         with self._lock:
             return len(self._cache)
 
+    def stats(self) -> dict[str, int | float]:
+        """Return the hit/miss/eviction counters and the current size of the cache."""
+        with self._lock:
+            num_requests = self.hits + self.misses
+            return {
+                "size": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / num_requests if num_requests > 0 else 0.0,
+            }
+
 
 class FrameTimestampError(ValueError):
     """Helper error to indicate the retrieved timestamps exceed the queried ones"""
@@ -223,6 +280,7 @@ def decode_video_frames_torchcodec(
     tolerance_s: float,
     log_loaded_timestamps: bool = False,
     decoder_cache: VideoDecoderCache | None = None,
+    return_uint8: bool = False,
 ) -> torch.Tensor:
     """Loads frames associated with the requested timestamps of a video using torchcodec.
 
@@ -232,6 +290,7 @@ def decode_video_frames_torchcodec(
         tolerance_s: Allowed deviation in seconds for frame retrieval.
         log_loaded_timestamps: Whether to log loaded timestamps.
         decoder_cache: Optional decoder cache instance. Uses default if None.
+        return_uint8: Return frames as uint8 in [0, 255] instead of float32 in [0, 1].
 
     Note: Setting device="cuda" outside the main process, e.g. in data loader workers, will lead to CUDA initialization errors.
 
@@ -289,8 +348,9 @@ def decode_video_frames_torchcodec(
     if log_loaded_timestamps:
         logging.info(f"{closest_ts=}")
 
-    # convert to float32 in [0,1] range
-    closest_frames = (closest_frames / 255.0).type(torch.float32)
+    # convert to float32 in [0,1] range, unless the conversion is deferred to the device
+    if not return_uint8:
+        closest_frames = (closest_frames / 255.0).type(torch.float32)
 
     if not len(timestamps) == len(closest_frames):
         raise FrameTimestampError(
@@ -300,6 +360,102 @@ def decode_video_frames_torchcodec(
     return closest_frames
 
 
+def decode_video_frames_batch(
+    requests: list[tuple[Path | str, list[float]]],
+    tolerance_s: float,
+    backend: str | None = None,
+    max_gap_s: float = 1.0,
+    decoder_cache: VideoDecoderCache | None = None,
+    return_uint8: bool = False,
+) -> list[torch.Tensor]:
+    """Decodes the frames of several requests at once, decoding each needed frame only once.
+
+    Requests are grouped per video file and their timestamps are deduplicated and sorted by presentation
+    time, so that frames shared by several requests (e.g. overlapping `delta_timestamps` windows of adjacent
+    samples) and frames from the same group of pictures are decoded in a single forward pass instead of one
+    seek per request. Decoded frames are then fanned back out to each request.
+
+    Args:
+        requests: List of (video_path, timestamps) pairs, as would be passed to `decode_video_frames`.
+        tolerance_s: Allowed deviation in seconds for frame retrieval.
+        backend: Backend to use for decoding. Defaults to "torchcodec" when available in the platform;
+            otherwise, defaults to "pyav".
+        max_gap_s: Sorted timestamps of a same file that are further apart than this are decoded in separate
+            passes, so that the sequential backends ("pyav", "video_reader") don't decode everything in
+            between. Ignored for "torchcodec", which seeks on its own when it's worth it.
+        decoder_cache: Decoder cache used by the "torchcodec" backend. Uses the default process-wide cache if
+            None.
+        return_uint8: Return frames as uint8 in [0, 255] instead of float32 in [0, 1].
+
+    Returns:
+        list[torch.Tensor]: Decoded frames for each request, in the same order as `requests`.
+    """
+    if backend is None:
+        backend = get_safe_default_codec()
+
+    requests_per_file: dict[str, list[int]] = {}
+    for request_idx, (video_path, _) in enumerate(requests):
+        requests_per_file.setdefault(str(video_path), []).append(request_idx)
+
+    results: list[torch.Tensor | None] = [None] * len(requests)
+    for video_path, request_indices in requests_per_file.items():
+        unique_ts = sorted({ts for request_idx in request_indices for ts in requests[request_idx][1]})
+
+        if backend == "torchcodec":
+            runs = [unique_ts]
+        else:
+            runs = [[unique_ts[0]]]
+            for ts in unique_ts[1:]:
+                if ts - runs[-1][-1] > max_gap_s:
+                    runs.append([])
+                runs[-1].append(ts)
+
+        frames = torch.cat(
+            [
+                decode_video_frames(video_path, run, tolerance_s, backend, decoder_cache, return_uint8)
+                for run in runs
+            ]
+        )
+        ts_to_frame_idx = {ts: i for i, ts in enumerate(unique_ts)}
+        for request_idx in request_indices:
+            frame_indices = [ts_to_frame_idx[ts] for ts in requests[request_idx][1]]
+            results[request_idx] = frames[frame_indices]
+
+    return results
+
+
+def get_video_encoding_options(
+    vcodec: str, pix_fmt: str, g: int | None, crf: int | None, fast_decode: int
+) -> tuple[str, dict[str, str]]:
+    """Check the encoding parameters and return the pixel format and codec options to encode videos with."""
+    # Check encoder availability
+    if vcodec not in ["h264", "hevc", "libsvtav1"]:
+        raise ValueError(f"Unsupported video codec: {vcodec}. Supported codecs are: h264, hevc, libsvtav1.")
+
+    # Encoders/pixel formats incompatibility check
+    if (vcodec == "libsvtav1" or vcodec == "hevc") and pix_fmt == "yuv444p":
+        logging.warning(
+            f"Incompatible pixel format 'yuv444p' for codec {vcodec}, auto-selecting format 'yuv420p'"
+        )
+        pix_fmt = "yuv420p"
+
+    # Define video codec options
+    video_options = {}
+
+    if g is not None:
+        video_options["g"] = str(g)
+
+    if crf is not None:
+        video_options["crf"] = str(crf)
+
+    if fast_decode:
+        key = "svtav1-params" if vcodec == "libsvtav1" else "tune"
+        value = f"fast-decode={fast_decode}" if vcodec == "libsvtav1" else "fastdecode"
+        video_options[key] = value
+
+    return pix_fmt, video_options
+
+
 def encode_video_frames(
     imgs_dir: Path | str,
     video_path: Path | str,
@@ -313,9 +469,7 @@ def encode_video_frames(
     overwrite: bool = False,
 ) -> None:
     """More info on ffmpeg arguments tuning on `benchmark/video/README.md`"""
-    # Check encoder availability
-    if vcodec not in ["h264", "hevc", "libsvtav1"]:
-        raise ValueError(f"Unsupported video codec: {vcodec}. Supported codecs are: h264, hevc, libsvtav1.")
+    pix_fmt, video_options = get_video_encoding_options(vcodec, pix_fmt, g, crf, fast_decode)
 
     video_path = Path(video_path)
     imgs_dir = Path(imgs_dir)
@@ -326,13 +480,6 @@ def encode_video_frames(
 
     video_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Encoders/pixel formats incompatibility check
-    if (vcodec == "libsvtav1" or vcodec == "hevc") and pix_fmt == "yuv444p":
-        logging.warning(
-            f"Incompatible pixel format 'yuv444p' for codec {vcodec}, auto-selecting format 'yuv420p'"
-        )
-        pix_fmt = "yuv420p"
-
     # Get input frames
     template = "frame-" + ("[0-9]" * 6) + ".png"
     input_list = sorted(
@@ -345,20 +492,6 @@ def encode_video_frames(
     with Image.open(input_list[0]) as dummy_image:
         width, height = dummy_image.size
 
-    # Define video codec options
-    video_options = {}
-
-    if g is not None:
-        video_options["g"] = str(g)
-
-    if crf is not None:
-        video_options["crf"] = str(crf)
-
-    if fast_decode:
-        key = "svtav1-params" if vcodec == "libsvtav1" else "tune"
-        value = f"fast-decode={fast_decode}" if vcodec == "libsvtav1" else "fastdecode"
-        video_options[key] = value
-
     # Set logging level
     if log_level is not None:
         # "While less efficient, it is generally preferable to modify logging with Python's logging"
@@ -393,6 +526,128 @@ def encode_video_frames(
         raise OSError(f"Video encoding did not work. File not found: {video_path}.")
 
 
+# Period at which a producer blocked on a full queue checks that the encoding thread is still running
+_QUEUE_PUT_TIMEOUT_S = 1.0
+
+
+class StreamingVideoEncoder:
+    """Encode the frames of a video as they are recorded, instead of writing them as png files first.
+
+    Frames are handed over to a worker thread through a bounded queue, so that the recording loop is only
+    blocked when the encoder falls behind by more than `max_queue_size` frames. The encoding parameters are
+    the same as `encode_video_frames`.
+
+    Args:
+        video_path: Path of the video to write.
+        fps: Frame rate of the video.
+        max_queue_size: Maximum number of frames waiting to be encoded.
+    """
+
+    def __init__(
+        self,
+        video_path: Path | str,
+        fps: int,
+        vcodec: str = "libsvtav1",
+        pix_fmt: str = "yuv420p",
+        g: int | None = 2,
+        crf: int | None = 30,
+        fast_decode: int = 0,
+        max_queue_size: int = 64,
+    ):
+        self.video_path = Path(video_path)
+        self.fps = fps
+        self.vcodec = vcodec
+        self.pix_fmt, self.video_options = get_video_encoding_options(vcodec, pix_fmt, g, crf, fast_decode)
+        self.num_frames = 0
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._error = None
+        self._cancelled = False
+        self.video_path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread = Thread(target=self._encode_loop, daemon=True)
+        self._thread.start()
+
+    def _encode_loop(self) -> None:
+        output = None
+        output_stream = None
+        try:
+            while True:
+                image = self._queue.get()
+                if image is None:
+                    break
+                if self._error is not None or self._cancelled:
+                    # Keep draining the queue, so that `add_frame` is never blocked on a full queue
+                    continue
+
+                try:
+                    if isinstance(image, Image.Image):
+                        input_frame = av.VideoFrame.from_image(image.convert("RGB"))
+                    else:
+                        # (C, H, W) or (H, W, C), uint8 or float in [0, 1]
+                        input_frame = av.VideoFrame.from_image(
+                            image_array_to_pil_image(image, range_check=False)
+                        )
+
+                    if output is None:
+                        output = av.open(str(self.video_path), "w")
+                        output_stream = output.add_stream(self.vcodec, self.fps, options=self.video_options)
+                        output_stream.pix_fmt = self.pix_fmt
+                        output_stream.width = input_frame.width
+                        output_stream.height = input_frame.height
+
+                    packet = output_stream.encode(input_frame)
+                    if packet:
+                        output.mux(packet)
+                except Exception as e:
+                    self._error = e
+
+            if output is not None and self._error is None and not self._cancelled:
+                # Flush the encoder
+                packet = output_stream.encode()
+                if packet:
+                    output.mux(packet)
+        except Exception as e:
+            self._error = e
+        finally:
+            if output is not None:
+                output.close()
+
+    def _put(self, item: np.ndarray | Image.Image | None) -> bool:
+        """Queue an item for the worker thread, unless it stopped. Returns whether the item was queued."""
+        while self._thread.is_alive():
+            try:
+                self._queue.put(item, timeout=_QUEUE_PUT_TIMEOUT_S)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def add_frame(self, image: np.ndarray | Image.Image) -> None:
+        """Queue a frame for encoding, blocking if the encoder is `max_queue_size` frames behind."""
+        if self._error is not None:
+            raise RuntimeError(f"Encoding of {self.video_path} failed.") from self._error
+        if not self._put(image):
+            raise RuntimeError(f"Encoding of {self.video_path} stopped.") from self._error
+        self.num_frames += 1
+
+    def finish(self) -> Path:
+        """Wait for all the queued frames to be encoded, close the video and return its path."""
+        self._put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise RuntimeError(f"Encoding of {self.video_path} failed.") from self._error
+        if self.num_frames == 0 or not self.video_path.exists():
+            raise OSError(f"Video encoding did not work. File not found: {self.video_path}.")
+        return self.video_path
+
+    def cancel(self) -> None:
+        """Stop encoding, dropping the queued frames, and remove the video."""
+        self._cancelled = True
+        self._put(None)
+        self._thread.join()
+        self.video_path.unlink(missing_ok=True)
+
+
 def concatenate_video_files(
     input_video_paths: list[Path | str], output_video_path: Path, overwrite: bool = True
 ):
@@ -614,6 +869,7 @@ class VideoEncodingManager:
 
     This manager handles:
     - Batch encoding for any remaining episodes when recording interrupted
+    - Waiting for the videos still being encoded in the background (see `LeRobotDataset.start_video_encoder`)
     - Cleaning up temporary image files from interrupted episodes
     - Removing empty image directories
 
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark the per-step latency of the PI0 / PI05 / SmolVLA flow-matching denoising loop.
+
+Compares the "eager" and "sdpa" attention implementations, with the suffix attention masks and position ids
+either rebuilt at every denoising step or built once per action chunk. With `--static-inference`, also
+compares the latency of a whole action chunk with the static inference mode (compiled denoising loop) to the
+eager loop, and reports the largest difference between their actions. Models are randomly initialized, so no
+checkpoint is downloaded (SmolVLA still downloads the config and processor of its VLM backbone). With
+`--dtype bfloat16`, the SmolVLA VLM runs in bfloat16 and its action expert in float32, as when loading
+pretrained VLM weights.
+
+Example:
+
+```shell
+python -m lerobot.policies.benchmark_denoise_step --policy smolvla --device cuda --static-inference
+```
+"""
+
+import argparse
+import time
+
+import torch
+
+from lerobot.policies.pi0.configuration_pi0 import PI0Config
+from lerobot.policies.pi0.modeling_pi0 import PI0Pytorch
+from lerobot.policies.pi05.configuration_pi05 import PI05Config
+from lerobot.policies.pi05.modeling_pi05 import PI05Pytorch
+from lerobot.policies.smolvla.configuration_smolvla import SmolVLAConfig
+from lerobot.policies.smolvla.modeling_smolvla import VLAFlowMatching
+
+
+def synchronize(device: torch.device):
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+
+
+def build_model(policy: str, dtype: str, device: torch.device) -> torch.nn.Module:
+    if policy == "pi0":
+        model = PI0Pytorch(PI0Config(dtype=dtype))
+    elif policy == "pi05":
+        model = PI05Pytorch(PI05Config(dtype=dtype))
+    else:
+        model = VLAFlowMatching(SmolVLAConfig())
+        if dtype == "bfloat16":
+            model.vlm_with_expert.vlm.to(torch.bfloat16)
+    return model.to(device).eval()
+
+
+def set_attention_implementation(model: torch.nn.Module, attention_implementation: str):
+    model.config.attention_implementation = attention_implementation
+    if isinstance(model, VLAFlowMatching):
+        # SmolVLA reads it from its VLM wrapper, set at initialization
+        model.vlm_with_expert.attention_implementation = attention_implementation
+
+
+def benchmark_denoise_step(
+    policy: str,
+    device: torch.device,
+    dtype: str,
+    batch_size: int,
+    num_cameras: int,
+    num_warmup: int,
+    num_steps: int,
+    static_inference: bool,
+):
+    model = build_model(policy, dtype, device)
+    config = model.config
+    if policy == "smolvla":
+        image_resolution = config.resize_imgs_with_padding
+        num_inference_steps = config.num_steps
+    else:
+        image_resolution = config.image_resolution
+        num_inference_steps = config.num_inference_steps
+
+    images = [torch.rand(batch_size, 3, *image_resolution, device=device) * 2 - 1 for _ in range(num_cameras)]
+    img_masks = [torch.ones(batch_size, dtype=torch.bool, device=device) for _ in range(num_cameras)]
+    tokens = torch.randint(0, 1000, (batch_size, config.tokenizer_max_length), device=device)
+    masks = torch.ones(batch_size, config.tokenizer_max_length, dtype=torch.bool, device=device)
+    state = torch.randn(batch_size, config.max_state_dim, device=device)
+    x_t = torch.randn(batch_size, config.chunk_size, config.max_action_dim, device=device)
+    timestep = torch.full((batch_size,), 0.5, device=device)
+
+    def compute_prefix_cache():
+        if policy == "smolvla":
+            # The SmolVLA prefix also holds the state
+            return model.compute_prefix_cache(images, img_masks, tokens, masks, state)
+        return model.compute_prefix_cache(images, img_masks, tokens, masks)
+
+    def denoise_step(prefix_pad_masks, past_key_values, suffix_attention):
+        if policy == "pi0":
+            return model.denoise_step(
+                state, prefix_pad_masks, past_key_values, x_t, timestep, suffix_attention=suffix_attention
+            )
+        return model.denoise_step(
+            prefix_pad_masks, past_key_values, x_t, timestep, suffix_attention=suffix_attention
+        )
+
+    results = []
+    with torch.inference_mode():
+        for attention_implementation in ["eager", "sdpa"]:
+            set_attention_implementation(model, attention_implementation)
+            prefix_pad_masks, past_key_values = compute_prefix_cache()
+
+            for precompute_masks in [False, True]:
+                suffix_attention = (
+                    model.prepare_suffix_attention(prefix_pad_masks) if precompute_masks else None
+                )
+                for _ in range(num_warmup):
+                    denoise_step(prefix_pad_masks, past_key_values, suffix_attention)
+                synchronize(device)
+
+                start = time.perf_counter()
+                for _ in range(num_steps):
+                    denoise_step(prefix_pad_masks, past_key_values, suffix_attention)
+                synchronize(device)
+                step_ms = (time.perf_counter() - start) / num_steps * 1000
+
+                masks_label = "per chunk" if precompute_masks else "per step"
+                results.append((attention_implementation, masks_label, step_ms))
+
+    print(f"{policy} on {device} ({dtype}), batch size {batch_size}, {num_cameras} camera(s)")
+    print(f"{'attention':<12}{'masks built':<14}{'ms/step':>10}{'ms/chunk':>12}")
+    for attention_implementation, masks_label, step_ms in results:
+        chunk_ms = step_ms * num_inference_steps
+        print(f"{attention_implementation:<12}{masks_label:<14}{step_ms:>10.2f}{chunk_ms:>12.2f}")
+
+    if not static_inference:
+        return
+
+    noise = model.sample_noise((batch_size, config.chunk_size, config.max_action_dim), device)
+
+    def sample_actions(prefix_cache):
+        if policy in ["pi0", "smolvla"]:
+            return model.sample_actions(
+                images, img_masks, tokens, masks, state, noise=noise, prefix_cache=prefix_cache
+            )
+        return model.sample_actions(images, img_masks, tokens, masks, noise=noise, prefix_cache=prefix_cache)
+
+    actions = {}
+    chunk_ms = {}
+    with torch.inference_mode():
+        prefix_cache = compute_prefix_cache()
+        for static in [False, True]:
+            config.static_inference = static
+            # The first calls of the static mode compile the loop and record the CUDA graph
+            for _ in range(num_warmup):
+                sample_actions(prefix_cache)
+            synchronize(device)
+
+            num_chunks = max(1, num_steps // num_inference_steps)
+            start = time.perf_counter()
+            for _ in range(num_chunks):
+                actions[static] = sample_actions(prefix_cache)
+            synchronize(device)
+            chunk_ms[static] = (time.perf_counter() - start) / num_chunks * 1000
+
+    max_abs_diff = (actions[True] - actions[False]).abs().max().item()
+    print(f"denoising loop ({config.attention_implementation} attention), ms/chunk:")
+    print(f"  eager loop: {chunk_ms[False]:.2f}")
+    print(f"  static inference: {chunk_ms[True]:.2f}")
+    print(f"  max abs difference of the actions: {max_abs_diff:.3e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--policy", type=str, default="pi0", choices=["pi0", "pi05", "smolvla"])
+    parser.add_argument("--device", type=str, default="cuda" if torch.cuda.is_available() else "cpu")
+    parser.add_argument("--dtype", type=str, default="float32", choices=["float32", "bfloat16"])
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--num-cameras", type=int, default=2)
+    parser.add_argument("--num-warmup", type=int, default=3, help="Denoising steps run before timing.")
+    parser.add_argument("--num-steps", type=int, default=20, help="Timed denoising steps.")
+    parser.add_argument(
+        "--static-inference",
+        action="store_true",
+        help="Also compare the static inference mode (compiled denoising loop) to the eager loop.",
+    )
+    args = parser.parse_args()
+
+    benchmark_denoise_step(
+        policy=args.policy,
+        device=torch.device(args.device),
+        dtype=args.dtype,
+        batch_size=args.batch_size,
+        num_cameras=args.num_cameras,
+        num_warmup=args.num_warmup,
+        num_steps=args.num_steps,
+        static_inference=args.static_inference,
+    )
+
+
+if __name__ == "__main__":
+    main()
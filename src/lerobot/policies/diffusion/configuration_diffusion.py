@@ -84,7 +84,10 @@ class DiffusionConfig(PreTrainedConfig):
         use_film_scale_modulation: FiLM (https://huggingface.co/papers/1709.07871) is used for the Unet conditioning.
             Bias modulation is used be default, while this parameter indicates whether to also use scale
             modulation.
-        noise_scheduler_type: Name of the noise scheduler to use. Supported options: ["DDPM", "DDIM"].
+        noise_scheduler_type: Name of the noise scheduler to use. Supported options: ["DDPM", "DDIM",
+            "DPMSolverMultistep", "UniPC"]. "DPMSolverMultistep" (DPM-Solver++) and "UniPC" are multistep ODE
+            solvers that sample good actions in a handful of steps (typically 5-10) from a model trained with
+            any of the schedulers.
         num_train_timesteps: Number of diffusion steps for the forward diffusion schedule.
         beta_schedule: Name of the diffusion beta schedule as per DDPMScheduler from Hugging Face diffusers.
         beta_start: Beta value for the first forward-diffusion step.
@@ -98,6 +101,20 @@ class DiffusionConfig(PreTrainedConfig):
         clip_sample_range: The magnitude of the clipping range as described above.
         num_inference_steps: Number of reverse diffusion steps to use at inference time (steps are evenly
             spaced). If not provided, this defaults to be the same as `num_train_timesteps`.
+        inference_latency_budget_ms: If provided, the number of inference steps is picked automatically on the
+            first call to `select_action`, from a warm-up measurement of the observation encoding and of one
+            denoising step, as the largest number of steps (at most `num_inference_steps`) whose total latency
+            fits in this budget.
+        distillation_teacher_path: Path or hub id of a trained DiffusionPolicy to distill into this policy. When
+            provided, training regresses the actions this policy samples in `num_inference_steps` steps (usually
+            1 to 4) onto the actions the teacher samples from the same noise in `distillation_teacher_steps`
+            DDIM steps. The student is usually initialized from the teacher weights (`--policy.path`), and
+            must be trained on the teacher's dataset so that both share the same normalization.
+        distillation_teacher_steps: Number of DDIM steps the teacher samples the distillation targets with.
+        temporal_ensemble_coeff: Coefficient for the exponential weighting scheme to apply for temporal
+            ensembling of the `horizon - n_obs_steps + 1` actions predicted from the current step. Defaults to
+            None which means temporal ensembling is not used. `n_action_steps` must be 1 when using this
+            feature. See `lerobot.policies.utils.TemporalEnsembler`.
         do_mask_loss_for_padding: Whether to mask the loss when there are copy-padded actions. See
             `LeRobotDataset` and `load_previous_and_future_frames` for more information. Note, this defaults
             to False as the original Diffusion Policy implementation does the same.
@@ -147,6 +164,12 @@ class DiffusionConfig(PreTrainedConfig):
 
     # Inference
     num_inference_steps: int | None = None
+    inference_latency_budget_ms: float | None = None
+    temporal_ensemble_coeff: float | None = None
+
+    # Few-step distillation
+    distillation_teacher_path: str | None = None
+    distillation_teacher_steps: int = 10
 
     # Loss computation
     do_mask_loss_for_padding: bool = False
@@ -173,12 +196,29 @@ class DiffusionConfig(PreTrainedConfig):
             raise ValueError(
                 f"`prediction_type` must be one of {supported_prediction_types}. Got {self.prediction_type}."
             )
-        supported_noise_schedulers = ["DDPM", "DDIM"]
+        supported_noise_schedulers = ["DDPM", "DDIM", "DPMSolverMultistep", "UniPC"]
         if self.noise_scheduler_type not in supported_noise_schedulers:
             raise ValueError(
                 f"`noise_scheduler_type` must be one of {supported_noise_schedulers}. "
                 f"Got {self.noise_scheduler_type}."
             )
+        if self.inference_latency_budget_ms is not None and self.inference_latency_budget_ms <= 0:
+            raise ValueError(
+                f"`inference_latency_budget_ms` must be positive. Got {self.inference_latency_budget_ms}."
+            )
+        if self.temporal_ensemble_coeff is not None and self.n_action_steps > 1:
+            raise NotImplementedError(
+                "`n_action_steps` must be 1 when using temporal ensembling. This is "
+                "because the policy needs to be queried every step to compute the ensembled action."
+            )
+        if self.distillation_teacher_path is not None:
+            if self.noise_scheduler_type == "DDPM":
+                raise ValueError(
+                    "Distillation needs a deterministic sampler for the student. Set `noise_scheduler_type` to "
+                    "one of ['DDIM', 'DPMSolverMultistep', 'UniPC']."
+                )
+            if self.num_inference_steps is None:
+                raise ValueError("`num_inference_steps` of the student must be set for distillation.")
 
         # Check that the horizon size and U-Net downsampling is compatible.
         # U-Net downsamples by 2 with each stage.
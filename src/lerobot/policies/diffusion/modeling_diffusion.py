@@ -20,7 +20,10 @@ TODO(alexander-soare):
   - Remove reliance on diffusers for DDPMScheduler and LR scheduler.
 """
 
+import inspect
+import logging
 import math
+import time
 from collections import deque
 from collections.abc import Callable
 
@@ -31,11 +34,15 @@ import torch.nn.functional as F  # noqa: N812
 import torchvision
 from diffusers.schedulers.scheduling_ddim import DDIMScheduler
 from diffusers.schedulers.scheduling_ddpm import DDPMScheduler
+from diffusers.schedulers.scheduling_dpmsolver_multistep import DPMSolverMultistepScheduler
+from diffusers.schedulers.scheduling_unipc_multistep import UniPCMultistepScheduler
 from torch import Tensor, nn
 
+from lerobot.configs.policies import PreTrainedConfig
 from lerobot.policies.diffusion.configuration_diffusion import DiffusionConfig
 from lerobot.policies.pretrained import PreTrainedPolicy
 from lerobot.policies.utils import (
+    TemporalEnsembler,
     get_device_from_parameters,
     get_dtype_from_parameters,
     get_output_shape,
@@ -52,6 +59,9 @@ class DiffusionPolicy(PreTrainedPolicy):
 
     config_class = DiffusionConfig
     name = "diffusion"
+    supports_chunk_prefetch = True
+    # Key of the prefetch inputs holding the queued frames, to look their features up in the cache
+    _IMAGE_WINDOW = "image_window"
 
     def __init__(
         self,
@@ -70,9 +80,20 @@ class DiffusionPolicy(PreTrainedPolicy):
 
         # queues are populated during rollout of the policy, they contain the n latest observations and actions
         self._queues = None
+        # (image, features) pairs of the latest frames encoded by the vision backbone, so that frames shared by
+        # consecutive observation windows are only encoded once (see `_get_image_features`)
+        self._image_features_cache = None
 
         self.diffusion = DiffusionModel(config)
 
+        # Frozen teacher of the distillation, loaded on the first training step
+        self._distillation_teacher = None
+
+        if config.temporal_ensemble_coeff is not None:
+            self.temporal_ensembler = TemporalEnsembler(
+                config.temporal_ensemble_coeff, config.horizon - config.n_obs_steps + 1
+            )
+
         self.reset()
 
     def get_optim_params(self) -> dict:
@@ -80,24 +101,78 @@ class DiffusionPolicy(PreTrainedPolicy):
 
     def reset(self):
         """Clear observation and action queues. Should be called on `env.reset()`"""
+        self._reset_prefetch()
         self._queues = {
             OBS_STATE: deque(maxlen=self.config.n_obs_steps),
             ACTION: deque(maxlen=self.config.n_action_steps),
         }
         if self.config.image_features:
             self._queues[OBS_IMAGES] = deque(maxlen=self.config.n_obs_steps)
+            self._image_features_cache = deque(maxlen=self.config.n_obs_steps)
         if self.config.env_state_feature:
             self._queues[OBS_ENV_STATE] = deque(maxlen=self.config.n_obs_steps)
+        if self.config.temporal_ensemble_coeff is not None:
+            self.temporal_ensembler.reset()
 
     @torch.no_grad()
     def predict_action_chunk(self, batch: dict[str, Tensor], noise: Tensor | None = None) -> Tensor:
         """Predict a chunk of actions given environment observations."""
         # stack n latest observations from the queue
         batch = {k: torch.stack(list(self._queues[k]), dim=1) for k in batch if k in self._queues}
-        actions = self.diffusion.generate_actions(batch, noise=noise)
+        if self.config.inference_latency_budget_ms is not None and not self.diffusion.latency_calibrated:
+            self.diffusion.calibrate_num_inference_steps(batch, self.config.inference_latency_budget_ms)
+        img_features = self._get_image_features() if self.config.image_features else None
+        actions = self.diffusion.generate_actions(batch, noise=noise, img_features=img_features)
 
         return actions
 
+    def _get_image_features(self, image_window: list[Tensor] | None = None) -> Tensor:
+        """Image features of the queued observations, only encoding the frames that were not encoded yet.
+
+        Frames are identified by the tensor objects stored in the queue, which stay the same while a frame is
+        part of consecutive observation windows. Frames are encoded when a chunk is predicted, so the cache
+        only saves work when consecutive predictions share frames, i.e. when they are less than `n_obs_steps`
+        steps apart: with temporal ensembling (a prediction at every step), or with `n_action_steps <
+        n_obs_steps`. With the defaults (`n_action_steps=8`, `n_obs_steps=2`), the windows share no frame and
+        every frame is encoded once anyway, which encoding the frames as they are queued would not improve.
+
+        Args:
+            image_window: The (B, N, C, H, W) frames of each observation step, the queued ones if None.
+
+        Returns:
+            (B, n_obs_steps, num_cameras * feature_dim) tensor of image features.
+        """
+        if image_window is None:
+            image_window = self._queues[OBS_IMAGES]
+        img_features = []
+        for images in image_window:
+            features = next((f for img, f in self._image_features_cache if img is images), None)
+            if features is None:
+                # (B, N, C, H, W) -> (B, 1, N * feature_dim)
+                features = self.diffusion.encode_images(images[:, None])[:, 0]
+                self._image_features_cache.append((images, features))
+            img_features.append(features)
+        return torch.stack(img_features, dim=1)
+
+    def _prefetch_inputs(self, batch: dict[str, Tensor]) -> dict[str, Tensor]:
+        """Queue the observation, returning the stacked observation windows (the queues keep changing)."""
+        batch = {k: v for k, v in batch.items() if k != ACTION}
+        if self.config.image_features:
+            batch[OBS_IMAGES] = torch.stack([batch[key] for key in self.config.image_features], dim=-4)
+        self._queues = populate_queues(self._queues, batch)
+        inputs = {k: torch.stack(list(self._queues[k]), dim=1) for k in batch if k in self._queues}
+        if self.config.image_features:
+            inputs[self._IMAGE_WINDOW] = list(self._queues[OBS_IMAGES])
+        return inputs
+
+    def _predict_prefetched_chunk(self, inputs: dict[str, Tensor]) -> Tensor:
+        inputs = dict(inputs)  # the inputs may be used for another prediction
+        image_window = inputs.pop(self._IMAGE_WINDOW, None)
+        if self.config.inference_latency_budget_ms is not None and not self.diffusion.latency_calibrated:
+            self.diffusion.calibrate_num_inference_steps(inputs, self.config.inference_latency_budget_ms)
+        img_features = self._get_image_features(image_window) if image_window is not None else None
+        return self.diffusion.generate_actions(inputs, img_features=img_features)
+
     @torch.no_grad()
     def select_action(self, batch: dict[str, Tensor], noise: Tensor | None = None) -> Tensor:
         """Select a single action given environment observations.
@@ -130,6 +205,10 @@ class DiffusionPolicy(PreTrainedPolicy):
         # NOTE: It's important that this happens after stacking the images into a single key.
         self._queues = populate_queues(self._queues, batch)
 
+        if self.config.temporal_ensemble_coeff is not None:
+            actions = self.predict_action_chunk(batch, noise=noise)
+            return self.temporal_ensembler.update(actions)
+
         if len(self._queues[ACTION]) == 0:
             actions = self.predict_action_chunk(batch, noise=noise)
             self._queues[ACTION].extend(actions.transpose(0, 1))
@@ -142,20 +221,60 @@ class DiffusionPolicy(PreTrainedPolicy):
         if self.config.image_features:
             batch = dict(batch)  # shallow copy so that adding a key doesn't modify the original
             batch[OBS_IMAGES] = torch.stack([batch[key] for key in self.config.image_features], dim=-4)
-        loss = self.diffusion.compute_loss(batch)
+        if self.config.distillation_teacher_path is not None:
+            loss = self.diffusion.compute_distillation_loss(batch, self._get_distillation_teacher())
+        else:
+            loss = self.diffusion.compute_loss(batch)
         # no output_dict so returning None
         return loss, None
 
+    def _get_distillation_teacher(self) -> "DiffusionModel":
+        """Load the frozen teacher of the distillation, sampling with `distillation_teacher_steps` DDIM steps."""
+        if self._distillation_teacher is None:
+            teacher_config = PreTrainedConfig.from_pretrained(self.config.distillation_teacher_path)
+            if not isinstance(teacher_config, DiffusionConfig):
+                raise ValueError(
+                    f"The distillation teacher must be a diffusion policy. Got {teacher_config.type}."
+                )
+            if (teacher_config.horizon, teacher_config.n_obs_steps) != (
+                self.config.horizon,
+                self.config.n_obs_steps,
+            ):
+                raise ValueError(
+                    "The teacher and the student must have the same `horizon` and `n_obs_steps`. Got "
+                    f"{(teacher_config.horizon, teacher_config.n_obs_steps)} for the teacher and "
+                    f"{(self.config.horizon, self.config.n_obs_steps)} for the student."
+                )
+            teacher_config.noise_scheduler_type = "DDIM"
+            teacher_config.num_inference_steps = self.config.distillation_teacher_steps
+            teacher_config.inference_latency_budget_ms = None
+            teacher_config.distillation_teacher_path = None
+            teacher = DiffusionPolicy.from_pretrained(
+                self.config.distillation_teacher_path, config=teacher_config
+            )
+            teacher.to(get_device_from_parameters(self)).requires_grad_(False)
+            # Bypass `nn.Module.__setattr__`, so that the teacher is not registered as a submodule of the
+            # student, which would train it and save it in the student checkpoints.
+            object.__setattr__(self, "_distillation_teacher", teacher.diffusion)
+        return self._distillation_teacher
+
 
-def _make_noise_scheduler(name: str, **kwargs: dict) -> DDPMScheduler | DDIMScheduler:
+def _make_noise_scheduler(
+    name: str, **kwargs: dict
+) -> DDPMScheduler | DDIMScheduler | DPMSolverMultistepScheduler | UniPCMultistepScheduler:
     """
     Factory for noise scheduler instances of the requested type. All kwargs are passed
-    to the scheduler.
+    to the scheduler, except the sample clipping ones for the multistep solvers which do not support them.
     """
     if name == "DDPM":
         return DDPMScheduler(**kwargs)
     elif name == "DDIM":
         return DDIMScheduler(**kwargs)
+    elif name in ["DPMSolverMultistep", "UniPC"]:
+        kwargs = {k: v for k, v in kwargs.items() if k not in ["clip_sample", "clip_sample_range"]}
+        if name == "DPMSolverMultistep":
+            return DPMSolverMultistepScheduler(algorithm_type="dpmsolver++", **kwargs)
+        return UniPCMultistepScheduler(**kwargs)
     else:
         raise ValueError(f"Unsupported noise scheduler type {name}")
 
@@ -192,10 +311,16 @@ class DiffusionModel(nn.Module):
             prediction_type=config.prediction_type,
         )
 
+        # Not all schedulers take a random generator (the deterministic multistep solvers don't).
+        self._scheduler_step_takes_generator = (
+            "generator" in inspect.signature(self.noise_scheduler.step).parameters
+        )
+
         if config.num_inference_steps is None:
             self.num_inference_steps = self.noise_scheduler.config.num_train_timesteps
         else:
             self.num_inference_steps = config.num_inference_steps
+        self.latency_calibrated = False
 
     # ========= inference  ============
     def conditional_sample(
@@ -221,6 +346,7 @@ class DiffusionModel(nn.Module):
         )
 
         self.noise_scheduler.set_timesteps(self.num_inference_steps)
+        step_kwargs = {"generator": generator} if self._scheduler_step_takes_generator else {}
 
         for t in self.noise_scheduler.timesteps:
             # Predict model output.
@@ -230,40 +356,101 @@ class DiffusionModel(nn.Module):
                 global_cond=global_cond,
             )
             # Compute previous image: x_t -> x_t-1
-            sample = self.noise_scheduler.step(model_output, t, sample, generator=generator).prev_sample
+            sample = self.noise_scheduler.step(model_output, t, sample, **step_kwargs).prev_sample
+
+        # The multistep solvers don't clip the sample at each step, so clip the final one instead.
+        if self.config.clip_sample and "clip_sample" not in self.noise_scheduler.config:
+            sample = sample.clamp(-self.config.clip_sample_range, self.config.clip_sample_range)
 
         return sample
 
-    def _prepare_global_conditioning(self, batch: dict[str, Tensor]) -> Tensor:
-        """Encode image features and concatenate them all together along with the state vector."""
-        batch_size, n_obs_steps = batch[OBS_STATE].shape[:2]
+    @torch.no_grad()
+    def calibrate_num_inference_steps(
+        self, batch: dict[str, Tensor], latency_budget_ms: float, num_trials: int = 3
+    ) -> int:
+        """Set `num_inference_steps` to the largest number of steps that fits in a latency budget.
+
+        The latency of the observation encoding and of one denoising step are measured on `batch` (after a
+        warm-up call of each), and the number of steps is capped by the configured `num_inference_steps`.
+
+        Returns:
+            The selected number of inference steps.
+        """
+        device = get_device_from_parameters(self)
+        batch_size = batch[OBS_STATE].shape[0]
+
+        def measure_ms(fn: Callable[[], Tensor]) -> float:
+            fn()
+            if device.type == "cuda":
+                torch.cuda.synchronize(device)
+            start = time.perf_counter()
+            for _ in range(num_trials):
+                fn()
+            if device.type == "cuda":
+                torch.cuda.synchronize(device)
+            return (time.perf_counter() - start) / num_trials * 1000
+
+        global_cond = self._prepare_global_conditioning(batch)
+        sample = torch.randn(
+            size=(batch_size, self.config.horizon, self.config.action_feature.shape[0]),
+            dtype=get_dtype_from_parameters(self),
+            device=device,
+        )
+        timestep = torch.zeros(batch_size, dtype=torch.long, device=device)
+        cond_ms = measure_ms(lambda: self._prepare_global_conditioning(batch))
+        step_ms = measure_ms(lambda: self.unet(sample, timestep, global_cond=global_cond))
+
+        max_steps = (
+            self.config.num_inference_steps
+            if self.config.num_inference_steps is not None
+            else self.noise_scheduler.config.num_train_timesteps
+        )
+        num_steps = int((latency_budget_ms - cond_ms) // step_ms)
+        self.num_inference_steps = max(1, min(max_steps, num_steps))
+        self.latency_calibrated = True
+        logging.info(
+            f"Diffusion inference: {cond_ms:.1f}ms to encode observations and {step_ms:.1f}ms per denoising "
+            f"step, using {self.num_inference_steps} steps for a {latency_budget_ms:.1f}ms budget."
+        )
+        if num_steps < 1:
+            logging.warning(
+                f"A single denoising step doesn't fit in the {latency_budget_ms:.1f}ms latency budget."
+            )
+        return self.num_inference_steps
+
+    def encode_images(self, images: Tensor) -> Tensor:
+        """Encode (B, S, N, C, H, W) images of N cameras into (B, S, N * feature_dim) features."""
+        batch_size, n_obs_steps = images.shape[:2]
+        if self.config.use_separate_rgb_encoder_per_camera:
+            # Combine batch and sequence dims while rearranging to make the camera index dimension first.
+            images_per_camera = einops.rearrange(images, "b s n ... -> n (b s) ...")
+            img_features_list = torch.cat(
+                [encoder(images) for encoder, images in zip(self.rgb_encoder, images_per_camera, strict=True)]
+            )
+            # Separate batch and sequence dims back out. The camera index dim gets absorbed into the
+            # feature dim (effectively concatenating the camera features).
+            return einops.rearrange(
+                img_features_list, "(n b s) ... -> b s (n ...)", b=batch_size, s=n_obs_steps
+            )
+        # Combine batch, sequence, and "which camera" dims before passing to shared encoder.
+        img_features = self.rgb_encoder(einops.rearrange(images, "b s n ... -> (b s n) ..."))
+        # Separate batch dim and sequence dim back out. The camera index dim gets absorbed into the
+        # feature dim (effectively concatenating the camera features).
+        return einops.rearrange(img_features, "(b s n) ... -> b s (n ...)", b=batch_size, s=n_obs_steps)
+
+    def _prepare_global_conditioning(
+        self, batch: dict[str, Tensor], img_features: Tensor | None = None
+    ) -> Tensor:
+        """Encode image features and concatenate them all together along with the state vector.
+
+        `img_features` are already encoded (B, n_obs_steps, num_cameras * feature_dim) image features to use
+        instead of encoding `batch["observation.images"]`.
+        """
         global_cond_feats = [batch[OBS_STATE]]
         # Extract image features.
         if self.config.image_features:
-            if self.config.use_separate_rgb_encoder_per_camera:
-                # Combine batch and sequence dims while rearranging to make the camera index dimension first.
-                images_per_camera = einops.rearrange(batch[OBS_IMAGES], "b s n ... -> n (b s) ...")
-                img_features_list = torch.cat(
-                    [
-                        encoder(images)
-                        for encoder, images in zip(self.rgb_encoder, images_per_camera, strict=True)
-                    ]
-                )
-                # Separate batch and sequence dims back out. The camera index dim gets absorbed into the
-                # feature dim (effectively concatenating the camera features).
-                img_features = einops.rearrange(
-                    img_features_list, "(n b s) ... -> b s (n ...)", b=batch_size, s=n_obs_steps
-                )
-            else:
-                # Combine batch, sequence, and "which camera" dims before passing to shared encoder.
-                img_features = self.rgb_encoder(
-                    einops.rearrange(batch[OBS_IMAGES], "b s n ... -> (b s n) ...")
-                )
-                # Separate batch dim and sequence dim back out. The camera index dim gets absorbed into the
-                # feature dim (effectively concatenating the camera features).
-                img_features = einops.rearrange(
-                    img_features, "(b s n) ... -> b s (n ...)", b=batch_size, s=n_obs_steps
-                )
+            if img_features is None:
+                img_features = self.encode_images(batch[OBS_IMAGES])
             global_cond_feats.append(img_features)
 
         if self.config.env_state_feature:
@@ -272,7 +459,9 @@ class DiffusionModel(nn.Module):
         # Concatenate features then flatten to (B, global_cond_dim).
         return torch.cat(global_cond_feats, dim=-1).flatten(start_dim=1)
 
-    def generate_actions(self, batch: dict[str, Tensor], noise: Tensor | None = None) -> Tensor:
+    def generate_actions(
+        self, batch: dict[str, Tensor], noise: Tensor | None = None, img_features: Tensor | None = None
+    ) -> Tensor:
         """
         This function expects `batch` to have:
         {
@@ -282,19 +471,24 @@ class DiffusionModel(nn.Module):
                 AND/OR
             "observation.environment_state": (B, n_obs_steps, environment_dim)
         }
+        "observation.images" is not needed if already encoded `img_features` are provided.
         """
         batch_size, n_obs_steps = batch[OBS_STATE].shape[:2]
         assert n_obs_steps == self.config.n_obs_steps
 
         # Encode image features and concatenate them all together along with the state vector.
-        global_cond = self._prepare_global_conditioning(batch)  # (B, global_cond_dim)
+        global_cond = self._prepare_global_conditioning(batch, img_features)  # (B, global_cond_dim)
 
         # run sampling
         actions = self.conditional_sample(batch_size, global_cond=global_cond, noise=noise)
 
-        # Extract `n_action_steps` steps worth of actions (from the current observation).
+        # Extract `n_action_steps` steps worth of actions (from the current observation), or all of them to
+        # ensemble them with the actions predicted at the next steps.
         start = n_obs_steps - 1
-        end = start + self.config.n_action_steps
+        if self.config.temporal_ensemble_coeff is not None:
+            end = self.config.horizon
+        else:
+            end = start + self.config.n_action_steps
         actions = actions[:, start:end]
 
         return actions
@@ -352,7 +546,35 @@ class DiffusionModel(nn.Module):
 
         loss = F.mse_loss(pred, target, reduction="none")
 
-        # Mask loss wherever the action is padded with copies (edges of the dataset trajectory).
+        return self._mask_loss_for_padding(loss, batch).mean()
+
+    def compute_distillation_loss(self, batch: dict[str, Tensor], teacher: "DiffusionModel") -> Tensor:
+        """
+        Loss to distill the sampling chain of `teacher` into the `num_inference_steps` steps of this model.
+
+        Both models sample action trajectories from the same noise: the teacher with its own (many-step)
+        sampler, and this model with its few steps, through which the gradient flows. The trajectories of
+        this model are regressed onto the teacher's ones. `batch` is the same as for `compute_loss`.
+        """
+        batch_size = batch[OBS_STATE].shape[0]
+        noise = torch.randn(
+            size=(batch_size, self.config.horizon, self.config.action_feature.shape[0]),
+            dtype=get_dtype_from_parameters(self),
+            device=get_device_from_parameters(self),
+        )
+        with torch.no_grad():
+            teacher_global_cond = teacher._prepare_global_conditioning(batch)
+            target = teacher.conditional_sample(batch_size, global_cond=teacher_global_cond, noise=noise)
+
+        global_cond = self._prepare_global_conditioning(batch)
+        pred = self.conditional_sample(batch_size, global_cond=global_cond, noise=noise)
+
+        loss = F.mse_loss(pred, target, reduction="none")
+
+        return self._mask_loss_for_padding(loss, batch).mean()
+
+    def _mask_loss_for_padding(self, loss: Tensor, batch: dict[str, Tensor]) -> Tensor:
+        """Mask loss wherever the action is padded with copies (edges of the dataset trajectory)."""
         if self.config.do_mask_loss_for_padding:
             if "action_is_pad" not in batch:
                 raise ValueError(
@@ -361,8 +583,7 @@ class DiffusionModel(nn.Module):
                 )
             in_episode_bound = ~batch["action_is_pad"]
             loss = loss * in_episode_bound.unsqueeze(-1)
-
-        return loss.mean()
+        return loss
 
 
 class SpatialSoftmax(nn.Module):
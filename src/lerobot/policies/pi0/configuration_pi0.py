@@ -40,6 +40,21 @@ class PI0Config(PreTrainedConfig):
 
     # Flow matching parameters: see openpi `PI0Pytorch`
     num_inference_steps: int = 10  # Number of denoising steps during inference
+    # Number of additional consecutive action chunks predicted from the prefix (images and language) KV cache of
+    # a previous chunk. 0 recomputes the prefix for every chunk. Reusing it skips the PaliGemma prefix forward,
+    # which dominates inference latency on CPU, at the cost of reacting later to new observations. The cache is
+    # recomputed when the language tokens or the batch sources (see `BATCH_SOURCES`) change.
+    prefix_cache_max_reuse: int = 0
+    # Attention implementation used at inference: "eager", or "sdpa" to use the fused
+    # `torch.nn.functional.scaled_dot_product_attention` kernels (flash or memory-efficient when available).
+    attention_implementation: str = "eager"
+    # Run the denoising loop as a single graph compiled with `torch.compile(mode="reduce-overhead")`, which is
+    # captured as a CUDA graph on GPU. Inference batch size and `num_inference_steps` should stay fixed, since any
+    # change triggers a recompilation.
+    static_inference: bool = False
+    # Temporal ensembling of the chunks predicted at every step (see `lerobot.policies.utils.TemporalEnsembler`).
+    # None disables it, otherwise `n_action_steps` must be 1.
+    temporal_ensemble_coeff: float | None = None
     time_sampling_beta_alpha: float = 1.5
     time_sampling_beta_beta: float = 1.0
     time_sampling_scale: float = 0.999
@@ -101,6 +116,20 @@ class PI0Config(PreTrainedConfig):
         if self.dtype not in ["bfloat16", "float32"]:
             raise ValueError(f"Invalid dtype: {self.dtype}")
 
+        if self.attention_implementation not in ["eager", "sdpa"]:
+            raise ValueError(f"Invalid attention_implementation: {self.attention_implementation}")
+
+        if self.prefix_cache_max_reuse < 0:
+            raise ValueError(
+                f"`prefix_cache_max_reuse` must be non-negative, got {self.prefix_cache_max_reuse}"
+            )
+
+        if self.temporal_ensemble_coeff is not None and self.n_action_steps > 1:
+            raise NotImplementedError(
+                "`n_action_steps` must be 1 when using temporal ensembling. This is "
+                "because the policy needs to be queried every step to compute the ensembled action."
+            )
+
     def validate_features(self) -> None:
         """Validate and set up input/output features."""
         for i in range(self.empty_cameras):
@@ -42,8 +42,10 @@ else:
 from lerobot.configs.policies import PreTrainedConfig
 from lerobot.policies.pi0.configuration_pi0 import PI0Config
 from lerobot.policies.pretrained import PreTrainedPolicy, T
+from lerobot.policies.utils import TemporalEnsembler
 from lerobot.utils.constants import (
     ACTION,
+    BATCH_SOURCES,
     OBS_LANGUAGE_ATTENTION_MASK,
     OBS_LANGUAGE_TOKENS,
     OBS_STATE,
@@ -527,6 +529,9 @@ class PI0Pytorch(nn.Module):  # see openpi `PI0Pytorch`
         # Initialize gradient checkpointing flag
         self.gradient_checkpointing_enabled = False
 
+        # Compiled denoising loop of the static inference mode, created on first use
+        self._static_denoise_loop = None
+
         # Compile model if requested
         if config.compile_model:
             torch.set_float32_matmul_precision("high")
@@ -568,10 +573,19 @@ class PI0Pytorch(nn.Module):  # see openpi `PI0Pytorch`
             )
         return func(*args, **kwargs)
 
-    def _prepare_attention_masks_4d(self, att_2d_masks):
+    def _prepare_attention_masks_4d(self, att_2d_masks, dtype=torch.float32):
         """Helper method to prepare 4D attention masks for transformer."""
         att_2d_masks_4d = att_2d_masks[:, None, :, :]
-        return torch.where(att_2d_masks_4d, 0.0, OPENPI_ATTENTION_MASK_VALUE)
+        return torch.where(att_2d_masks_4d, 0.0, OPENPI_ATTENTION_MASK_VALUE).to(dtype)
+
+    def _inference_attention_mask_dtype(self):
+        """Dtype of the additive 4D attention masks used at inference.
+
+        The eager attention adds them to float32 scores, while SDPA expects them in the dtype of the queries.
+        """
+        if self.config.attention_implementation == "eager":
+            return torch.float32
+        return self.paligemma_with_expert.paligemma.language_model.layers[0].self_attn.q_proj.weight.dtype
 
     def sample_noise(self, shape, device):
         return torch.normal(
@@ -632,11 +646,17 @@ class PI0Pytorch(nn.Module):  # see openpi `PI0Pytorch`
 
         return embs, pad_masks, att_masks
 
+    def _suffix_masks(self, bsize, device):
+        """Padding and attention masks of the suffix tokens (state, then actions), independent of their values."""
+        pad_masks = torch.ones(bsize, 1 + self.config.chunk_size, dtype=torch.bool, device=device)
+        # Set attention masks so that image, language and state inputs do not attend to action tokens
+        att_masks = torch.tensor([1, 1] + [0] * (self.config.chunk_size - 1), dtype=torch.bool, device=device)
+        att_masks = att_masks[None, :].expand(bsize, len(att_masks))
+        return pad_masks, att_masks
+
     def embed_suffix(self, state, noisy_actions, timestep):
         """Embed state, noisy_actions, timestep to prepare for Expert Gemma processing."""
         embs = []
-        pad_masks = []
-        att_masks = []
 
         if self.state_proj.weight.dtype == torch.float32:
             state = state.to(torch.float32)
@@ -646,12 +666,6 @@ class PI0Pytorch(nn.Module):  # see openpi `PI0Pytorch`
 
         state_emb = self._apply_checkpoint(state_proj_func, state)
         embs.append(state_emb[:, None, :])
-        bsize = state_emb.shape[0]
-        device = state_emb.device
-
-        state_mask = torch.ones(bsize, 1, dtype=torch.bool, device=device)
-        pad_masks.append(state_mask)
-        att_masks += [1]
 
         # Embed timestep using sine-cosine positional encoding
         time_emb = create_sinusoidal_pos_embedding(
@@ -681,17 +695,8 @@ class PI0Pytorch(nn.Module):  # see openpi `PI0Pytorch`
         adarms_cond = None
 
         embs.append(action_time_emb)
-        bsize, action_time_dim = action_time_emb.shape[:2]
-        action_time_mask = torch.ones(bsize, action_time_dim, dtype=torch.bool, device=timestep.device)
-        pad_masks.append(action_time_mask)
-
-        # Set attention masks so that image, language and state inputs do not attend to action tokens
-        att_masks += [1] + ([0] * (self.config.chunk_size - 1))
-
         embs = torch.cat(embs, dim=1)
-        pad_masks = torch.cat(pad_masks, dim=1)
-        att_masks = torch.tensor(att_masks, dtype=embs.dtype, device=embs.device)
-        att_masks = att_masks[None, :].expand(bsize, len(att_masks))
+        pad_masks, att_masks = self._suffix_masks(embs.shape[0], embs.device)
 
         return embs, pad_masks, att_masks, adarms_cond
 
@@ -754,11 +759,50 @@ class PI0Pytorch(nn.Module):  # see openpi `PI0Pytorch`
 
         return F.mse_loss(u_t, v_t, reduction="none")
 
+    @torch.no_grad()
+    def compute_prefix_cache(self, images, img_masks, lang_tokens, lang_masks):
+        """Run the prefix (images and language tokens) through PaliGemma once.
+
+        Returns the prefix padding masks and the KV cache that every denoising step attends to.
+        """
+        prefix_embs, prefix_pad_masks, prefix_att_masks = self.embed_prefix(
+            images, img_masks, lang_tokens, lang_masks
+        )
+        prefix_att_2d_masks = make_att_2d_masks(prefix_pad_masks, prefix_att_masks)
+        prefix_position_ids = torch.cumsum(prefix_pad_masks, dim=1) - 1
+
+        prefix_att_2d_masks_4d = self._prepare_attention_masks_4d(
+            prefix_att_2d_masks, dtype=self._inference_attention_mask_dtype()
+        )
+        self.paligemma_with_expert.paligemma.language_model.config._attn_implementation = (  # noqa: SLF001
+            self.config.attention_implementation
+        )
+
+        _, past_key_values = self.paligemma_with_expert.forward(
+            attention_mask=prefix_att_2d_masks_4d,
+            position_ids=prefix_position_ids,
+            past_key_values=None,
+            inputs_embeds=[prefix_embs, None],
+            use_cache=True,
+        )
+        return prefix_pad_masks, past_key_values
+
     @torch.no_grad()  # see openpi `sample_actions` (slightly adapted)
     def sample_actions(
-        self, images, img_masks, lang_tokens, lang_masks, state, noise=None, num_steps=None
+        self,
+        images,
+        img_masks,
+        lang_tokens,
+        lang_masks,
+        state,
+        noise=None,
+        num_steps=None,
+        prefix_cache=None,
     ) -> Tensor:
-        """Do a full inference forward and compute the action."""
+        """Do a full inference forward and compute the action.
+
+        `prefix_cache` is an output of `compute_prefix_cache` to reuse. It is computed from the inputs if None.
+        """
         if num_steps is None:
             num_steps = self.config.num_inference_steps
 
@@ -774,22 +818,20 @@ class PI0Pytorch(nn.Module):  # see openpi `PI0Pytorch`
             )  # Use config max_action_dim for internal processing
             noise = self.sample_noise(actions_shape, device)
 
-        prefix_embs, prefix_pad_masks, prefix_att_masks = self.embed_prefix(
-            images, img_masks, lang_tokens, lang_masks
-        )
-        prefix_att_2d_masks = make_att_2d_masks(prefix_pad_masks, prefix_att_masks)
-        prefix_position_ids = torch.cumsum(prefix_pad_masks, dim=1) - 1
-
-        prefix_att_2d_masks_4d = self._prepare_attention_masks_4d(prefix_att_2d_masks)
-        self.paligemma_with_expert.paligemma.language_model.config._attn_implementation = "eager"  # noqa: SLF001
-
-        _, past_key_values = self.paligemma_with_expert.forward(
-            attention_mask=prefix_att_2d_masks_4d,
-            position_ids=prefix_position_ids,
-            past_key_values=None,
-            inputs_embeds=[prefix_embs, None],
-            use_cache=True,
-        )
+        if prefix_cache is None:
+            prefix_cache = self.compute_prefix_cache(images, img_masks, lang_tokens, lang_masks)
+        prefix_pad_masks, past_key_values = prefix_cache
+        suffix_attention = self.prepare_suffix_attention(prefix_pad_masks)
+
+        if self.config.static_inference:
+            if self._static_denoise_loop is None:
+                self._static_denoise_loop = torch.compile(self.denoise_loop, mode="reduce-overhead")
+            # Mark a new CUDA graph replay, and copy the output out of the graph's static memory which the next
+            # replay overwrites
+            torch.compiler.cudagraph_mark_step_begin()
+            return self._static_denoise_loop(
+                state, prefix_pad_masks, past_key_values, noise, num_steps, suffix_attention
+            ).clone()
 
         dt = -1.0 / num_steps
         dt = torch.tensor(dt, dtype=torch.float32, device=device)
@@ -804,26 +846,48 @@ class PI0Pytorch(nn.Module):  # see openpi `PI0Pytorch`
                 past_key_values,
                 x_t,
                 expanded_time,
+                suffix_attention=suffix_attention,
             )
             x_t = x_t + dt * v_t
             time += dt
 
         return x_t
 
-    def denoise_step(
-        self,
-        state,
-        prefix_pad_masks,
-        past_key_values,
-        x_t,
-        timestep,
-    ):
-        """Apply one denoising step of the noise `x_t` at a given timestep."""
-        suffix_embs, suffix_pad_masks, suffix_att_masks, adarms_cond = self.embed_suffix(state, x_t, timestep)
+    def denoise_loop(self, state, prefix_pad_masks, past_key_values, noise, num_steps, suffix_attention):
+        """Integrate the flow from the noise at time 1 to the actions at time 0, in `num_steps` Euler steps.
+
+        Same computation as the loop of `sample_actions`, but with a fixed number of iterations and no
+        data-dependent stopping condition, so that `torch.compile` captures the whole loop as a single graph (and
+        a single CUDA graph with the "reduce-overhead" mode).
+        """
+        bsize = noise.shape[0]
+        dt = torch.tensor(-1.0 / num_steps, dtype=torch.float32, device=noise.device)
 
+        x_t = noise
+        time = torch.tensor(1.0, dtype=torch.float32, device=noise.device)
+        for _ in range(num_steps):
+            v_t = self.denoise_step(
+                state,
+                prefix_pad_masks,
+                past_key_values,
+                x_t,
+                time.expand(bsize),
+                suffix_attention=suffix_attention,
+            )
+            x_t = x_t + dt * v_t
+            time = time + dt
+
+        return x_t
+
+    def prepare_suffix_attention(self, prefix_pad_masks):
+        """Build the 4D attention mask and position ids of the suffix tokens attending to the cached prefix.
+
+        They only depend on the prefix padding, so `sample_actions` builds them once per action chunk and shares
+        them between all the denoising steps.
+        """
+        batch_size, prefix_len = prefix_pad_masks.shape
+        suffix_pad_masks, suffix_att_masks = self._suffix_masks(batch_size, prefix_pad_masks.device)
         suffix_len = suffix_pad_masks.shape[1]
-        batch_size = prefix_pad_masks.shape[0]
-        prefix_len = prefix_pad_masks.shape[1]
 
         prefix_pad_2d_masks = prefix_pad_masks[:, None, :].expand(batch_size, suffix_len, prefix_len)
         suffix_att_2d_masks = make_att_2d_masks(suffix_pad_masks, suffix_att_masks)
@@ -832,8 +896,32 @@ class PI0Pytorch(nn.Module):  # see openpi `PI0Pytorch`
         prefix_offsets = torch.sum(prefix_pad_masks, dim=-1)[:, None]
         position_ids = prefix_offsets + torch.cumsum(suffix_pad_masks, dim=1) - 1
 
-        full_att_2d_masks_4d = self._prepare_attention_masks_4d(full_att_2d_masks)
-        self.paligemma_with_expert.gemma_expert.model.config._attn_implementation = "eager"  # noqa: SLF001
+        full_att_2d_masks_4d = self._prepare_attention_masks_4d(
+            full_att_2d_masks, dtype=self._inference_attention_mask_dtype()
+        )
+        return full_att_2d_masks_4d, position_ids
+
+    def denoise_step(
+        self,
+        state,
+        prefix_pad_masks,
+        past_key_values,
+        x_t,
+        timestep,
+        suffix_attention=None,
+    ):
+        """Apply one denoising step of the noise `x_t` at a given timestep.
+
+        `suffix_attention` is the output of `prepare_suffix_attention`. It is built from `prefix_pad_masks` if None.
+        """
+        suffix_embs, _, _, adarms_cond = self.embed_suffix(state, x_t, timestep)
+
+        if suffix_attention is None:
+            suffix_attention = self.prepare_suffix_attention(prefix_pad_masks)
+        full_att_2d_masks_4d, position_ids = suffix_attention
+        self.paligemma_with_expert.gemma_expert.model.config._attn_implementation = (  # noqa: SLF001
+            self.config.attention_implementation
+        )
 
         outputs_embeds, _ = self.paligemma_with_expert.forward(
             attention_mask=full_att_2d_masks_4d,
@@ -855,6 +943,7 @@ class PI0Policy(PreTrainedPolicy):
 
     config_class = PI0Config
     name = "pi0"
+    supports_chunk_prefetch = True
 
     def __init__(
         self,
@@ -877,6 +966,9 @@ class PI0Policy(PreTrainedPolicy):
 
         self.model.to(config.device)
 
+        if config.temporal_ensemble_coeff is not None:
+            self.temporal_ensembler = TemporalEnsembler(config.temporal_ensemble_coeff, config.chunk_size)
+
         self.reset()
 
     @classmethod
@@ -1054,10 +1146,17 @@ class PI0Policy(PreTrainedPolicy):
 
     def reset(self):
         """Reset internal state - called when environment resets."""
+        self._reset_prefetch()
         self._action_queue = deque(maxlen=self.config.n_action_steps)
         self._queues = {
             ACTION: deque(maxlen=self.config.n_action_steps),
         }
+        self._prefix_cache = None
+        self._prefix_cache_tokens = None
+        self._prefix_cache_sources = None
+        self._prefix_cache_uses = 0
+        if self.config.temporal_ensemble_coeff is not None:
+            self.temporal_ensembler.reset()
 
     def _preprocess_images(self, batch: dict[str, Tensor]) -> tuple[list[Tensor], list[Tensor]]:
         """Preprocess images for the model.
@@ -1139,6 +1238,10 @@ class PI0Policy(PreTrainedPolicy):
         """Select a single action given environment observations."""
         self.eval()
 
+        if self.config.temporal_ensemble_coeff is not None:
+            actions = self.predict_action_chunk(batch)
+            return self.temporal_ensembler.update(actions)
+
         # Action queue logic for n_action_steps > 1
         if len(self._action_queue) == 0:
             actions = self.predict_action_chunk(batch)[:, : self.config.n_action_steps]
@@ -1147,6 +1250,31 @@ class PI0Policy(PreTrainedPolicy):
 
         return self._action_queue.popleft()
 
+    def _get_prefix_cache(self, images, img_masks, lang_tokens, lang_masks, sources=None):
+        """Return the prefix KV cache to predict the next action chunk with.
+
+        The cache of the previous chunk is reused for up to `config.prefix_cache_max_reuse` consecutive chunks,
+        as long as the language tokens and the sources of the batch samples do not change, so that the images of
+        a robot are never used for another one. Otherwise, it is recomputed from the current inputs.
+        """
+        max_reuse = self.config.prefix_cache_max_reuse
+        if (
+            self._prefix_cache is not None
+            and self._prefix_cache_uses <= max_reuse
+            and self._prefix_cache_sources == sources
+            and torch.equal(self._prefix_cache_tokens, lang_tokens)
+        ):
+            self._prefix_cache_uses += 1
+            return self._prefix_cache
+
+        prefix_cache = self.model.compute_prefix_cache(images, img_masks, lang_tokens, lang_masks)
+        if max_reuse > 0:
+            self._prefix_cache = prefix_cache
+            self._prefix_cache_tokens = lang_tokens.clone()
+            self._prefix_cache_sources = sources
+            self._prefix_cache_uses = 1
+        return prefix_cache
+
     @torch.no_grad()
     def predict_action_chunk(self, batch: dict[str, Tensor]) -> Tensor:
         """Predict a chunk of actions given environment observations."""
@@ -1157,8 +1285,14 @@ class PI0Policy(PreTrainedPolicy):
         lang_tokens, lang_masks = batch[f"{OBS_LANGUAGE_TOKENS}"], batch[f"{OBS_LANGUAGE_ATTENTION_MASK}"]
         state = self.prepare_state(batch)
 
+        prefix_cache = self._get_prefix_cache(
+            images, img_masks, lang_tokens, lang_masks, sources=batch.get(BATCH_SOURCES)
+        )
+
         # Sample actions using the model
-        actions = self.model.sample_actions(images, img_masks, lang_tokens, lang_masks, state)
+        actions = self.model.sample_actions(
+            images, img_masks, lang_tokens, lang_masks, state, prefix_cache=prefix_cache
+        )
 
         # Unpad actions to actual action dimension
         original_action_dim = self.config.output_features[ACTION].shape[0]
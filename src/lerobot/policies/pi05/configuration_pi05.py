@@ -39,6 +39,16 @@ class PI05Config(PreTrainedConfig):
 
     # Flow matching parameters: see openpi `PI0Pytorch`
     num_inference_steps: int = 10
+    # Attention implementation used at inference: "eager", or "sdpa" to use the fused
+    # `torch.nn.functional.scaled_dot_product_attention` kernels (flash or memory-efficient when available).
+    attention_implementation: str = "eager"
+    # Run the denoising loop as a single graph compiled with `torch.compile(mode="reduce-overhead")`, which is
+    # captured as a CUDA graph on GPU. Inference batch size and `num_inference_steps` should stay fixed, since any
+    # change triggers a recompilation.
+    static_inference: bool = False
+    # Temporal ensembling of the chunks predicted at every step (see `lerobot.policies.utils.TemporalEnsembler`).
+    # None disables it, otherwise `n_action_steps` must be 1.
+    temporal_ensemble_coeff: float | None = None
     time_sampling_beta_alpha: float = 1.5
     time_sampling_beta_beta: float = 1.0
     time_sampling_scale: float = 0.999
@@ -101,6 +111,15 @@ class PI05Config(PreTrainedConfig):
         if self.dtype not in ["bfloat16", "float32"]:
             raise ValueError(f"Invalid dtype: {self.dtype}")
 
+        if self.attention_implementation not in ["eager", "sdpa"]:
+            raise ValueError(f"Invalid attention_implementation: {self.attention_implementation}")
+
+        if self.temporal_ensemble_coeff is not None and self.n_action_steps > 1:
+            raise NotImplementedError(
+                "`n_action_steps` must be 1 when using temporal ensembling. This is "
+                "because the policy needs to be queried every step to compute the ensembled action."
+            )
+
     def validate_features(self) -> None:
         """Validate and set up input/output features."""
         for i in range(self.empty_cameras):
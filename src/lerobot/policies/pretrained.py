@@ -15,6 +15,9 @@ import abc
 import builtins
 import logging
 import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
 from importlib.resources import files
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -22,6 +25,7 @@ from typing import TypedDict, TypeVar
 
 import packaging
 import safetensors
+import torch
 from huggingface_hub import HfApi, ModelCard, ModelCardData, hf_hub_download
 from huggingface_hub.constants import SAFETENSORS_SINGLE_FILE
 from huggingface_hub.errors import HfHubHTTPError
@@ -48,6 +52,8 @@ class PreTrainedPolicy(nn.Module, HubMixin, abc.ABC):
 
     config_class: None
     name: None
+    # Whether `select_action_with_prefetch` can be used. Such policies call `_reset_prefetch` in `reset`.
+    supports_chunk_prefetch: bool = False
 
     def __init__(self, config: PreTrainedConfig, *inputs, **kwargs):
         super().__init__()
@@ -203,6 +209,118 @@ class PreTrainedPolicy(nn.Module, HubMixin, abc.ABC):
         """
         raise NotImplementedError
 
+    def _reset_prefetch(self) -> None:
+        """Discard the queued actions and the chunk being predicted in the background, if any."""
+        future = getattr(self, "_prefetch_future", None)
+        if future is not None and not future.cancel():
+            # Wait for the prediction, as it may still use the policy state being reset
+            future.exception()
+        self._prefetch_queue: deque[Tensor] = deque()
+        self._prefetch_future: Future | None = None
+        # Number of actions popped since the chunk being predicted was launched
+        self._prefetch_steps = 0
+
+    def _prefetch_inputs(self, batch: dict[str, Tensor]) -> dict[str, Tensor]:
+        """Called on every step with the current observation, returns the inputs to predict a chunk from.
+
+        Policies keeping a history of observations update it here, and return a snapshot of it, since the
+        history keeps being updated while a chunk is predicted in the background.
+        """
+        return batch
+
+    def _predict_prefetched_chunk(self, inputs: dict[str, Tensor]) -> Tensor:
+        """Predict a (batch_size, chunk_size, action_dim) chunk from the inputs of `_prefetch_inputs`."""
+        return self.predict_action_chunk(inputs)
+
+    def _launch_prefetch(self, inputs: dict[str, Tensor]) -> None:
+        """Start predicting the next chunk in a background thread (and CUDA stream)."""
+        if getattr(self, "_prefetch_executor", None) is None:
+            self._prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chunk_prefetch")
+
+        # Grad mode, autocast and the current stream are thread-local, so they are set up again in the worker
+        device = next(iter(self.parameters())).device
+        inference_mode = torch.is_inference_mode_enabled()
+        autocast_enabled = device.type == "cuda" and torch.is_autocast_enabled()
+        main_stream = torch.cuda.current_stream(device) if device.type == "cuda" else None
+        if main_stream is not None and getattr(self, "_prefetch_stream", None) is None:
+            self._prefetch_stream = torch.cuda.Stream(device)
+
+        def predict() -> Tensor:
+            with (
+                torch.inference_mode() if inference_mode else torch.no_grad(),
+                torch.autocast(device_type="cuda") if autocast_enabled else nullcontext(),
+                torch.cuda.stream(self._prefetch_stream) if main_stream is not None else nullcontext(),
+            ):
+                if main_stream is not None:
+                    # The inputs were produced on the main stream
+                    self._prefetch_stream.wait_stream(main_stream)
+                chunk = self._predict_prefetched_chunk(inputs)
+                if main_stream is not None:
+                    self._prefetch_stream.synchronize()
+            return chunk
+
+        self._prefetch_future = self._prefetch_executor.submit(predict)
+        self._prefetch_steps = 0
+
+    def _splice_prefetched_chunk(self, n_action_steps: int) -> None:
+        """Replace the queued actions by the ones of the prefetched chunk (waiting for it if needed)."""
+        chunk = self._prefetch_future.result()
+        self._prefetch_future = None
+        if chunk.is_cuda:
+            # The chunk was allocated on the prefetch stream
+            chunk.record_stream(torch.cuda.current_stream(chunk.device))
+
+        # Skip the actions of the steps that were run while the chunk was predicted
+        actions = chunk[:, self._prefetch_steps : n_action_steps]
+        if actions.shape[1] > 0:
+            self._prefetch_queue = deque(actions.transpose(0, 1))
+
+    def select_action_with_prefetch(self, batch: dict[str, Tensor]) -> Tensor:
+        """Same as `select_action`, but predicting the next action chunk in the background.
+
+        Once at most `config.chunk_prefetch_threshold` actions are left in the queue, the next chunk is
+        predicted from the current observation in a background thread (and CUDA stream), while the queued actions
+        keep being returned. When the chunk is ready, its first actions (those of the steps run in the meantime)
+        are skipped, and the rest replaces the queue. Inference only blocks on the first step, or when the
+        prediction takes longer than the queued actions last.
+        """
+        if not self.supports_chunk_prefetch:
+            raise NotImplementedError(f"{self.__class__.__name__} does not support action chunk prefetching.")
+        if getattr(self.config, "temporal_ensemble_coeff", None) is not None:
+            raise ValueError("Action chunk prefetching is not compatible with temporal ensembling.")
+        n_action_steps = self.config.n_action_steps
+        threshold = self.config.chunk_prefetch_threshold
+        if threshold is None or threshold >= n_action_steps:
+            raise ValueError(
+                "`chunk_prefetch_threshold` must be set and lower than `n_action_steps`. "
+                f"Got {threshold} and {n_action_steps}."
+            )
+
+        self.eval()
+        if not hasattr(self, "_prefetch_queue"):
+            self._reset_prefetch()
+
+        inputs = self._prefetch_inputs(batch)
+
+        if self._prefetch_future is not None and (
+            self._prefetch_future.done() or len(self._prefetch_queue) == 0
+        ):
+            self._splice_prefetched_chunk(n_action_steps)
+
+        if len(self._prefetch_queue) == 0:
+            # First step of the episode, or the prefetched chunk came too late to be used
+            with torch.no_grad():
+                chunk = self._predict_prefetched_chunk(inputs)
+            self._prefetch_queue = deque(chunk[:, :n_action_steps].transpose(0, 1))
+
+        if self._prefetch_future is None and len(self._prefetch_queue) <= threshold:
+            self._launch_prefetch(inputs)
+
+        action = self._prefetch_queue.popleft()
+        if self._prefetch_future is not None:
+            self._prefetch_steps += 1
+        return action
+
     def push_model_to_hub(
         self,
         cfg: TrainPipelineConfig,
@@ -53,6 +53,14 @@ class ActorLearnerConfig:
     learner_port: int = 50051
     policy_parameters_push_frequency: int = 4
     queue_get_timeout: float = 2
+    # How the policy parameters are sent to the actors (see `lerobot.rl.parameter_sync`): "full" state dicts,
+    # only the "changed" tensors, or "fp16" / "int8" quantized deltas against the parameters the actors hold.
+    parameters_sync_mode: str = "full"
+    # Number of pushes between two keyframes (all the parameters, in full), with the delta sync modes.
+    parameters_keyframe_interval: int = 50
+    # How the images of the transitions are sent to the learner: "raw", or "jpeg" (lossy, uint8) to save bandwidth.
+    transitions_image_encoding: str = "raw"
+    transitions_jpeg_quality: int = 90
 
 
 @dataclass
@@ -145,6 +153,15 @@ class SACConfig(PreTrainedConfig):
     offline_buffer_capacity: int = 100000
     # Whether to use asynchronous prefetching for the buffers
     async_prefetch: bool = False
+    # Whether to sample the online replay buffer proportionally to the TD errors (prioritized experience replay)
+    prioritized_replay: bool = False
+    # Prioritization exponent (0 for uniform sampling) and importance-sampling correction exponent
+    prioritized_replay_alpha: float = 0.6
+    prioritized_replay_beta: float = 0.4
+    # How the buffers store the images: "float", "uint8" (4x less memory) or "jpeg" (compressed, on CPU)
+    buffer_image_storage: str = "float"
+    # JPEG quality of the stored images, with `buffer_image_storage="jpeg"`
+    buffer_jpeg_quality: int = 90
     # Number of steps before learning starts
     online_step_before_learning: int = 100
     # Frequency of policy updates
@@ -169,7 +169,7 @@ class SACPolicy(
             done: Tensor = batch["done"]
             next_observation_features: Tensor = batch.get("next_observation_feature")
 
-            loss_critic = self.compute_loss_critic(
+            loss_critic, td_error = self.compute_loss_critic(
                 observations=observations,
                 actions=actions,
                 rewards=rewards,
@@ -177,9 +177,11 @@ class SACPolicy(
                 done=done,
                 observation_features=observation_features,
                 next_observation_features=next_observation_features,
+                weights=batch.get("weights"),
+                return_td_error=True,
             )
 
-            return {"loss_critic": loss_critic}
+            return {"loss_critic": loss_critic, "td_error": td_error}
 
         if model == "discrete_critic" and self.config.num_discrete_actions is not None:
             # Extract critic-specific components
@@ -251,7 +253,14 @@ class SACPolicy(
         done,
         observation_features: Tensor | None = None,
         next_observation_features: Tensor | None = None,
-    ) -> Tensor:
+        weights: Tensor | None = None,
+        return_td_error: bool = False,
+    ) -> Tensor | tuple[Tensor, Tensor]:
+        """Compute the TD loss of the critic ensemble.
+
+        `weights` are per-sample loss weights (e.g. importance-sampling weights of a prioritized replay buffer).
+        With `return_td_error`, also return the per-sample absolute TD errors, averaged over the critics.
+        """
         with torch.no_grad():
             next_action_preds, next_log_probs, _ = self.actor(next_observations, next_observation_features)
 
@@ -293,14 +302,17 @@ class SACPolicy(
         # 4- Calculate loss
         # Compute state-action value loss (TD loss) for all of the Q functions in the ensemble.
         td_target_duplicate = einops.repeat(td_target, "b -> e b", e=q_preds.shape[0])
+        td_losses = F.mse_loss(
+            input=q_preds,
+            target=td_target_duplicate,
+            reduction="none",
+        )
+        if weights is not None:
+            td_losses = td_losses * weights
         # You compute the mean loss of the batch for each critic and then to compute the final loss you sum them up
-        critics_loss = (
-            F.mse_loss(
-                input=q_preds,
-                target=td_target_duplicate,
-                reduction="none",
-            ).mean(dim=1)
-        ).sum()
+        critics_loss = td_losses.mean(dim=1).sum()
+        if return_td_error:
+            return critics_loss, (q_preds.detach() - td_target_duplicate).abs().mean(dim=0)
         return critics_loss
 
     def compute_loss_discrete_critic(
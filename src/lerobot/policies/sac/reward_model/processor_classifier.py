@@ -22,6 +22,7 @@ from lerobot.policies.sac.reward_model.configuration_classifier import RewardCla
 from lerobot.processor import (
     DeviceProcessorStep,
     IdentityProcessorStep,
+    ImageToFloatProcessorStep,
     NormalizerProcessorStep,
     PolicyAction,
     PolicyProcessorPipeline,
@@ -58,13 +59,14 @@ def make_classifier_processor(
     """
 
     input_steps = [
+        DeviceProcessorStep(device=config.device),
+        ImageToFloatProcessorStep(),
         NormalizerProcessorStep(
             features=config.input_features, norm_map=config.normalization_mapping, stats=dataset_stats
         ),
         NormalizerProcessorStep(
             features=config.output_features, norm_map=config.normalization_mapping, stats=dataset_stats
         ),
-        DeviceProcessorStep(device=config.device),
     ]
     output_steps = [DeviceProcessorStep(device="cpu"), IdentityProcessorStep()]
 
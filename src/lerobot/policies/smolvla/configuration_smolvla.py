@@ -63,9 +63,17 @@ class SmolVLAConfig(PreTrainedConfig):
 
     # Decoding
     num_steps: int = 10
+    # Run the denoising loop as a single graph compiled with `torch.compile(mode="reduce-overhead")`, which is
+    # captured as a CUDA graph on GPU. Inference batch size and `num_steps` should stay fixed, since any change
+    # triggers a recompilation.
+    static_inference: bool = False
+    # Temporal ensembling of the chunks predicted at every step (see `lerobot.policies.utils.TemporalEnsembler`).
+    # None disables it, otherwise `n_action_steps` must be 1.
+    temporal_ensemble_coeff: float | None = None
 
     # Attention utils
     use_cache: bool = True
+    attention_implementation: str = "eager"  # "eager", or "sdpa" for `F.scaled_dot_product_attention` kernels
 
     # Finetuning settings
     freeze_vision_encoder: bool = True
@@ -111,6 +119,13 @@ class SmolVLAConfig(PreTrainedConfig):
                 f"The chunk size is the upper bound for the number of action steps per model invocation. Got "
                 f"{self.n_action_steps} for `n_action_steps` and {self.chunk_size} for `chunk_size`."
             )
+        if self.attention_implementation not in ["eager", "sdpa"]:
+            raise ValueError(f"Invalid attention_implementation: {self.attention_implementation}")
+        if self.temporal_ensemble_coeff is not None and self.n_action_steps > 1:
+            raise NotImplementedError(
+                "`n_action_steps` must be 1 when using temporal ensembling. This is "
+                "because the policy needs to be queried every step to compute the ensembled action."
+            )
         if self.use_delta_joint_actions_aloha:
             raise NotImplementedError(
                 "`use_delta_joint_actions_aloha` is used by smolvla for aloha real models. It is not ported yet in LeRobot."
@@ -63,6 +63,7 @@ from lerobot.policies.pretrained import PreTrainedPolicy
 from lerobot.policies.smolvla.configuration_smolvla import SmolVLAConfig
 from lerobot.policies.smolvla.smolvlm_with_expert import SmolVLMWithExpertModel
 from lerobot.policies.utils import (
+    TemporalEnsembler,
     populate_queues,
 )
 from lerobot.utils.constants import ACTION, OBS_LANGUAGE_ATTENTION_MASK, OBS_LANGUAGE_TOKENS, OBS_STATE
@@ -218,6 +219,7 @@ class SmolVLAPolicy(PreTrainedPolicy):
 
     config_class = SmolVLAConfig
     name = "smolvla"
+    supports_chunk_prefetch = True
 
     def __init__(
         self,
@@ -234,13 +236,20 @@ class SmolVLAPolicy(PreTrainedPolicy):
         self.config = config
 
         self.model = VLAFlowMatching(config)
+
+        if config.temporal_ensemble_coeff is not None:
+            self.temporal_ensembler = TemporalEnsembler(config.temporal_ensemble_coeff, config.chunk_size)
+
         self.reset()
 
     def reset(self):
         """This should be called whenever the environment is reset."""
+        self._reset_prefetch()
         self._queues = {
             ACTION: deque(maxlen=self.config.n_action_steps),
         }
+        if self.config.temporal_ensemble_coeff is not None:
+            self.temporal_ensembler.reset()
 
     def get_optim_params(self) -> dict:
         return self.parameters()
@@ -299,6 +308,10 @@ class SmolVLAPolicy(PreTrainedPolicy):
         batch = self._prepare_batch(batch)
         self._queues = populate_queues(self._queues, batch, exclude_keys=[ACTION])
 
+        if self.config.temporal_ensemble_coeff is not None:
+            actions = self._get_action_chunk(batch, noise)
+            return self.temporal_ensembler.update(actions)
+
         # Action queue logic for n_action_steps > 1. When the action_queue is depleted, populate it by
         # querying the policy.
         if len(self._queues[ACTION]) == 0:
@@ -486,6 +499,7 @@ class VLAFlowMatching(nn.Module):
             self_attn_every_n_layers=self.config.self_attn_every_n_layers,
             expert_width_multiplier=self.config.expert_width_multiplier,
             device=self.config.device,
+            attention_implementation=self.config.attention_implementation,
         )
         self.state_proj = nn.Linear(
             self.config.max_state_dim, self.vlm_with_expert.config.text_config.hidden_size
@@ -511,6 +525,9 @@ class VLAFlowMatching(nn.Module):
         self.image_end_token = torch.tensor([self.fake_image_token], dtype=torch.long)
         self.prefix_length = self.config.prefix_length
 
+        # Compiled denoising loop of the static inference mode, created on first use
+        self._static_denoise_loop = None
+
     def set_requires_grad(self):
         for params in self.state_proj.parameters():
             params.requires_grad = self.config.train_state_proj
@@ -625,16 +642,20 @@ class VLAFlowMatching(nn.Module):
 
         return embs, pad_masks, att_masks
 
+    def _suffix_masks(self, bsize, device):
+        """Padding and attention masks of the suffix (action) tokens, independent of their values."""
+        pad_masks = torch.ones(bsize, self.config.chunk_size, dtype=torch.bool, device=device)
+        # Set attention masks so that image, language and state inputs do not attend to action tokens
+        att_masks = torch.ones(bsize, self.config.chunk_size, dtype=torch.bool, device=device)
+        return pad_masks, att_masks
+
     def embed_suffix(self, noisy_actions, timestep):
         """Embed state, noisy_actions, timestep to prepare for Expert Gemma processing."""
         embs = []
-        pad_masks = []
-        att_masks = []
 
         # Fuse timestep + action information using an MLP
         action_emb = self.action_in_proj(noisy_actions)
         device = action_emb.device
-        bsize = action_emb.shape[0]
         dtype = action_emb.dtype
         # Embed timestep using sine-cosine positional encoding with sensitivity in the range [0, 1]
         time_emb = create_sinusoidal_pos_embedding(
@@ -655,17 +676,8 @@ class VLAFlowMatching(nn.Module):
 
         # Add to input tokens
         embs.append(action_time_emb)
-
-        bsize, action_time_dim = action_time_emb.shape[:2]
-        action_time_mask = torch.ones(bsize, action_time_dim, dtype=torch.bool, device=device)
-        pad_masks.append(action_time_mask)
-
-        # Set attention masks so that image, language and state inputs do not attend to action tokens
-        att_masks += [1] * self.config.chunk_size
         embs = torch.cat(embs, dim=1)
-        pad_masks = torch.cat(pad_masks, dim=1)
-        att_masks = torch.tensor(att_masks, dtype=embs.dtype, device=embs.device)
-        att_masks = att_masks[None, :].expand(bsize, len(att_masks))
+        pad_masks, att_masks = self._suffix_masks(embs.shape[0], device)
         return embs, pad_masks, att_masks
 
     def forward(
@@ -706,15 +718,11 @@ class VLAFlowMatching(nn.Module):
         losses = F.mse_loss(u_t, v_t, reduction="none")
         return losses
 
-    def sample_actions(self, images, img_masks, lang_tokens, lang_masks, state, noise=None) -> Tensor:
-        """Do a full inference forward and compute the action (batch_size x num_steps x num_motors)"""
-        bsize = state.shape[0]
-        device = state.device
-
-        if noise is None:
-            actions_shape = (bsize, self.config.chunk_size, self.config.max_action_dim)
-            noise = self.sample_noise(actions_shape, device)
+    def compute_prefix_cache(self, images, img_masks, lang_tokens, lang_masks, state):
+        """Run the prefix (images, language tokens and state) through the VLM once.
 
+        Returns the prefix padding masks and the KV cache that every denoising step attends to.
+        """
         prefix_embs, prefix_pad_masks, prefix_att_masks = self.embed_prefix(
             images, img_masks, lang_tokens, lang_masks, state=state
         )
@@ -729,6 +737,37 @@ class VLAFlowMatching(nn.Module):
             use_cache=self.config.use_cache,
             fill_kv_cache=True,
         )
+        return prefix_pad_masks, past_key_values
+
+    def sample_actions(
+        self, images, img_masks, lang_tokens, lang_masks, state, noise=None, prefix_cache=None
+    ) -> Tensor:
+        """Do a full inference forward and compute the action (batch_size x num_steps x num_motors)
+
+        `prefix_cache` is an output of `compute_prefix_cache` to reuse. It is computed from the inputs if None.
+        """
+        bsize = state.shape[0]
+        device = state.device
+
+        if noise is None:
+            actions_shape = (bsize, self.config.chunk_size, self.config.max_action_dim)
+            noise = self.sample_noise(actions_shape, device)
+
+        if prefix_cache is None:
+            prefix_cache = self.compute_prefix_cache(images, img_masks, lang_tokens, lang_masks, state)
+        prefix_pad_masks, past_key_values = prefix_cache
+        suffix_attention = self.prepare_suffix_attention(prefix_pad_masks)
+
+        if self.config.static_inference:
+            if self._static_denoise_loop is None:
+                self._static_denoise_loop = torch.compile(self.denoise_loop, mode="reduce-overhead")
+            # Mark a new CUDA graph replay, and copy the output out of the graph's static memory which the next
+            # replay overwrites
+            torch.compiler.cudagraph_mark_step_begin()
+            return self._static_denoise_loop(
+                prefix_pad_masks, past_key_values, noise, self.config.num_steps, suffix_attention
+            ).clone()
+
         dt = -1.0 / self.config.num_steps
         dt = torch.tensor(dt, dtype=torch.float32, device=device)
 
@@ -741,25 +780,47 @@ class VLAFlowMatching(nn.Module):
                 past_key_values,
                 x_t,
                 expanded_time,
+                suffix_attention=suffix_attention,
             )
             # Euler step
             x_t += dt * v_t
             time += dt
         return x_t
 
-    def denoise_step(
-        self,
-        prefix_pad_masks,
-        past_key_values,
-        x_t,
-        timestep,
-    ):
-        """Apply one denoising step of the noise `x_t` at a given timestep."""
-        suffix_embs, suffix_pad_masks, suffix_att_masks = self.embed_suffix(x_t, timestep)
+    def denoise_loop(self, prefix_pad_masks, past_key_values, noise, num_steps, suffix_attention):
+        """Integrate the flow from the noise at time 1 to the actions at time 0, in `num_steps` Euler steps.
+
+        Same computation as the loop of `sample_actions`, but with a fixed number of iterations and no
+        data-dependent stopping condition, so that `torch.compile` captures the whole loop as a single graph (and
+        a single CUDA graph with the "reduce-overhead" mode).
+        """
+        bsize = noise.shape[0]
+        dt = torch.tensor(-1.0 / num_steps, dtype=torch.float32, device=noise.device)
 
+        x_t = noise
+        time = torch.tensor(1.0, dtype=torch.float32, device=noise.device)
+        for _ in range(num_steps):
+            v_t = self.denoise_step(
+                prefix_pad_masks,
+                past_key_values,
+                x_t,
+                time.expand(bsize),
+                suffix_attention=suffix_attention,
+            )
+            # Euler step
+            x_t = x_t + dt * v_t
+            time = time + dt
+        return x_t
+
+    def prepare_suffix_attention(self, prefix_pad_masks):
+        """Build the attention mask and position ids of the suffix tokens attending to the cached prefix.
+
+        They only depend on the prefix padding, so `sample_actions` builds them once per action chunk and shares
+        them between all the denoising steps.
+        """
+        batch_size, prefix_len = prefix_pad_masks.shape
+        suffix_pad_masks, suffix_att_masks = self._suffix_masks(batch_size, prefix_pad_masks.device)
         suffix_len = suffix_pad_masks.shape[1]
-        batch_size = prefix_pad_masks.shape[0]
-        prefix_len = prefix_pad_masks.shape[1]
         prefix_pad_2d_masks = prefix_pad_masks[:, None, :].expand(batch_size, suffix_len, prefix_len)
 
         suffix_att_2d_masks = make_att_2d_masks(suffix_pad_masks, suffix_att_masks)
@@ -767,6 +828,25 @@ class VLAFlowMatching(nn.Module):
         full_att_2d_masks = torch.cat([prefix_pad_2d_masks, suffix_att_2d_masks], dim=2)
         prefix_offsets = torch.sum(prefix_pad_masks, dim=-1)[:, None]
         position_ids = prefix_offsets + torch.cumsum(suffix_pad_masks, dim=1) - 1
+        return full_att_2d_masks, position_ids
+
+    def denoise_step(
+        self,
+        prefix_pad_masks,
+        past_key_values,
+        x_t,
+        timestep,
+        suffix_attention=None,
+    ):
+        """Apply one denoising step of the noise `x_t` at a given timestep.
+
+        `suffix_attention` is the output of `prepare_suffix_attention`. It is built from `prefix_pad_masks` if None.
+        """
+        suffix_embs, _, _ = self.embed_suffix(x_t, timestep)
+
+        if suffix_attention is None:
+            suffix_attention = self.prepare_suffix_attention(prefix_pad_masks)
+        full_att_2d_masks, position_ids = suffix_attention
 
         outputs_embeds, _ = self.vlm_with_expert.forward(
             attention_mask=full_att_2d_masks,
@@ -71,6 +71,7 @@ class SmolVLMWithExpertModel(nn.Module):
         self_attn_every_n_layers: int = -1,
         expert_width_multiplier: float = 0.5,
         device: str = "auto",
+        attention_implementation: str = "eager",
     ):
         super().__init__()
         if load_vlm_weights:
@@ -130,6 +131,7 @@ class SmolVLMWithExpertModel(nn.Module):
         self.freeze_vision_encoder = freeze_vision_encoder
         self.train_expert_only = train_expert_only
         self.attention_mode = attention_mode
+        self.attention_implementation = attention_implementation
         self.expert_hidden_size = lm_expert_config.hidden_size
         self.set_requires_grad()
 
@@ -499,9 +501,36 @@ class SmolVLMWithExpertModel(nn.Module):
         return outputs_embeds, past_key_values
 
     def get_attention_interface(self):
+        if self.attention_implementation == "sdpa":
+            return self.sdpa_attention_forward
         attention_interface = self.eager_attention_forward
         return attention_interface
 
+    def sdpa_attention_forward(
+        self, attention_mask, batch_size, head_dim, query_states, key_states, value_states
+    ):
+        """Same as `eager_attention_forward`, with the fused `F.scaled_dot_product_attention` kernels."""
+        num_key_value_groups = self.num_attention_heads // self.num_key_value_heads
+
+        # B,L,H,D -> B,H,L,D
+        query_states = query_states.to(dtype=value_states.dtype).transpose(1, 2)
+        key_states = key_states.to(dtype=value_states.dtype).transpose(1, 2)
+        value_states = value_states.transpose(1, 2)
+        key_states = key_states.repeat_interleave(num_key_value_groups, dim=1)
+        value_states = value_states.repeat_interleave(num_key_value_groups, dim=1)
+
+        # An additive mask (rather than a boolean one) keeps fully masked padding rows finite, like the eager
+        # attention does.
+        big_neg = torch.finfo(query_states.dtype).min / 2
+        attn_mask = torch.where(attention_mask[:, None, :, :], 0.0, big_neg).to(dtype=query_states.dtype)
+
+        att_output = nn.functional.scaled_dot_product_attention(
+            query_states, key_states, value_states, attn_mask=attn_mask, scale=head_dim**-0.5
+        )
+
+        att_output = att_output.transpose(1, 2)
+        return att_output.reshape(batch_size, -1, self.num_attention_heads * head_dim)
+
     def eager_attention_forward(
         self, attention_mask, batch_size, head_dim, query_states, key_states, value_states
     ):
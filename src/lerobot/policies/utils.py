@@ -20,7 +20,7 @@ from typing import Any
 
 import numpy as np
 import torch
-from torch import nn
+from torch import Tensor, nn
 
 from lerobot.configs.policies import PreTrainedConfig
 from lerobot.configs.types import FeatureType, PolicyFeature
@@ -49,6 +49,108 @@ def populate_queues(
     return queues
 
 
+class TemporalEnsembler:
+    def __init__(self, temporal_ensemble_coeff: float, chunk_size: int) -> None:
+        """Temporal ensembling as described in Algorithm 2 of https://huggingface.co/papers/2304.13705.
+
+        The policy predicts a chunk of `chunk_size` actions at every step, and the action executed at a given
+        step is the weighted average of all the actions predicted for it so far. The weights are calculated as
+        wᵢ = exp(-temporal_ensemble_coeff * i) where w₀ is the oldest action. They are then normalized to sum
+        to 1 by dividing by Σwᵢ. Here's some intuition around how the coefficient works:
+            - Setting it to 0 uniformly weighs all actions.
+            - Setting it positive gives more weight to older actions.
+            - Setting it negative gives more weight to newer actions.
+        NOTE: The default value for `temporal_ensemble_coeff` used by the original ACT work is 0.01. This
+        results in older actions being weighed more highly than newer actions (the experiments documented in
+        https://github.com/huggingface/lerobot/pull/319 hint at why highly weighing new actions might be
+        detrimental: doing so aggressively may diminish the benefits of action chunking).
+
+        Rather than caching a history of actions, the weighted sums of the actions predicted for the next
+        `chunk_size` steps are accumulated online in a (batch_size, chunk_size, action_dim) ring buffer, which
+        is allocated once and updated in place. Since an action is predicted at every step, the action predicted
+        at index i of a chunk is always the (min(n, chunk_size - 1 - i))-th prediction of its step, n being the
+        number of previous updates. The weights of each update are therefore precomputed, and only the sums
+        need to be kept. For a simple 1D sequence, the weighted average looks something like:
+
+        ```
+        import torch
+
+        seq = torch.linspace(8, 8.5, 100)
+        print(seq)
+
+        m = 0.01
+        exp_weights = torch.exp(-m * torch.arange(len(seq)))
+        print(exp_weights)
+
+        # Calculate offline
+        avg = (exp_weights * seq).sum() / exp_weights.sum()
+        print("offline", avg)
+
+        # Calculate online
+        weighted_sum = 0
+        for i, item in enumerate(seq):
+            weighted_sum += item * exp_weights[i]
+        print("online", weighted_sum / exp_weights.sum())
+        ```
+        """
+        self.chunk_size = chunk_size
+        ensemble_weights = torch.exp(-temporal_ensemble_coeff * torch.arange(chunk_size, dtype=torch.float64))
+        ensemble_weights_cumsum = torch.cumsum(ensemble_weights, dim=0)
+        # Row n holds the weights of the actions of the chunk predicted after n previous updates (n is
+        # clamped to chunk_size - 1, after which all the weights stay the same).
+        num_previous = torch.minimum(
+            torch.arange(chunk_size)[:, None], chunk_size - 1 - torch.arange(chunk_size)
+        )
+        self.update_weights = ensemble_weights[num_previous].float()
+        # Normalizer of the action consumed at update n, which was predicted min(n, chunk_size - 1) + 1 times.
+        self.normalizers = ensemble_weights_cumsum.tolist()
+
+        self.weighted_sums = None
+        self.reset()
+
+    def reset(self):
+        """Resets the online computation variables."""
+        # Index of the ring buffer slot holding the weighted sum of the next action to consume.
+        self.head = 0
+        self.num_updates = 0
+
+    def _maybe_allocate(self, actions: Tensor) -> None:
+        """Allocates the ring buffer (and moves the weights) the first time, or if the batch shape changes."""
+        if (
+            self.weighted_sums is None
+            or self.weighted_sums.shape != actions.shape
+            or self.weighted_sums.device != actions.device
+        ):
+            self.weighted_sums = torch.zeros(actions.shape, dtype=torch.float32, device=actions.device)
+            self.update_weights = self.update_weights.to(actions.device)
+            self.num_updates = 0
+
+        if self.num_updates == 0:
+            self.weighted_sums.zero_()
+            self.head = 0
+
+    def update(self, actions: Tensor) -> Tensor:
+        """
+        Takes a (batch, chunk_size, action_dim) sequence of actions, update the temporal ensemble for all
+        time steps, and pop/return the next batch of actions in the sequence.
+        """
+        self._maybe_allocate(actions)
+
+        row = min(self.num_updates, self.chunk_size - 1)
+        weights = self.update_weights[row, :, None]
+        # The chunk's first action is for the step of the head slot, the following ones wrap around the buffer.
+        num_tail = self.chunk_size - self.head
+        self.weighted_sums[:, self.head :].addcmul_(actions[:, :num_tail], weights[:num_tail])
+        self.weighted_sums[:, : self.head].addcmul_(actions[:, num_tail:], weights[num_tail:])
+
+        # "Consume" the first action, freeing its slot for the last step of the next chunk.
+        action = (self.weighted_sums[:, self.head] / self.normalizers[row]).to(actions.dtype)
+        self.weighted_sums[:, self.head].zero_()
+        self.head = (self.head + 1) % self.chunk_size
+        self.num_updates += 1
+        return action
+
+
 def get_device_from_parameters(module: nn.Module) -> torch.device:
     """Get a module's device by checking one of its parameters.
 
@@ -29,7 +29,7 @@ from .core import (
     TransitionKey,
 )
 from .delta_action_processor import MapDeltaActionToRobotActionStep, MapTensorToDeltaActionDictStep
-from .device_processor import DeviceProcessorStep
+from .device_processor import DeviceProcessorStep, ImageToFloatProcessorStep
 from .factory import (
     make_default_processors,
     make_default_robot_action_processor,
@@ -92,6 +92,7 @@ __all__ = [
     "hotswap_stats",
     "IdentityProcessorStep",
     "ImageCropResizeProcessorStep",
+    "ImageToFloatProcessorStep",
     "InfoProcessorStep",
     "InterventionActionProcessorStep",
     "JointVelocityProcessorStep",
@@ -15,8 +15,8 @@
 # limitations under the License.
 
 """
-This script defines a processor step for moving environment transition data to a specific torch device and casting
-its floating-point precision.
+This script defines processor steps for moving environment transition data to a specific torch device, casting
+its floating-point precision, and converting uint8 images to floating point once on the device.
 """
 
 from dataclasses import dataclass
@@ -25,10 +25,11 @@ from typing import Any
 import torch
 
 from lerobot.configs.types import PipelineFeatureType, PolicyFeature
+from lerobot.utils.constants import OBS_IMAGE
 from lerobot.utils.utils import get_safe_torch_device
 
 from .core import EnvTransition, PolicyAction, TransitionKey
-from .pipeline import ProcessorStep, ProcessorStepRegistry
+from .pipeline import ObservationProcessorStep, ProcessorStep, ProcessorStepRegistry
 
 
 @ProcessorStepRegistry.register("device_processor")
@@ -192,3 +193,43 @@ class DeviceProcessorStep(ProcessorStep):
             The original dictionary of policy features.
         """
         return features
+
+
+@ProcessorStepRegistry.register("image_to_float_processor")
+@dataclass
+class ImageToFloatProcessorStep(ObservationProcessorStep):
+    """
+    Processor step converting uint8 images of the observation to floating point in the [0, 1] range.
+
+    Datasets can return video frames as uint8 (see `LeRobotDataset(return_uint8_frames=True)`) to cut the
+    volume of data moved between DataLoader workers and to the GPU by 4x. Placed right after a
+    `DeviceProcessorStep`, this step performs the conversion on the target device. It must run before any
+    `NormalizerProcessorStep`, which would otherwise cast its statistics to uint8. Images that are already
+    floating point are left untouched, so the step is a no-op for float inputs.
+
+    Attributes:
+        float_dtype: The target floating-point dtype as a string (e.g., "float32", "bfloat16").
+    """
+
+    float_dtype: str = "float32"
+
+    def __post_init__(self):
+        if self.float_dtype not in DeviceProcessorStep.DTYPE_MAPPING:
+            raise ValueError(
+                f"Invalid float_dtype '{self.float_dtype}'. Available options: {list(DeviceProcessorStep.DTYPE_MAPPING.keys())}"
+            )
+        self._target_float_dtype = DeviceProcessorStep.DTYPE_MAPPING[self.float_dtype]
+
+    def observation(self, observation: dict[str, Any]) -> dict[str, Any]:
+        for key, value in observation.items():
+            if key.startswith(OBS_IMAGE) and isinstance(value, torch.Tensor) and value.dtype == torch.uint8:
+                observation[key] = value.to(dtype=self._target_float_dtype) / 255
+        return observation
+
+    def get_config(self) -> dict[str, Any]:
+        return {"float_dtype": self.float_dtype}
+
+    def transform_features(
+        self, features: dict[PipelineFeatureType, dict[str, PolicyFeature]]
+    ) -> dict[PipelineFeatureType, dict[str, PolicyFeature]]:
+        return features
@@ -63,30 +63,29 @@ from lerobot.configs.train import TrainRLServerPipelineConfig
 from lerobot.policies.factory import make_policy
 from lerobot.policies.sac.modeling_sac import SACPolicy
 from lerobot.processor import TransitionKey
+from lerobot.rl.buffer import stack_transitions
+from lerobot.rl.parameter_sync import ParameterSyncReceiver, skip_superseded_updates
 from lerobot.rl.process import ProcessSignalHandler
-from lerobot.rl.queue import get_last_item_from_queue
+from lerobot.rl.queue import get_all_items_from_queue
 from lerobot.robots import so100_follower  # noqa: F401
 from lerobot.teleoperators import gamepad, so101_leader  # noqa: F401
 from lerobot.teleoperators.utils import TeleopEvents
 from lerobot.transport import services_pb2, services_pb2_grpc
 from lerobot.transport.utils import (
-    bytes_to_state_dict,
+    batch_transition_to_bytes,
     grpc_channel_options,
     python_object_to_bytes,
     receive_bytes_in_chunks,
     send_bytes_in_chunks,
-    transitions_to_bytes,
 )
 from lerobot.utils.random_utils import set_seed
 from lerobot.utils.robot_utils import busy_wait
 from lerobot.utils.transition import (
     Transition,
-    move_state_dict_to_device,
     move_transition_to_device,
 )
 from lerobot.utils.utils import (
     TimerManager,
-    get_safe_torch_device,
     init_logging,
 )
 
@@ -241,7 +240,6 @@ def act_with_policy(
     env_processor, action_processor = make_processors(online_env, teleop_device, cfg.env, cfg.policy.device)
 
     set_seed(cfg.seed)
-    device = get_safe_torch_device(cfg.policy.device, log=True)
 
     torch.backends.cudnn.benchmark = True
     torch.backends.cuda.matmul.allow_tf32 = True
@@ -257,6 +255,7 @@ def act_with_policy(
     )
     policy = policy.eval()
     assert isinstance(policy, nn.Module)
+    parameter_sync = ParameterSyncReceiver()
 
     obs, info = online_env.reset()
     env_processor.reset()
@@ -351,12 +350,16 @@ def act_with_policy(
         if done or truncated:
             logging.info(f"[ACTOR] Global step {interaction_step}: Episode reward: {sum_reward_episode}")
 
-            update_policy_parameters(policy=policy, parameters_queue=parameters_queue, device=device)
+            update_policy_parameters(
+                policy=policy, parameters_queue=parameters_queue, parameter_sync=parameter_sync
+            )
 
             if len(list_transition_to_send_to_learner) > 0:
                 push_transitions_to_transport_queue(
                     transitions=list_transition_to_send_to_learner,
                     transitions_queue=transitions_queue,
+                    image_encoding=cfg.policy.actor_learner_config.transitions_image_encoding,
+                    jpeg_quality=cfg.policy.actor_learner_config.transitions_jpeg_quality,
                 )
                 list_transition_to_send_to_learner = []
 
@@ -376,6 +379,8 @@ def act_with_policy(
                         "Interaction step": interaction_step,
                         "Episode intervention": int(episode_intervention),
                         "Intervention rate": intervention_rate,
+                        "Parameters version": parameter_sync.version,
+                        "Parameters staleness [s]": parameter_sync.staleness,
                         **stats,
                     }
                 )
@@ -649,56 +654,54 @@ def interactions_stream(
 #  Policy functions
 
 
-def update_policy_parameters(policy: SACPolicy, parameters_queue: Queue, device):
-    bytes_state_dict = get_last_item_from_queue(parameters_queue, block=False)
-    if bytes_state_dict is not None:
-        logging.info("[ACTOR] Load new parameters from Learner.")
-        state_dicts = bytes_to_state_dict(bytes_state_dict)
-
-        # TODO: check encoder parameter synchronization possible issues:
-        # 1. When shared_encoder=True, we're loading stale encoder params from actor's state_dict
-        #    instead of the updated encoder params from critic (which is optimized separately)
-        # 2. When freeze_vision_encoder=True, we waste bandwidth sending/loading frozen params
-        # 3. Need to handle encoder params correctly for both actor and discrete_critic
-        # Potential fixes:
-        # - Send critic's encoder state when shared_encoder=True
-        # - Skip encoder params entirely when freeze_vision_encoder=True
-        # - Ensure discrete_critic gets correct encoder state (currently uses encoder_critic)
-
-        # Load actor state dict
-        actor_state_dict = move_state_dict_to_device(state_dicts["policy"], device=device)
-        policy.actor.load_state_dict(actor_state_dict)
-
-        # Load discrete critic if present
-        if hasattr(policy, "discrete_critic") and "discrete_critic" in state_dicts:
-            discrete_critic_state_dict = move_state_dict_to_device(
-                state_dicts["discrete_critic"], device=device
-            )
-            policy.discrete_critic.load_state_dict(discrete_critic_state_dict)
-            logging.info("[ACTOR] Loaded discrete critic parameters from Learner.")
+def update_policy_parameters(
+    policy: SACPolicy, parameters_queue: Queue, parameter_sync: ParameterSyncReceiver
+):
+    # Parameter deltas only apply on top of the previous version, so all the updates are applied in order
+    buffers = skip_superseded_updates(get_all_items_from_queue(parameters_queue, block=False))
+    if len(buffers) == 0:
+        return
+
+    # TODO: check encoder parameter synchronization possible issues:
+    # 1. When shared_encoder=True, we're loading stale encoder params from actor's state_dict
+    #    instead of the updated encoder params from critic (which is optimized separately)
+    # 2. Need to handle encoder params correctly for both actor and discrete_critic
+    # Potential fixes:
+    # - Send critic's encoder state when shared_encoder=True
+    # - Ensure discrete_critic gets correct encoder state (currently uses encoder_critic)
+    modules = {"policy": policy.actor}
+    if hasattr(policy, "discrete_critic") and policy.discrete_critic is not None:
+        modules["discrete_critic"] = policy.discrete_critic
+
+    for buffer in buffers:
+        if parameter_sync.apply(buffer, modules):
+            logging.info(f"[ACTOR] Loaded parameters version {parameter_sync.version} from Learner.")
 
 
 #  Utilities functions
 
 
-def push_transitions_to_transport_queue(transitions: list, transitions_queue):
-    """Send transitions to learner in smaller chunks to avoid network issues.
+def push_transitions_to_transport_queue(
+    transitions: list, transitions_queue, image_encoding: str = "raw", jpeg_quality: int = 90
+):
+    """Send transitions to learner as one columnar batch (one stacked tensor per key).
 
     Args:
         transitions: List of transitions to send
-        message_queue: Queue to send messages to learner
-        chunk_size: Size of each chunk to send
+        transitions_queue: Queue to send messages to learner
+        image_encoding: "raw", or "jpeg" to JPEG-compress the images
+        jpeg_quality: JPEG quality, between 0 and 100
     """
-    transition_to_send_to_learner = []
-    for transition in transitions:
-        tr = move_transition_to_device(transition=transition, device="cpu")
-        for key, value in tr["state"].items():
-            if torch.isnan(value).any():
-                logging.warning(f"Found NaN values in transition {key}")
-
-        transition_to_send_to_learner.append(tr)
+    batch = stack_transitions(
+        [move_transition_to_device(transition=transition, device="cpu") for transition in transitions]
+    )
+    for key, value in batch["state"].items():
+        if torch.isnan(value).any():
+            logging.warning(f"Found NaN values in transition {key}")
 
-    transitions_queue.put(transitions_to_bytes(transition_to_send_to_learner))
+    transitions_queue.put(
+        batch_transition_to_bytes(batch, image_encoding=image_encoding, jpeg_quality=jpeg_quality)
+    )
 
 
 def get_frequency_stats(timer: TimerManager) -> dict[str, float]:
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark the throughput (batches/s) of the `ReplayBuffer` iterators feeding the learner.
+
+Fills a CPU-stored replay buffer with transitions of `--num-cameras` cameras, then iterates over it with the
+synchronous iterator, the async iterator copying the batches from the producer thread, and the async iterator
+copying them through pinned memory on a dedicated CUDA stream (`PinnedMemoryPrefetcher`). For each batch, the
+consumer runs `--compute-steps` matrix multiplications on the device, standing for the learner's optimization
+step, so that the copies can overlap with them.
+
+Example:
+
+```shell
+python -m lerobot.rl.benchmark_buffer_iterator --batch-size 256 --num-cameras 2 --height 128 --width 128
+```
+"""
+
+import argparse
+import time
+
+import torch
+
+from lerobot.rl.buffer import IMAGE_STORAGE_MODES, ReplayBuffer
+from lerobot.utils.constants import OBS_IMAGE, OBS_STATE
+
+
+def fill(
+    buffer: ReplayBuffer,
+    num_transitions: int,
+    image_keys: list[str],
+    args: argparse.Namespace,
+    block_size: int = 1000,
+):
+    for start in range(0, num_transitions, block_size):
+        n = min(block_size, num_transitions - start)
+        state = {key: torch.rand(n, 3, args.height, args.width) for key in image_keys}
+        state[OBS_STATE] = torch.randn(n, args.state_dim)
+        buffer.add_batch(
+            state=state,
+            action=torch.randn(n, args.action_dim),
+            reward=torch.randn(n),
+            next_state=state,
+            done=torch.zeros(n, dtype=torch.bool),
+            truncated=torch.zeros(n, dtype=torch.bool),
+        )
+
+
+def batches_per_second(iterator, device: torch.device, num_batches: int, compute_steps: int) -> float:
+    weights = torch.randn(2048, 2048, device=device)
+
+    def consume():
+        batch = next(iterator)
+        # Depend on the batch, as the learner would, then simulate an optimization step
+        output = sum(images.mean() for images in batch["state"].values())
+        for _ in range(compute_steps):
+            output = output + (weights @ weights).mean()
+        return output
+
+    for _ in range(3):  # warmup (torch.compile of the augmentation, pinned buffers allocation)
+        consume()
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+
+    start = time.perf_counter()
+    for _ in range(num_batches):
+        consume()
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+    return num_batches / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--capacity", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--num-cameras", type=int, default=2)
+    parser.add_argument("--height", type=int, default=128)
+    parser.add_argument("--width", type=int, default=128)
+    parser.add_argument("--state-dim", type=int, default=16)
+    parser.add_argument("--action-dim", type=int, default=4)
+    parser.add_argument("--image-storage", type=str, default="uint8", choices=IMAGE_STORAGE_MODES)
+    parser.add_argument("--use-drq", action="store_true", help="Apply the DrQ augmentation to the batches.")
+    parser.add_argument("--compute-steps", type=int, default=4, help="2048x2048 matmuls per consumed batch.")
+    parser.add_argument("--num-batches", type=int, default=200)
+    parser.add_argument("--device", type=str, default="cuda" if torch.cuda.is_available() else "cpu")
+    args = parser.parse_args()
+
+    device = torch.device(args.device)
+    image_keys = [f"{OBS_IMAGE}.camera_{i}" for i in range(args.num_cameras)]
+    buffer = ReplayBuffer(
+        args.capacity,
+        device=args.device,
+        state_keys=[*image_keys, OBS_STATE],
+        use_drq=args.use_drq,
+        storage_device="cpu",
+        optimize_memory=True,
+        image_storage=args.image_storage,
+    )
+    fill(buffer, args.capacity, image_keys, args)
+
+    iterators = {
+        "sync": {"async_prefetch": False},
+        "async": {"async_prefetch": True, "pin_memory": False},
+    }
+    if device.type == "cuda":
+        iterators["async pinned"] = {"async_prefetch": True, "pin_memory": True}
+
+    print(
+        f"Batch size {args.batch_size}, {args.num_cameras} camera(s) of {args.height}x{args.width}, "
+        f"{args.image_storage} images, device {args.device}"
+    )
+    print(f"{'iterator':<16}{'batches/s':>12}")
+    for name, kwargs in iterators.items():
+        iterator = buffer.get_iterator(batch_size=args.batch_size, queue_size=2, **kwargs)
+        throughput = batches_per_second(iterator, device, args.num_batches, args.compute_steps)
+        iterator.close()
+        print(f"{name:<16}{throughput:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
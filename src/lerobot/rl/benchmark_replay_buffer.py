@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark the cost of sampling the uniform and prioritized replay buffers, and of updating the priorities.
+
+Fills a `ReplayBuffer` and a `PrioritizedReplayBuffer` of the given capacity with state-only transitions, then
+measures the time to sample a batch from each, and to update the priorities of a sampled batch.
+
+Example:
+
+```shell
+python -m lerobot.rl.benchmark_replay_buffer --capacity 1000000 --batch-size 256
+```
+"""
+
+import argparse
+import time
+
+import torch
+
+from lerobot.rl.buffer import PrioritizedReplayBuffer, ReplayBuffer
+from lerobot.utils.constants import OBS_STATE
+
+
+def fill(buffer: ReplayBuffer, num_transitions: int, state_dim: int, action_dim: int, block_size: int):
+    for start in range(0, num_transitions, block_size):
+        n = min(block_size, num_transitions - start)
+        buffer.add_batch(
+            state={OBS_STATE: torch.randn(n, state_dim)},
+            action=torch.randn(n, action_dim),
+            reward=torch.randn(n),
+            next_state={OBS_STATE: torch.randn(n, state_dim)},
+            done=torch.zeros(n, dtype=torch.bool),
+            truncated=torch.zeros(n, dtype=torch.bool),
+        )
+
+
+def timed_ms(fn, num_trials: int) -> float:
+    start = time.perf_counter()
+    for _ in range(num_trials):
+        fn()
+    return 1000 * (time.perf_counter() - start) / num_trials
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--capacity", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--state-dim", type=int, default=16)
+    parser.add_argument("--action-dim", type=int, default=4)
+    parser.add_argument("--num-trials", type=int, default=100)
+    args = parser.parse_args()
+
+    buffers = {
+        "uniform": ReplayBuffer(args.capacity, device="cpu", state_keys=[OBS_STATE], use_drq=False),
+        "prioritized": PrioritizedReplayBuffer(
+            args.capacity, device="cpu", state_keys=[OBS_STATE], use_drq=False
+        ),
+    }
+
+    print(f"Capacity {args.capacity}, batch size {args.batch_size}")
+    print(f"{'buffer':<14}{'fill s':>10}{'sample ms':>12}{'update ms':>12}")
+    for name, buffer in buffers.items():
+        start = time.perf_counter()
+        fill(buffer, args.capacity, args.state_dim, args.action_dim, block_size=10_000)
+        fill_s = time.perf_counter() - start
+
+        sample_ms = timed_ms(lambda buffer=buffer: buffer.sample(args.batch_size), args.num_trials)
+
+        update_ms = float("nan")
+        if isinstance(buffer, PrioritizedReplayBuffer):
+            batch = buffer.sample(args.batch_size)
+            update_ms = timed_ms(
+                lambda buffer=buffer, batch=batch: buffer.update_priorities(
+                    batch["indices"], torch.rand(args.batch_size)
+                ),
+                args.num_trials,
+            )
+
+        print(f"{name:<14}{fill_s:>10.2f}{sample_ms:>12.3f}{update_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
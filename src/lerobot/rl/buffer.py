@@ -15,18 +15,25 @@
 # limitations under the License.
 
 import functools
+import threading
 from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 from typing import TypedDict
 
+import numpy as np
 import torch
 import torch.nn.functional as F  # noqa: N812
 from tqdm import tqdm
 
 from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.transport.serialization import decode_jpeg, encode_jpeg
 from lerobot.utils.constants import ACTION, DONE, OBS_IMAGE, REWARD
 from lerobot.utils.transition import Transition
 
+# How the image observations are stored: as float tensors, as uint8 tensors, or as JPEG-compressed frames on CPU
+IMAGE_STORAGE_MODES = ["float", "uint8", "jpeg"]
+
 
 class BatchTransition(TypedDict):
     state: dict[str, torch.Tensor]
@@ -36,6 +43,9 @@ class BatchTransition(TypedDict):
     done: torch.Tensor
     truncated: torch.Tensor
     complementary_info: dict[str, torch.Tensor | float | int] | None = None
+    # Only sampled from a PrioritizedReplayBuffer: buffer indices and importance-sampling weights
+    indices: torch.Tensor | None
+    weights: torch.Tensor | None
 
 
 def random_crop_vectorized(images: torch.Tensor, output_size: tuple) -> torch.Tensor:
@@ -77,6 +87,80 @@ def random_shift(images: torch.Tensor, pad: int = 4):
     return random_crop_vectorized(images=images, output_size=(h, w))
 
 
+class PinnedMemoryPrefetcher:
+    """
+    Copy the sampled batches to a CUDA device asynchronously, for the async iterator of `ReplayBuffer`.
+
+    The sampled rows are gathered into preallocated pinned host buffers, copied with non-blocking transfers and
+    collated (e.g. augmented) on a dedicated CUDA stream, so that they overlap with the computations of the
+    consumer. Each batch comes with an event, which the consumer's stream waits for before using the batch.
+    The pinned buffers of a slot are reused every `num_slots` batches, once the copies out of them are done.
+    """
+
+    def __init__(self, device: str | torch.device, num_slots: int = 3):
+        self.device = torch.device(device)
+        self.stream = torch.cuda.Stream(device=self.device)
+        # Pinned buffers of each slot, in the order in which a batch gathers its tensors
+        self.buffers: list[list[torch.Tensor | None]] = [[] for _ in range(num_slots)]
+        self.events: list[torch.cuda.Event | None] = [None] * num_slots
+        self.slot = 0
+        self.num_gathered = 0
+
+    def sample(
+        self, replay_buffer: "ReplayBuffer", batch_size: int
+    ) -> tuple[BatchTransition, torch.cuda.Event]:
+        """Sample a batch on the prefetch stream, returning it with the event marking the end of its copies."""
+        self.slot = (self.slot + 1) % len(self.buffers)
+        self.num_gathered = 0
+        if self.events[self.slot] is not None:
+            self.events[self.slot].synchronize()
+
+        with torch.cuda.stream(self.stream):
+            batch = replay_buffer.sample(batch_size, prefetcher=self)
+            event = self.stream.record_event()
+        self.events[self.slot] = event
+        return batch, event
+
+    def wait(self, batch: BatchTransition, event: torch.cuda.Event) -> BatchTransition:
+        """Make the current stream wait for the copies of a batch, before handing it to the consumer."""
+        stream = torch.cuda.current_stream(self.device)
+        stream.wait_event(event)
+
+        tensors = [batch["action"], batch["reward"], batch["done"], batch["truncated"]]
+        tensors += [*batch["state"].values(), *batch["next_state"].values()]
+        tensors += list((batch["complementary_info"] or {}).values())
+        tensors += [batch.get("weights")]
+        for tensor in tensors:
+            # The memory was allocated on the prefetch stream, it must not be reused while the consumer uses it
+            if isinstance(tensor, torch.Tensor) and tensor.is_cuda:
+                tensor.record_stream(stream)
+        return batch
+
+    def gather(self, storage: torch.Tensor, idx: torch.Tensor) -> torch.Tensor:
+        """Copy `storage[idx]` to the device, through a pinned buffer if the storage is on CPU."""
+        if storage.device.type != "cpu":
+            return storage[idx].to(self.device, non_blocking=True)
+        buffer = self._pinned_buffer((len(idx), *storage.shape[1:]), storage.dtype)
+        torch.index_select(storage, 0, idx, out=buffer)
+        return buffer.to(self.device, non_blocking=True)
+
+    def stage(self, tensor: torch.Tensor) -> torch.Tensor:
+        """Copy a CPU tensor to the device, through a pinned buffer."""
+        buffer = self._pinned_buffer(tensor.shape, tensor.dtype)
+        buffer.copy_(tensor)
+        return buffer.to(self.device, non_blocking=True)
+
+    def _pinned_buffer(self, shape: torch.Size, dtype: torch.dtype) -> torch.Tensor:
+        buffers = self.buffers[self.slot]
+        if self.num_gathered == len(buffers):
+            buffers.append(None)
+        buffer = buffers[self.num_gathered]
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = buffers[self.num_gathered] = torch.empty(shape, dtype=dtype, pin_memory=True)
+        self.num_gathered += 1
+        return buffer
+
+
 class ReplayBuffer:
     def __init__(
         self,
@@ -87,6 +171,8 @@ class ReplayBuffer:
         use_drq: bool = True,
         storage_device: str = "cpu",
         optimize_memory: bool = False,
+        image_storage: str = "float",
+        jpeg_quality: int = 90,
     ):
         """
         Replay buffer for storing transitions.
@@ -104,9 +190,15 @@ class ReplayBuffer:
                 Using "cpu" can help save GPU memory.
             optimize_memory (bool): If True, optimizes memory by not storing duplicate next_states when
                 they can be derived from states. This is useful for large datasets where next_state[i] = state[i+1].
+            image_storage (str): How the images (in [0, 1]) are stored: "float", "uint8" (4x smaller, quantized to
+                256 levels) or "jpeg" (JPEG-compressed frames in CPU memory, lossy, decoded when sampling).
+                Sampled images are float tensors in [0, 1] in all cases.
+            jpeg_quality (int): JPEG quality, between 0 and 100, with `image_storage="jpeg"`.
         """
         if capacity <= 0:
             raise ValueError("Capacity must be greater than 0.")
+        if image_storage not in IMAGE_STORAGE_MODES:
+            raise ValueError(f"Unknown image storage '{image_storage}'. Available: {IMAGE_STORAGE_MODES}")
 
         self.capacity = capacity
         self.device = device
@@ -115,6 +207,11 @@ class ReplayBuffer:
         self.size = 0
         self.initialized = False
         self.optimize_memory = optimize_memory
+        self.image_storage = image_storage
+        self.jpeg_quality = jpeg_quality
+        # Image keys not stored as float, set when the storage is initialized
+        self.image_keys = []
+        self._jpeg_decoder = None
 
         # Track episode boundaries for memory optimization
         self.episode_ends = torch.zeros(capacity, dtype=torch.bool, device=storage_device)
@@ -141,19 +238,16 @@ class ReplayBuffer:
         action_shape = action.squeeze(0).shape
 
         # Pre-allocate tensors for storage
-        self.states = {
-            key: torch.empty((self.capacity, *shape), device=self.storage_device)
-            for key, shape in state_shapes.items()
-        }
+        if self.image_storage != "float":
+            self.image_keys = [key for key in state_shapes if key.startswith(OBS_IMAGE)]
+        self.image_shapes = {key: state_shapes[key] for key in self.image_keys}
+        self.states = {key: self._allocate_state(key, shape) for key, shape in state_shapes.items()}
         self.actions = torch.empty((self.capacity, *action_shape), device=self.storage_device)
         self.rewards = torch.empty((self.capacity,), device=self.storage_device)
 
         if not self.optimize_memory:
             # Standard approach: store states and next_states separately
-            self.next_states = {
-                key: torch.empty((self.capacity, *shape), device=self.storage_device)
-                for key, shape in state_shapes.items()
-            }
+            self.next_states = {key: self._allocate_state(key, shape) for key, shape in state_shapes.items()}
         else:
             # Memory-optimized approach: don't allocate next_states buffer
             # Just create a reference to states for consistent API
@@ -184,6 +278,63 @@ class ReplayBuffer:
 
         self.initialized = True
 
+    def _allocate_state(self, key: str, shape: torch.Size) -> torch.Tensor | np.ndarray:
+        if key not in self.image_keys:
+            return torch.empty((self.capacity, *shape), device=self.storage_device)
+        if self.image_storage == "uint8":
+            return torch.empty((self.capacity, *shape), dtype=torch.uint8, device=self.storage_device)
+        # One JPEG-encoded frame (bytes) per transition
+        return np.full(self.capacity, None, dtype=object)
+
+    def _write_images(self, storage: torch.Tensor | np.ndarray, indices: torch.Tensor, images: torch.Tensor):
+        """Write a (N, C, H, W) batch of float images in [0, 1] at the given indices of an image storage."""
+        images = (images.detach().clamp(0, 1) * 255).round().to(torch.uint8)
+        if self.image_storage == "uint8":
+            storage.index_copy_(0, indices.to(storage.device), images.to(storage.device))
+            return
+
+        frames = images.permute(0, 2, 3, 1).cpu().numpy()
+        for index, frame in zip(indices.tolist(), frames, strict=True):
+            storage[index] = encode_jpeg(frame, self.jpeg_quality)
+
+    def _read_states(
+        self,
+        storage: dict[str, torch.Tensor | np.ndarray],
+        key: str,
+        idx: torch.Tensor,
+        device: str,
+        prefetcher: PinnedMemoryPrefetcher | None = None,
+    ) -> torch.Tensor:
+        """Read the states of `key` at the given indices, as float tensors on `device`."""
+        if key not in self.image_keys:
+            return self._gather(storage[key], idx, device, prefetcher)
+
+        if self.image_storage == "uint8":
+            images = self._gather(storage[key], idx, device, prefetcher)
+        else:
+            # Decode the frames in parallel (OpenCV releases the GIL), e.g. in the async prefetch thread
+            if self._jpeg_decoder is None:
+                self._jpeg_decoder = ThreadPoolExecutor(max_workers=4, thread_name_prefix="jpeg_decoder")
+            channels, height, width = self.image_shapes[key]
+            frames = self._jpeg_decoder.map(
+                lambda buffer: decode_jpeg(buffer, (height, width, channels)),
+                storage[key][idx.cpu().numpy()],
+            )
+            images = torch.from_numpy(np.stack(list(frames))).permute(0, 3, 1, 2)
+            images = images.to(device) if prefetcher is None else prefetcher.stage(images)
+        return images.float().div_(255)
+
+    @staticmethod
+    def _gather(
+        storage: torch.Tensor,
+        idx: torch.Tensor,
+        device: str,
+        prefetcher: PinnedMemoryPrefetcher | None = None,
+    ) -> torch.Tensor:
+        if prefetcher is None:
+            return storage[idx].to(device)
+        return prefetcher.gather(storage, idx)
+
     def __len__(self):
         return self.size
 
@@ -204,6 +355,14 @@ class ReplayBuffer:
 
         # Store the transition in pre-allocated tensors
         for key in self.states:
+            if key in self.image_keys:
+                index = torch.tensor([self.position])
+                shape = self.image_shapes[key]
+                self._write_images(self.states[key], index, state[key].reshape(1, *shape))
+                if not self.optimize_memory:
+                    self._write_images(self.next_states[key], index, next_state[key].reshape(1, *shape))
+                continue
+
             self.states[key][self.position].copy_(state[key].squeeze(dim=0))
 
             if not self.optimize_memory:
@@ -229,8 +388,77 @@ class ReplayBuffer:
         self.position = (self.position + 1) % self.capacity
         self.size = min(self.size + 1, self.capacity)
 
-    def sample(self, batch_size: int) -> BatchTransition:
-        """Sample a random batch of transitions and collate them into batched tensors."""
+    def add_batch(
+        self,
+        state: dict[str, torch.Tensor],
+        action: torch.Tensor,
+        reward: torch.Tensor,
+        next_state: dict[str, torch.Tensor],
+        done: torch.Tensor,
+        truncated: torch.Tensor,
+        complementary_info: dict[str, torch.Tensor] | None = None,
+    ):
+        """Saves a batch of N transitions (e.g. from `stack_transitions`), with one indexed copy per tensor.
+
+        Same as calling `add` on every transition of the batch, in order: when N exceeds the capacity, only the
+        last `capacity` transitions are kept.
+        """
+        num_transitions = action.shape[0]
+        if num_transitions == 0:
+            return
+
+        # Initialize storage if this is the first transition
+        if not self.initialized:
+            self._initialize_storage(
+                state={key: val[:1] for key, val in state.items()},
+                action=action[:1],
+                complementary_info={key: val[:1] for key, val in complementary_info.items()}
+                if complementary_info is not None
+                else None,
+            )
+
+        # Only the last `capacity` transitions would survive the wrap-around
+        start = max(0, num_transitions - self.capacity)
+        indices = (
+            self.position + start + torch.arange(num_transitions - start, device=self.storage_device)
+        ) % self.capacity
+
+        def write(storage: torch.Tensor, values: torch.Tensor):
+            values = values[start:].to(self.storage_device, dtype=storage.dtype)
+            storage.index_copy_(0, indices, values)
+
+        for key in self.states:
+            if key in self.image_keys:
+                self._write_images(self.states[key], indices, state[key][start:])
+                if not self.optimize_memory:
+                    self._write_images(self.next_states[key], indices, next_state[key][start:])
+                continue
+
+            write(self.states[key], state[key])
+
+            if not self.optimize_memory:
+                # Only store next_states if not optimizing memory
+                write(self.next_states[key], next_state[key])
+
+        write(self.actions, action)
+        write(self.rewards, torch.as_tensor(reward))
+        write(self.dones, torch.as_tensor(done))
+        write(self.truncateds, torch.as_tensor(truncated))
+
+        if complementary_info is not None and self.has_complementary_info:
+            for key in self.complementary_info_keys:
+                if key in complementary_info:
+                    write(self.complementary_info[key], torch.as_tensor(complementary_info[key]))
+
+        self.position = (self.position + num_transitions) % self.capacity
+        self.size = min(self.size + num_transitions, self.capacity)
+
+    def sample(self, batch_size: int, prefetcher: PinnedMemoryPrefetcher | None = None) -> BatchTransition:
+        """
+        Sample a random batch of transitions and collate them into batched tensors.
+
+        `prefetcher` is set by the async iterator, to copy the batch to the device through its pinned buffers.
+        """
         if not self.initialized:
             raise RuntimeError("Cannot sample from an empty buffer. Add transitions first.")
 
@@ -240,6 +468,14 @@ class ReplayBuffer:
         # Random indices for sampling - create on the same device as storage
         idx = torch.randint(low=0, high=high, size=(batch_size,), device=self.storage_device)
 
+        return self._get_batch(idx, prefetcher)
+
+    def _get_batch(
+        self, idx: torch.Tensor, prefetcher: PinnedMemoryPrefetcher | None = None
+    ) -> BatchTransition:
+        """Collate the transitions at the given indices into batched tensors."""
+        batch_size = len(idx)
+
         # Identify image keys that need augmentation
         image_keys = [k for k in self.states if k.startswith(OBS_IMAGE)] if self.use_drq else []
 
@@ -249,15 +485,15 @@ class ReplayBuffer:
 
         # First pass: load all state tensors to target device
         for key in self.states:
-            batch_state[key] = self.states[key][idx].to(self.device)
+            batch_state[key] = self._read_states(self.states, key, idx, self.device, prefetcher)
 
             if not self.optimize_memory:
                 # Standard approach - load next_states directly
-                batch_next_state[key] = self.next_states[key][idx].to(self.device)
+                batch_next_state[key] = self._read_states(self.next_states, key, idx, self.device, prefetcher)
             else:
                 # Memory-optimized approach - get next_state from the next index
                 next_idx = (idx + 1) % self.capacity
-                batch_next_state[key] = self.states[key][next_idx].to(self.device)
+                batch_next_state[key] = self._read_states(self.states, key, next_idx, self.device, prefetcher)
 
         # Apply image augmentation in a batched way if needed
         if self.use_drq and image_keys:
@@ -281,17 +517,19 @@ class ReplayBuffer:
                 batch_next_state[key] = augmented_images[(i * 2 + 1) * batch_size : (i + 1) * 2 * batch_size]
 
         # Sample other tensors
-        batch_actions = self.actions[idx].to(self.device)
-        batch_rewards = self.rewards[idx].to(self.device)
-        batch_dones = self.dones[idx].to(self.device).float()
-        batch_truncateds = self.truncateds[idx].to(self.device).float()
+        batch_actions = self._gather(self.actions, idx, self.device, prefetcher)
+        batch_rewards = self._gather(self.rewards, idx, self.device, prefetcher)
+        batch_dones = self._gather(self.dones, idx, self.device, prefetcher).float()
+        batch_truncateds = self._gather(self.truncateds, idx, self.device, prefetcher).float()
 
         # Sample complementary_info if available
         batch_complementary_info = None
         if self.has_complementary_info:
             batch_complementary_info = {}
             for key in self.complementary_info_keys:
-                batch_complementary_info[key] = self.complementary_info[key][idx].to(self.device)
+                batch_complementary_info[key] = self._gather(
+                    self.complementary_info[key], idx, self.device, prefetcher
+                )
 
         return BatchTransition(
             state=batch_state,
@@ -308,6 +546,7 @@ class ReplayBuffer:
         batch_size: int,
         async_prefetch: bool = True,
         queue_size: int = 2,
+        pin_memory: bool = True,
     ):
         """
         Creates an infinite iterator that yields batches of transitions.
@@ -317,6 +556,8 @@ class ReplayBuffer:
             batch_size (int): Size of batches to sample
             async_prefetch (bool): Whether to use asynchronous prefetching with threads (default: True)
             queue_size (int): Number of batches to prefetch (default: 2)
+            pin_memory (bool): With async prefetching to a CUDA device, whether to copy the batches through pinned
+                memory on a dedicated CUDA stream (see `PinnedMemoryPrefetcher`) (default: True)
 
         Yields:
             BatchTransition: Batched transitions
@@ -324,7 +565,9 @@ class ReplayBuffer:
         while True:  # Create an infinite loop
             if async_prefetch:
                 # Get the standard iterator
-                iterator = self._get_async_iterator(queue_size=queue_size, batch_size=batch_size)
+                iterator = self._get_async_iterator(
+                    queue_size=queue_size, batch_size=batch_size, pin_memory=pin_memory
+                )
             else:
                 iterator = self._get_naive_iterator(batch_size=batch_size, queue_size=queue_size)
 
@@ -332,7 +575,7 @@ class ReplayBuffer:
             with suppress(StopIteration):
                 yield from iterator
 
-    def _get_async_iterator(self, batch_size: int, queue_size: int = 2):
+    def _get_async_iterator(self, batch_size: int, queue_size: int = 2, pin_memory: bool = True):
         """
         Create an iterator that continuously yields prefetched batches in a
         background thread. The design is intentionally simple and avoids busy
@@ -342,6 +585,8 @@ class ReplayBuffer:
             batch_size (int): Size of batches to sample.
             queue_size (int): Maximum number of prefetched batches to keep in
                 memory.
+            pin_memory (bool): Whether to copy the batches to a CUDA device with
+                a `PinnedMemoryPrefetcher`. Ignored on CPU.
 
         Yields:
             BatchTransition: A batch sampled from the replay buffer.
@@ -352,11 +597,18 @@ class ReplayBuffer:
         data_queue: queue.Queue = queue.Queue(maxsize=queue_size)
         shutdown_event = threading.Event()
 
+        prefetcher = None
+        if pin_memory and torch.device(self.device).type == "cuda" and torch.cuda.is_available():
+            # One slot per queued batch, plus the ones being produced and consumed
+            prefetcher = PinnedMemoryPrefetcher(self.device, num_slots=queue_size + 2)
+
         def producer() -> None:
             """Continuously put sampled batches into the queue until shutdown."""
             while not shutdown_event.is_set():
                 try:
-                    batch = self.sample(batch_size)
+                    batch = (
+                        self.sample(batch_size) if prefetcher is None else prefetcher.sample(self, batch_size)
+                    )
                     # The timeout ensures the thread unblocks if the queue is full
                     # and the shutdown event gets set meanwhile.
                     data_queue.put(batch, block=True, timeout=0.5)
@@ -373,7 +625,8 @@ class ReplayBuffer:
         try:
             while not shutdown_event.is_set():
                 try:
-                    yield data_queue.get(block=True)
+                    batch = data_queue.get(block=True)
+                    yield batch if prefetcher is None else prefetcher.wait(*batch)
                 except Exception:
                     # If the producer already set the shutdown flag we exit.
                     if shutdown_event.is_set():
@@ -422,6 +675,8 @@ class ReplayBuffer:
         use_drq: bool = True,
         storage_device: str = "cpu",
         optimize_memory: bool = False,
+        image_storage: str = "float",
+        jpeg_quality: int = 90,
     ) -> "ReplayBuffer":
         """
         Convert a LeRobotDataset into a ReplayBuffer.
@@ -437,6 +692,8 @@ class ReplayBuffer:
             use_drq (bool): Whether to use DrQ image augmentation when sampling.
             storage_device (str): Device for storing tensor data. Using "cpu" saves GPU memory.
             optimize_memory (bool): If True, reduces memory usage by not duplicating state data.
+            image_storage (str): How the images are stored ("float", "uint8" or "jpeg"), see `ReplayBuffer`.
+            jpeg_quality (int): JPEG quality, with `image_storage="jpeg"`.
 
         Returns:
             ReplayBuffer: The replay buffer with dataset transitions.
@@ -458,6 +715,8 @@ class ReplayBuffer:
             use_drq=use_drq,
             storage_device=storage_device,
             optimize_memory=optimize_memory,
+            image_storage=image_storage,
+            jpeg_quality=jpeg_quality,
         )
 
         # Convert dataset to transitions
@@ -539,7 +798,7 @@ class ReplayBuffer:
 
         # Add state keys
         for key in self.states:
-            sample_val = self.states[key][0]
+            sample_val = self._read_states(self.states, key, torch.tensor([0]), "cpu")[0]
             f_info = guess_feature_info(t=sample_val, name=key)
             features[key] = f_info
 
@@ -574,7 +833,7 @@ class ReplayBuffer:
 
             # Fill the data for state keys
             for key in self.states:
-                frame_dict[key] = self.states[key][actual_idx].cpu()
+                frame_dict[key] = self._read_states(self.states, key, torch.tensor([actual_idx]), "cpu")[0]
 
             # Fill action, reward, done
             frame_dict[ACTION] = self.actions[actual_idx].cpu()
@@ -758,6 +1017,234 @@ def guess_feature_info(t, name: str):
         }
 
 
+class SumMinSegmentTree:
+    """Array-based sum and min segment trees over non-negative values, with batched updates and queries.
+
+    The leaves hold the values and every node the sum (or min) of its two children, so that the total and the
+    min are read at the root, and finding the leaf of a prefix sum takes log2(capacity) vectorized steps for a
+    whole batch of prefix sums. Zero values are ignored by the min.
+    """
+
+    def __init__(self, capacity: int):
+        self.num_leaves = 1 << max(0, (capacity - 1).bit_length())
+        self.sums = np.zeros(2 * self.num_leaves, dtype=np.float64)
+        self.mins = np.full(2 * self.num_leaves, np.inf, dtype=np.float64)
+
+    @property
+    def total(self) -> float:
+        return float(self.sums[1])
+
+    @property
+    def min(self) -> float:
+        return float(self.mins[1])
+
+    def get(self, indices: np.ndarray) -> np.ndarray:
+        return self.sums[indices + self.num_leaves]
+
+    def update(self, indices: np.ndarray, values: np.ndarray):
+        """Set the values of the given leaves (the last one wins for duplicated indices), then their parents."""
+        # Keep the last occurrence of every index
+        indices, last = np.unique(indices[::-1], return_index=True)
+        values = np.asarray(values, dtype=np.float64)[::-1][last]
+
+        nodes = indices + self.num_leaves
+        self.sums[nodes] = values
+        self.mins[nodes] = np.where(values > 0, values, np.inf)
+        while nodes[0] > 1:
+            nodes = np.unique(nodes // 2)
+            self.sums[nodes] = self.sums[2 * nodes] + self.sums[2 * nodes + 1]
+            self.mins[nodes] = np.minimum(self.mins[2 * nodes], self.mins[2 * nodes + 1])
+
+    def find_prefix_sum(self, prefix_sums: np.ndarray) -> np.ndarray:
+        """Return, for every prefix sum in [0, total), the index of the leaf where the cumulative sum exceeds it.
+
+        The descent never enters a zero-sum subtree, so that the returned leaves always have a non-zero value,
+        even when rounding errors push a prefix sum close to the total past the sum of its subtree.
+        """
+        prefix_sums = np.array(prefix_sums, dtype=np.float64)
+        nodes = np.ones(len(prefix_sums), dtype=np.int64)
+        while nodes[0] < self.num_leaves:
+            left = 2 * nodes
+            left_sums = self.sums[left]
+            go_right = ((prefix_sums >= left_sums) & (self.sums[left + 1] > 0)) | (left_sums <= 0)
+            prefix_sums -= np.where(go_right, left_sums, 0)
+            nodes = left + go_right
+        return nodes - self.num_leaves
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    def __init__(
+        self,
+        capacity: int,
+        device: str = "cuda:0",
+        state_keys: Sequence[str] | None = None,
+        image_augmentation_function: Callable | None = None,
+        use_drq: bool = True,
+        storage_device: str = "cpu",
+        optimize_memory: bool = False,
+        image_storage: str = "float",
+        jpeg_quality: int = 90,
+        alpha: float = 0.6,
+        beta: float = 0.4,
+        epsilon: float = 1e-6,
+    ):
+        """
+        Replay buffer sampling transitions proportionally to their priority, as per "Prioritized Experience Replay"
+        (paper: https://huggingface.co/papers/1511.05952).
+
+        The priority of a transition is its last absolute TD error (plus `epsilon`), given to `update_priorities`,
+        and new transitions get the highest priority seen so far, so that they are sampled at least once. Sampled
+        batches hold the buffer `indices` of the transitions, and the importance-sampling `weights` correcting the
+        bias of the non-uniform sampling (normalized so that the largest possible weight is 1).
+        Args:
+            capacity, device, state_keys, image_augmentation_function, use_drq, storage_device, optimize_memory,
+                image_storage, jpeg_quality: See `ReplayBuffer`.
+            alpha (float): How much prioritization is used, from 0 (uniform sampling) to 1 (fully proportional).
+            beta (float): Importance-sampling correction, from 0 (no correction) to 1 (full correction).
+            epsilon (float): Added to the absolute TD errors, so that no transition has a zero priority.
+        """
+        super().__init__(
+            capacity=capacity,
+            device=device,
+            state_keys=state_keys,
+            image_augmentation_function=image_augmentation_function,
+            use_drq=use_drq,
+            storage_device=storage_device,
+            optimize_memory=optimize_memory,
+            image_storage=image_storage,
+            jpeg_quality=jpeg_quality,
+        )
+        self.alpha = alpha
+        self.beta = beta
+        self.epsilon = epsilon
+        self.max_priority = 1.0
+        self.tree = SumMinSegmentTree(capacity)
+        # Batches can be sampled in a prefetching thread while priorities are updated
+        self.lock = threading.Lock()
+
+    def add(self, *args, **kwargs):
+        super().add(*args, **kwargs)
+        self._set_new_priorities(num_added=1)
+
+    def add_batch(
+        self,
+        state: dict[str, torch.Tensor],
+        action: torch.Tensor,
+        reward: torch.Tensor,
+        next_state: dict[str, torch.Tensor],
+        done: torch.Tensor,
+        truncated: torch.Tensor,
+        complementary_info: dict[str, torch.Tensor] | None = None,
+    ):
+        super().add_batch(
+            state=state,
+            action=action,
+            reward=reward,
+            next_state=next_state,
+            done=done,
+            truncated=truncated,
+            complementary_info=complementary_info,
+        )
+        self._set_new_priorities(num_added=min(action.shape[0], self.capacity))
+
+    def _set_new_priorities(self, num_added: int):
+        if num_added == 0:
+            return
+        indices = (self.position - num_added + np.arange(num_added)) % self.capacity
+        priorities = np.full(num_added, self.max_priority**self.alpha)
+        if self.optimize_memory:
+            # The next state of the latest transition is not stored yet, so it can't be sampled
+            priorities[-1] = 0
+            if self.size > num_added:
+                # While the one of the previous latest transition now is
+                indices = np.append(indices, (self.position - num_added - 1) % self.capacity)
+                priorities = np.append(priorities, self.max_priority**self.alpha)
+        with self.lock:
+            self.tree.update(indices, priorities)
+
+    def sample(self, batch_size: int, prefetcher: PinnedMemoryPrefetcher | None = None) -> BatchTransition:
+        """Sample a batch of transitions proportionally to their priority, with importance-sampling weights."""
+        if not self.initialized:
+            raise RuntimeError("Cannot sample from an empty buffer. Add transitions first.")
+
+        batch_size = min(batch_size, self.size)
+        with self.lock:
+            total = self.tree.total
+            # Stratified sampling: one prefix sum in each of `batch_size` equal segments of [0, total)
+            prefix_sums = (np.arange(batch_size) + np.random.random(batch_size)) * (total / batch_size)
+            indices = self.tree.find_prefix_sum(np.minimum(prefix_sums, np.nextafter(total, 0)))
+            probabilities = self.tree.get(indices) / total
+            min_probability = self.tree.min / total
+
+        # (N * P(i))^-beta, divided by the largest weight, (N * min P)^-beta
+        weights = (probabilities / min_probability) ** -self.beta
+
+        idx = torch.from_numpy(indices).to(self.storage_device)
+        batch = self._get_batch(idx, prefetcher)
+        batch["indices"] = idx
+        batch["weights"] = torch.from_numpy(weights).to(self.device, dtype=torch.float32)
+        return batch
+
+    def update_priorities(self, indices: torch.Tensor, td_errors: torch.Tensor):
+        """Set the priorities of the transitions at the given buffer indices from their new TD errors."""
+        indices = indices.cpu().numpy()
+        priorities = td_errors.detach().abs().float().cpu().numpy() + self.epsilon
+        if self.optimize_memory:
+            # The latest transition keeps its zero priority (its slot may have been overwritten since sampling)
+            keep = indices != (self.position - 1) % self.capacity
+            indices, priorities = indices[keep], priorities[keep]
+        if len(indices) == 0:
+            return
+        with self.lock:
+            self.max_priority = max(self.max_priority, float(priorities.max()))
+            self.tree.update(indices, priorities**self.alpha)
+
+
+def stack_transitions(transitions: Sequence[Transition]) -> BatchTransition:
+    """Stack single-step transitions (as given to `ReplayBuffer.add`) into one columnar BatchTransition.
+
+    Every tensor of the BatchTransition holds the values of all the transitions along dimension 0, with the
+    per-step shapes `ReplayBuffer.add` stores (the leading batch dimension of size 1 is squeezed).
+    """
+
+    def stack(values: list) -> torch.Tensor:
+        return torch.stack([torch.as_tensor(value).squeeze(0) for value in values])
+
+    first = transitions[0]
+    complementary_info = None
+    if first.get("complementary_info") is not None:
+        complementary_info = {
+            key: stack([t["complementary_info"][key] for t in transitions])
+            for key in first["complementary_info"]
+        }
+
+    return BatchTransition(
+        state={key: stack([t["state"][key] for t in transitions]) for key in first["state"]},
+        action=stack([t[ACTION] for t in transitions]),
+        reward=torch.tensor([float(t["reward"]) for t in transitions], dtype=torch.float32),
+        next_state={key: stack([t["next_state"][key] for t in transitions]) for key in first["next_state"]},
+        done=torch.tensor([bool(t["done"]) for t in transitions]),
+        truncated=torch.tensor([bool(t["truncated"]) for t in transitions]),
+        complementary_info=complementary_info,
+    )
+
+
+def index_batch_transitions(batch: BatchTransition, indices: torch.Tensor) -> BatchTransition:
+    """Select the transitions of a BatchTransition at the given indices (or boolean mask)."""
+    complementary_info = batch.get("complementary_info")
+    return BatchTransition(
+        state={key: val[indices] for key, val in batch["state"].items()},
+        action=batch[ACTION][indices],
+        reward=batch["reward"][indices],
+        next_state={key: val[indices] for key, val in batch["next_state"].items()},
+        done=batch["done"][indices],
+        truncated=batch["truncated"][indices],
+        complementary_info={key: val[indices] for key, val in complementary_info.items()}
+        if complementary_info is not None
+        else None,
+    )
+
+
 def concatenate_batch_transitions(
     left_batch_transitions: BatchTransition, right_batch_transition: BatchTransition
 ) -> BatchTransition:
@@ -66,7 +66,13 @@ from lerobot.datasets.factory import make_dataset
 from lerobot.datasets.lerobot_dataset import LeRobotDataset
 from lerobot.policies.factory import make_policy
 from lerobot.policies.sac.modeling_sac import SACPolicy
-from lerobot.rl.buffer import ReplayBuffer, concatenate_batch_transitions
+from lerobot.rl.buffer import (
+    PrioritizedReplayBuffer,
+    ReplayBuffer,
+    concatenate_batch_transitions,
+    index_batch_transitions,
+)
+from lerobot.rl.parameter_sync import ParameterSyncSender
 from lerobot.rl.process import ProcessSignalHandler
 from lerobot.rl.wandb_utils import WandBLogger
 from lerobot.robots import so100_follower  # noqa: F401
@@ -75,9 +81,8 @@ from lerobot.teleoperators.utils import TeleopEvents
 from lerobot.transport import services_pb2_grpc
 from lerobot.transport.utils import (
     MAX_MESSAGE_SIZE,
+    bytes_to_batch_transition,
     bytes_to_python_object,
-    bytes_to_transitions,
-    state_to_bytes,
 )
 from lerobot.utils.constants import (
     ACTION,
@@ -93,7 +98,6 @@ from lerobot.utils.train_utils import (
     save_checkpoint,
     update_last_checkpoint,
 )
-from lerobot.utils.transition import move_state_dict_to_device, move_transition_to_device
 from lerobot.utils.utils import (
     format_big_number,
     get_safe_torch_device,
@@ -315,7 +319,13 @@ def add_actor_information_and_train(
 
     policy.train()
 
-    push_actor_policy_to_queue(parameters_queue=parameters_queue, policy=policy)
+    parameter_sync = ParameterSyncSender(
+        mode=cfg.policy.actor_learner_config.parameters_sync_mode,
+        keyframe_interval=cfg.policy.actor_learner_config.parameters_keyframe_interval,
+    )
+    push_actor_policy_to_queue(
+        parameters_queue=parameters_queue, policy=policy, parameter_sync=parameter_sync
+    )
 
     last_time_policy_pushed = time.time()
 
@@ -363,7 +373,6 @@ def add_actor_information_and_train(
             transition_queue=transition_queue,
             replay_buffer=replay_buffer,
             offline_replay_buffer=offline_replay_buffer,
-            device=device,
             dataset_repo_id=dataset_repo_id,
             shutdown_event=shutdown_event,
         )
@@ -394,12 +403,17 @@ def add_actor_information_and_train(
         for _ in range(utd_ratio - 1):
             # Sample from the iterators
             batch = next(online_iterator)
+            # Set when sampling a prioritized replay buffer
+            indices, weights = batch.get("indices"), batch.get("weights")
 
             if dataset_repo_id is not None:
                 batch_offline = next(offline_iterator)
                 batch = concatenate_batch_transitions(
                     left_batch_transitions=batch, right_batch_transition=batch_offline
                 )
+                if weights is not None:
+                    # The offline transitions are sampled uniformly
+                    weights = torch.cat([weights, torch.ones_like(batch_offline["reward"])])
 
             actions = batch[ACTION]
             rewards = batch["reward"]
@@ -422,10 +436,13 @@ def add_actor_information_and_train(
                 "observation_feature": observation_features,
                 "next_observation_feature": next_observation_features,
                 "complementary_info": batch["complementary_info"],
+                "weights": weights,
             }
 
             # Use the forward method for critic loss
             critic_output = policy.forward(forward_batch, model="critic")
+            if indices is not None:
+                replay_buffer.update_priorities(indices, critic_output["td_error"][: len(indices)])
 
             # Main critic optimization
             loss_critic = critic_output["loss_critic"]
@@ -452,12 +469,15 @@ def add_actor_information_and_train(
 
         # Sample for the last update in the UTD ratio
         batch = next(online_iterator)
+        indices, weights = batch.get("indices"), batch.get("weights")
 
         if dataset_repo_id is not None:
             batch_offline = next(offline_iterator)
             batch = concatenate_batch_transitions(
                 left_batch_transitions=batch, right_batch_transition=batch_offline
             )
+            if weights is not None:
+                weights = torch.cat([weights, torch.ones_like(batch_offline["reward"])])
 
         actions = batch[ACTION]
         rewards = batch["reward"]
@@ -480,9 +500,12 @@ def add_actor_information_and_train(
             "done": done,
             "observation_feature": observation_features,
             "next_observation_feature": next_observation_features,
+            "weights": weights,
         }
 
         critic_output = policy.forward(forward_batch, model="critic")
+        if indices is not None:
+            replay_buffer.update_priorities(indices, critic_output["td_error"][: len(indices)])
 
         loss_critic = critic_output["loss_critic"]
         optimizers["critic"].zero_grad()
@@ -550,8 +573,20 @@ def add_actor_information_and_train(
 
         # Push policy to actors if needed
         if time.time() - last_time_policy_pushed > policy_parameters_push_frequency:
-            push_actor_policy_to_queue(parameters_queue=parameters_queue, policy=policy)
+            push_bytes = push_actor_policy_to_queue(
+                parameters_queue=parameters_queue, policy=policy, parameter_sync=parameter_sync
+            )
             last_time_policy_pushed = time.time()
+            if wandb_logger:
+                wandb_logger.log_dict(
+                    {
+                        "Parameters push bytes": push_bytes,
+                        "Parameters version": parameter_sync.version,
+                        "Optimization step": optimization_step,
+                    },
+                    mode="train",
+                    custom_step_key="Optimization step",
+                )
 
         # Update target networks (main and discrete)
         policy.update_target_networks()
@@ -946,14 +981,18 @@ def initialize_replay_buffer(
     Returns:
         ReplayBuffer: Initialized replay buffer
     """
+    buffer_class = PrioritizedReplayBuffer if cfg.policy.prioritized_replay else ReplayBuffer
     if not cfg.resume:
-        return ReplayBuffer(
+        replay_buffer = buffer_class(
             capacity=cfg.policy.online_buffer_capacity,
             device=device,
             state_keys=cfg.policy.input_features.keys(),
             storage_device=storage_device,
             optimize_memory=True,
+            image_storage=cfg.policy.buffer_image_storage,
+            jpeg_quality=cfg.policy.buffer_jpeg_quality,
         )
+        return configure_prioritized_replay(cfg, replay_buffer)
 
     logging.info("Resume training load the online dataset")
     dataset_path = os.path.join(cfg.output_dir, "dataset")
@@ -966,13 +1005,26 @@ def initialize_replay_buffer(
         repo_id=repo_id,
         root=dataset_path,
     )
-    return ReplayBuffer.from_lerobot_dataset(
+    replay_buffer = buffer_class.from_lerobot_dataset(
         lerobot_dataset=dataset,
         capacity=cfg.policy.online_buffer_capacity,
         device=device,
         state_keys=cfg.policy.input_features.keys(),
         optimize_memory=True,
+        image_storage=cfg.policy.buffer_image_storage,
+        jpeg_quality=cfg.policy.buffer_jpeg_quality,
     )
+    return configure_prioritized_replay(cfg, replay_buffer)
+
+
+def configure_prioritized_replay(
+    cfg: TrainRLServerPipelineConfig, replay_buffer: ReplayBuffer
+) -> ReplayBuffer:
+    """Set the prioritization exponents of the config on a prioritized replay buffer."""
+    if isinstance(replay_buffer, PrioritizedReplayBuffer):
+        replay_buffer.alpha = cfg.policy.prioritized_replay_alpha
+        replay_buffer.beta = cfg.policy.prioritized_replay_beta
+    return replay_buffer
 
 
 def initialize_offline_replay_buffer(
@@ -1010,6 +1062,8 @@ def initialize_offline_replay_buffer(
         storage_device=storage_device,
         optimize_memory=True,
         capacity=cfg.policy.offline_buffer_capacity,
+        image_storage=cfg.policy.buffer_image_storage,
+        jpeg_quality=cfg.policy.buffer_jpeg_quality,
     )
     return offline_replay_buffer
 
@@ -1094,21 +1148,24 @@ def check_nan_in_transition(
     return nan_detected
 
 
-def push_actor_policy_to_queue(parameters_queue: Queue, policy: nn.Module):
+def push_actor_policy_to_queue(
+    parameters_queue: Queue, policy: nn.Module, parameter_sync: ParameterSyncSender
+) -> int:
+    """Push the next version of the actor's parameters to the queue, returning its size in bytes."""
     logging.debug("[LEARNER] Pushing actor policy to the queue")
 
-    # Create a dictionary to hold all the state dicts
-    state_dicts = {"policy": move_state_dict_to_device(policy.actor.state_dict(), device="cpu")}
+    # Create a dictionary to hold all the modules to sync
+    modules = {"policy": policy.actor}
 
     # Add discrete critic if it exists
     if hasattr(policy, "discrete_critic") and policy.discrete_critic is not None:
-        state_dicts["discrete_critic"] = move_state_dict_to_device(
-            policy.discrete_critic.state_dict(), device="cpu"
-        )
+        modules["discrete_critic"] = policy.discrete_critic
         logging.debug("[LEARNER] Including discrete critic in state dict push")
 
-    state_bytes = state_to_bytes(state_dicts)
+    state_bytes = parameter_sync.encode(modules)
     parameters_queue.put(state_bytes)
+    logging.info(f"[LEARNER] Pushed parameters version {parameter_sync.version} ({len(state_bytes)} bytes)")
+    return len(state_bytes)
 
 
 def process_interaction_message(
@@ -1130,43 +1187,40 @@ def process_transitions(
     transition_queue: Queue,
     replay_buffer: ReplayBuffer,
     offline_replay_buffer: ReplayBuffer,
-    device: str,
     dataset_repo_id: str | None,
     shutdown_event: any,
 ):
     """Process all available transitions from the queue.
 
+    Every message is a columnar batch of transitions, written into the replay buffers at once.
+
     Args:
         transition_queue: Queue for receiving transitions from the actor
         replay_buffer: Replay buffer to add transitions to
         offline_replay_buffer: Offline replay buffer to add transitions to
-        device: Device to move transitions to
         dataset_repo_id: Repository ID for dataset
         shutdown_event: Event to signal shutdown
     """
     while not transition_queue.empty() and not shutdown_event.is_set():
-        transition_list = transition_queue.get()
-        transition_list = bytes_to_transitions(buffer=transition_list)
-
-        for transition in transition_list:
-            transition = move_transition_to_device(transition=transition, device=device)
-
-            # Skip transitions with NaN values
-            if check_nan_in_transition(
-                observations=transition["state"],
-                actions=transition[ACTION],
-                next_state=transition["next_state"],
-            ):
-                logging.warning("[LEARNER] NaN detected in transition, skipping")
-                continue
-
-            replay_buffer.add(**transition)
-
-            # Add to offline buffer if it's an intervention
-            if dataset_repo_id is not None and transition.get("complementary_info", {}).get(
-                TeleopEvents.IS_INTERVENTION
-            ):
-                offline_replay_buffer.add(**transition)
+        batch = bytes_to_batch_transition(buffer=transition_queue.get())
+
+        # Skip transitions with NaN values
+        has_nan = batch[ACTION].flatten(1).isnan().any(dim=1)
+        for key in batch["state"]:
+            has_nan |= batch["state"][key].flatten(1).isnan().any(dim=1)
+            has_nan |= batch["next_state"][key].flatten(1).isnan().any(dim=1)
+        if has_nan.any():
+            logging.warning(f"[LEARNER] NaN detected in {int(has_nan.sum())} transition(s), skipping")
+            batch = index_batch_transitions(batch, ~has_nan)
+
+        replay_buffer.add_batch(**batch)
+
+        # Add to offline buffer the transitions that are interventions
+        complementary_info = batch.get("complementary_info") or {}
+        if dataset_repo_id is not None and TeleopEvents.IS_INTERVENTION.value in complementary_info:
+            is_intervention = complementary_info[TeleopEvents.IS_INTERVENTION.value].bool()
+            if is_intervention.any():
+                offline_replay_buffer.add_batch(**index_batch_transitions(batch, is_intervention))
 
 
 def process_interaction_messages(
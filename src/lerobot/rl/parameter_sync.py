@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Versioned synchronization of the policy parameters from the learner to the actors.
+
+Every push is a versioned update, either a keyframe (all the tensors, in full) or a delta against the previous
+version, which the actor applies in place on its modules:
+- "full": every update is a keyframe, as the learner always did.
+- "changed": deltas hold the tensors that changed since the previous version, in full.
+- "fp16" / "int8": deltas hold the difference between the learner's tensors and the ones the actor holds,
+  quantized to float16 or to int8 (with one scale per tensor). The learner keeps a copy of the actor's tensors,
+  so that the quantization error of a delta is sent with the next one instead of accumulating.
+
+A delta only applies on top of the version it was computed against, so the updates are sent and applied in order,
+only skipping the ones preceding the latest keyframe (see `skip_superseded_updates`). A delta that does not apply
+(e.g. the actor reconnected) is ignored until the next keyframe, sent every `keyframe_interval` pushes. Frozen
+parameters (e.g. of a frozen vision encoder) are only sent every `keyframe_interval` pushes too.
+"""
+
+import logging
+import time
+
+import torch
+from torch import Tensor, nn
+
+from lerobot.transport.utils import bytes_to_state_dict, state_to_bytes
+
+SYNC_MODES = ["full", "changed", "fp16", "int8"]
+
+# First byte of the updates, to tell keyframes from deltas without deserializing them
+KEYFRAME = b"K"
+DELTA = b"D"
+
+
+def skip_superseded_updates(buffers: list[bytes]) -> list[bytes]:
+    """Keep the updates from the latest keyframe on, as the ones before are overwritten by it."""
+    for i in range(len(buffers) - 1, -1, -1):
+        if buffers[i][:1] == KEYFRAME:
+            return buffers[i:]
+    return buffers
+
+
+class ParameterSyncSender:
+    """Encode the parameters of the learner's modules into versioned updates."""
+
+    def __init__(self, mode: str = "full", keyframe_interval: int = 50):
+        if mode not in SYNC_MODES:
+            raise ValueError(f"Unknown parameters sync mode '{mode}'. Available: {SYNC_MODES}")
+        if keyframe_interval < 1:
+            raise ValueError(f"`keyframe_interval` must be at least 1. Got {keyframe_interval}.")
+        self.mode = mode
+        self.keyframe_interval = keyframe_interval
+        self.version = -1
+        # Copy of the tensors held by the actors once they applied every update sent so far
+        self.reference: dict[str, dict[str, Tensor]] = {}
+
+    def encode(self, modules: dict[str, nn.Module]) -> bytes:
+        """Return the next update of the modules' parameters (the next version)."""
+        self.version += 1
+        periodic_keyframe = self.version % self.keyframe_interval == 0
+        keyframe = self.mode == "full" or periodic_keyframe
+
+        state_dicts = {}
+        for name, module in modules.items():
+            # Frozen parameters never change, they are only sent for the actors that missed them
+            frozen = (
+                set()
+                if periodic_keyframe
+                else {n for n, p in module.named_parameters() if not p.requires_grad}
+            )
+            state = {k: v.detach().cpu() for k, v in module.state_dict().items() if k not in frozen}
+            if keyframe or name not in self.reference:
+                state_dicts[name] = {"values": state, "deltas": {}, "scales": {}}
+                if self.mode != "full":
+                    self.reference[name] = {k: v.clone() for k, v in state.items()}
+            else:
+                state_dicts[name] = self._encode_delta(self.reference[name], state)
+
+        message = {
+            "version": self.version,
+            "base_version": self.version - 1,
+            "timestamp": time.time(),
+            "state_dicts": state_dicts,
+        }
+        return (KEYFRAME if keyframe else DELTA) + state_to_bytes(message)
+
+    def _encode_delta(self, reference: dict[str, Tensor], state: dict[str, Tensor]) -> dict[str, dict]:
+        values, deltas, scales = {}, {}, {}
+        for key, tensor in state.items():
+            ref = reference.get(key)
+            if ref is None or ref.shape != tensor.shape or ref.dtype != tensor.dtype:
+                values[key] = tensor
+                reference[key] = tensor.clone()
+            elif self.mode == "changed" or not tensor.is_floating_point():
+                if not torch.equal(tensor, ref):
+                    values[key] = tensor
+                    ref.copy_(tensor)
+            else:
+                delta = tensor.float() - ref.float()
+                if self.mode == "fp16":
+                    quantized = delta.half()
+                    if not quantized.any():
+                        continue
+                    ref.add_(quantized.float().to(ref.dtype))
+                else:
+                    abs_max = delta.abs().max()
+                    if abs_max == 0:
+                        continue
+                    scale = abs_max / 127
+                    quantized = (delta / scale).round().clamp(-127, 127).to(torch.int8)
+                    scales[key] = scale
+                    ref.add_((quantized.float() * scale).to(ref.dtype))
+                deltas[key] = quantized
+        return {"values": values, "deltas": deltas, "scales": scales}
+
+
+class ParameterSyncReceiver:
+    """Apply the updates of a `ParameterSyncSender` in place on the actor's modules."""
+
+    def __init__(self):
+        self.version: int | None = None
+        # Time at which the learner encoded the current version
+        self.timestamp: float | None = None
+
+    @property
+    def staleness(self) -> float | None:
+        """Seconds since the learner encoded the parameters the actor holds (assuming synchronized clocks)."""
+        return None if self.timestamp is None else time.time() - self.timestamp
+
+    @torch.no_grad()
+    def apply(self, buffer: bytes, modules: dict[str, nn.Module]) -> bool:
+        """Apply an update, returning whether it could be applied on top of the current version."""
+        message = bytes_to_state_dict(buffer[1:])
+        if buffer[:1] == DELTA and message["base_version"] != self.version:
+            logging.warning(
+                f"[ACTOR] Skipping parameters version {message['version']}, computed against version "
+                f"{message['base_version']} instead of {self.version}. Waiting for the next keyframe."
+            )
+            return False
+
+        for name, module in modules.items():
+            if name not in message["state_dicts"]:
+                continue
+            update = message["state_dicts"][name]
+            # The tensors of the state dict share their storage with the module's parameters and buffers
+            state = module.state_dict()
+            for key, value in update["values"].items():
+                state[key].copy_(value)
+            for key, delta in update["deltas"].items():
+                delta = delta.to(state[key].device).float()
+                if key in update["scales"]:
+                    delta = delta * update["scales"][key].to(delta.device)
+                state[key].add_(delta.to(state[key].dtype))
+
+        self.version = message["version"]
+        self.timestamp = message["timestamp"]
+        return True
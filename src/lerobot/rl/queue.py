@@ -50,3 +50,29 @@ def get_last_item_from_queue(queue: Queue, block=True, timeout: float = 0.1) ->
             item = queue.get_nowait()
 
     return item
+
+
+def get_all_items_from_queue(queue: Queue, block=True, timeout: float = 0.1) -> list[Any]:
+    """Drain the queue, returning all its items in order (waiting up to `timeout` for the first one if `block`)."""
+    items = []
+    if block:
+        try:
+            items.append(queue.get(timeout=timeout))
+        except Empty:
+            return items
+
+    if platform.system() == "Darwin":
+        # On Mac, avoid using `qsize` (see `get_last_item_from_queue`)
+        try:
+            while True:
+                items.append(queue.get_nowait())
+        except Empty:
+            pass
+
+        return items
+
+    while queue.qsize() > 0:
+        with suppress(Empty):
+            items.append(queue.get_nowait())
+
+    return items
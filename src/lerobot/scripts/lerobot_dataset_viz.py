@@ -75,6 +75,7 @@ import torch.utils.data
 import tqdm
 
 from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.datasets.utils import CollatedBatchDataset, collate_batched_items
 from lerobot.utils.constants import ACTION, DONE, OBS_STATE, REWARD
 
 
@@ -121,10 +122,11 @@ def visualize_dataset(
     logging.info("Loading dataloader")
     episode_sampler = EpisodeSampler(dataset, episode_index)
     dataloader = torch.utils.data.DataLoader(
-        dataset,
+        CollatedBatchDataset(dataset),
         num_workers=num_workers,
         batch_size=batch_size,
         sampler=episode_sampler,
+        collate_fn=collate_batched_items,
     )
 
     logging.info("Starting Rerun")
@@ -167,7 +167,10 @@ def rollout(
         observation = add_envs_task(env, observation)
         observation = preprocessor(observation)
         with torch.inference_mode():
-            action = policy.select_action(observation)
+            if policy.config.chunk_prefetch_threshold is not None:
+                action = policy.select_action_with_prefetch(observation)
+            else:
+                action = policy.select_action(observation)
         action = postprocessor(action)
 
         # Convert to CPU / numpy.
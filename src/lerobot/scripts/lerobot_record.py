@@ -164,6 +164,13 @@ class DatasetRecordConfig:
     # Number of episodes to record before batch encoding videos
     # Set to 1 for immediate encoding (default behavior), or higher for batched encoding
     video_encoding_batch_size: int = 1
+    # Number of background processes encoding the videos of saved episodes while the next ones are recorded.
+    # Set to the number of cameras to encode all the videos of an episode in parallel, or 0 to encode them
+    # in the main process, which blocks recording until the encoding is done.
+    num_video_encoding_workers: int = 0
+    # Encode the camera frames into videos while recording, instead of writing them as png files and encoding
+    # them once the episode is saved. This removes the temporary images and the encoding time between episodes.
+    streaming_encoding: bool = False
     # Rename map for the observation to override the image and state keys
     rename_map: dict[str, str] = field(default_factory=dict)
 
@@ -401,6 +408,7 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
             cfg.dataset.repo_id,
             root=cfg.dataset.root,
             batch_encoding_size=cfg.dataset.video_encoding_batch_size,
+            streaming_encoding=cfg.dataset.streaming_encoding,
         )
 
         if hasattr(robot, "cameras") and len(robot.cameras) > 0:
@@ -408,6 +416,8 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
                 num_processes=cfg.dataset.num_image_writer_processes,
                 num_threads=cfg.dataset.num_image_writer_threads_per_camera * len(robot.cameras),
             )
+        if cfg.dataset.num_video_encoding_workers:
+            dataset.start_video_encoder(cfg.dataset.num_video_encoding_workers)
         sanity_check_dataset_robot_compatibility(dataset, robot, cfg.dataset.fps, dataset_features)
     else:
         # Create empty dataset or load existing saved episodes
@@ -422,6 +432,8 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
             image_writer_processes=cfg.dataset.num_image_writer_processes,
             image_writer_threads=cfg.dataset.num_image_writer_threads_per_camera * len(robot.cameras),
             batch_encoding_size=cfg.dataset.video_encoding_batch_size,
+            video_encoding_workers=cfg.dataset.num_video_encoding_workers,
+            streaming_encoding=cfg.dataset.streaming_encoding,
         )
 
     # Load pretrained policy
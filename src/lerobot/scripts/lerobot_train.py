@@ -27,13 +27,15 @@ from torch.optim import Optimizer
 from lerobot.configs import parser
 from lerobot.configs.train import TrainPipelineConfig
 from lerobot.datasets.factory import make_dataset
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
 from lerobot.datasets.sampler import EpisodeAwareSampler
-from lerobot.datasets.utils import cycle
+from lerobot.datasets.utils import CollatedBatchDataset, collate_batched_items, cycle
 from lerobot.envs.factory import make_env
 from lerobot.envs.utils import close_envs
 from lerobot.optim.factory import make_optimizer_and_scheduler
 from lerobot.policies.factory import make_policy, make_pre_post_processors
 from lerobot.policies.pretrained import PreTrainedPolicy
+from lerobot.processor import DeviceProcessorStep, ImageToFloatProcessorStep
 from lerobot.rl.wandb_utils import WandBLogger
 from lerobot.scripts.lerobot_eval import eval_policy_all
 from lerobot.utils.logging_utils import AverageMeter, MetricsTracker
@@ -243,6 +245,17 @@ def train(cfg: TrainPipelineConfig, accelerator: Accelerator | None = None):
         **postprocessor_kwargs,
     )
 
+    if cfg.dataset.return_uint8_frames and not any(
+        isinstance(step, ImageToFloatProcessorStep) for step in preprocessor.steps
+    ):
+        # Processors saved before `ImageToFloatProcessorStep` existed expect float images: convert them right after
+        # the transfer to the device.
+        steps = list(preprocessor.steps)
+        insert_idx = next(
+            (i + 1 for i, step in enumerate(steps) if isinstance(step, DeviceProcessorStep)), len(steps)
+        )
+        preprocessor.steps = [*steps[:insert_idx], ImageToFloatProcessorStep(), *steps[insert_idx:]]
+
     if is_main_process:
         logging.info("Creating optimizer and scheduler")
     optimizer, lr_scheduler = make_optimizer_and_scheduler(cfg, policy)
@@ -269,24 +282,26 @@ def train(cfg: TrainPipelineConfig, accelerator: Accelerator | None = None):
         logging.info(f"{num_total_params=} ({format_big_number(num_total_params)})")
 
     # create dataloader for offline training
-    if hasattr(cfg.policy, "drop_n_last_frames"):
+    if hasattr(cfg.policy, "drop_n_last_frames") or cfg.dataset.sampler_block_size > 1:
         shuffle = False
         sampler = EpisodeAwareSampler(
             dataset.meta.episodes["dataset_from_index"],
             dataset.meta.episodes["dataset_to_index"],
-            drop_n_last_frames=cfg.policy.drop_n_last_frames,
+            drop_n_last_frames=getattr(cfg.policy, "drop_n_last_frames", 0),
             shuffle=True,
+            block_size=cfg.dataset.sampler_block_size,
         )
     else:
         shuffle = True
         sampler = None
 
     dataloader = torch.utils.data.DataLoader(
-        dataset,
+        CollatedBatchDataset(dataset) if isinstance(dataset, LeRobotDataset) else dataset,
         num_workers=cfg.num_workers,
         batch_size=cfg.batch_size,
         shuffle=shuffle and not cfg.dataset.streaming,
         sampler=sampler,
+        collate_fn=collate_batched_items,
         pin_memory=device.type == "cuda",
         drop_last=False,
         prefetch_factor=2 if cfg.num_workers > 0 else None,
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team.
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compare the size and latency of the pickle and typed (`lerobot.transport.serialization`) wire formats.
+
+Serializes a robot observation (motor positions, a task and camera frames) and an action chunk, then measures
+the number of bytes, the serialization and deserialization times, and the time to split the bytes into gRPC
+messages and reassemble them (`send_bytes_in_chunks` / `receive_bytes_in_chunks`).
+
+Example:
+
+```shell
+python -m lerobot.transport.benchmark_serialization --num-cameras 2 --height 480 --width 640
+```
+"""
+
+import argparse
+import pickle  # nosec B403: Benchmarking the pickle path only
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+import torch
+
+from lerobot.transport import services_pb2
+from lerobot.transport.serialization import deserialize, serialize
+from lerobot.transport.utils import receive_bytes_in_chunks, send_bytes_in_chunks
+
+
+def make_observation(num_cameras: int, height: int, width: int, num_motors: int) -> dict[str, Any]:
+    rng = np.random.default_rng(0)
+    observation = {f"motor_{i}.pos": float(rng.uniform(-100, 100)) for i in range(num_motors)}
+    # Smooth images, for JPEG compression ratios closer to the ones of camera frames than random noise
+    gradient = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+    for i in range(num_cameras):
+        noise = rng.integers(0, 16, size=(height, width, 3))
+        observation[f"camera_{i}"] = np.clip(gradient + noise + 32 * i, 0, 255).astype(np.uint8)
+    observation["task"] = "pick up the cube and place it in the box"
+    return observation
+
+
+def benchmark(
+    encode: Callable[[Any], bytes], decode: Callable[[bytes], Any], data: Any, num_trials: int
+) -> dict[str, float]:
+    shutdown_event = threading.Event()
+    encode_time = decode_time = transfer_time = 0.0
+    for _ in range(num_trials):
+        start = time.perf_counter()
+        buffer = encode(data)
+        encode_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        messages = send_bytes_in_chunks(buffer, services_pb2.Observation, silent=True)
+        received = receive_bytes_in_chunks(messages, None, shutdown_event)
+        transfer_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        decode(received)
+        decode_time += time.perf_counter() - start
+
+    return {
+        "bytes": len(buffer),
+        "encode_ms": 1000 * encode_time / num_trials,
+        "transfer_ms": 1000 * transfer_time / num_trials,
+        "decode_ms": 1000 * decode_time / num_trials,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--num-cameras", type=int, default=2)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--num-motors", type=int, default=6)
+    parser.add_argument("--chunk-size", type=int, default=50, help="Number of actions per chunk.")
+    parser.add_argument("--jpeg-quality", type=int, default=90)
+    parser.add_argument("--num-trials", type=int, default=20)
+    args = parser.parse_args()
+
+    observation = make_observation(args.num_cameras, args.height, args.width, args.num_motors)
+    actions = {
+        "timestamps": [time.time() + i / 30 for i in range(args.chunk_size)],
+        "timesteps": list(range(args.chunk_size)),
+        "actions": torch.randn(args.chunk_size, args.num_motors),
+    }
+
+    formats = {
+        "pickle": (pickle.dumps, pickle.loads),  # nosec B301
+        "typed (raw)": (serialize, deserialize),
+        "typed (jpeg)": (
+            lambda data: serialize(data, image_encoding="jpeg", jpeg_quality=args.jpeg_quality),
+            deserialize,
+        ),
+    }
+
+    print(
+        f"Observation: {args.num_cameras} camera(s) of {args.height}x{args.width}, {args.num_motors} motors | "
+        f"Action chunk: {args.chunk_size}x{args.num_motors}"
+    )
+    print(f"{'payload':<13}{'format':<15}{'bytes':>12}{'encode ms':>12}{'transfer ms':>13}{'decode ms':>12}")
+    for payload_name, payload in [("observation", observation), ("actions", actions)]:
+        for format_name, (encode, decode) in formats.items():
+            if payload_name == "actions" and format_name == "typed (jpeg)":
+                continue  # no images to compress
+            results = benchmark(encode, decode, payload, args.num_trials)
+            print(
+                f"{payload_name:<13}{format_name:<15}{results['bytes']:>12}{results['encode_ms']:>12.3f}"
+                f"{results['transfer_ms']:>13.3f}{results['decode_ms']:>12.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
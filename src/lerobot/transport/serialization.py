@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team.
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Typed binary serialization of flat dicts of arrays, tensors and scalars.
+
+The wire format is made of a fixed-size preamble (magic bytes and header length), a JSON header and the raw
+buffers of the arrays:
+
+    MAGIC | header length (uint32, little-endian) | JSON header | padding | buffer 0 | padding | buffer 1 ...
+
+The header holds the scalar values (numbers, strings, booleans, None and lists of those) and, for every array,
+its dtype, shape, encoding and the location of its buffer. Buffers are aligned to `ALIGNMENT` bytes from the
+start of the message, so that they are decoded as numpy views of the received bytes without any copy. Unlike
+pickle, decoding never executes code. Image arrays (uint8 (H, W, 3) or (H, W, 1)) can optionally be
+JPEG-compressed.
+"""
+
+import json
+import struct
+from typing import Any
+
+import numpy as np
+import torch
+
+MAGIC = b"LRB1"
+ALIGNMENT = 64
+PREAMBLE = struct.Struct("<4sI")
+
+ENCODINGS = ["raw", "jpeg"]
+
+# dtypes numpy does not support, stored as same-size integers and viewed back as torch tensors
+TORCH_ONLY_DTYPES = {torch.bfloat16: torch.int16}
+
+
+def _is_image(array: np.ndarray) -> bool:
+    return array.dtype == np.uint8 and array.ndim == 3 and array.shape[-1] in (1, 3)
+
+
+def encode_jpeg(image: np.ndarray, quality: int) -> bytes:
+    """Encode a (H, W, C) uint8 RGB or grayscale image into JPEG bytes."""
+    import cv2  # type: ignore  # TODO: add type stubs for OpenCV
+
+    image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR) if image.shape[-1] == 3 else image[..., 0]
+    success, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not success:
+        raise RuntimeError(f"Failed to JPEG-encode image of shape {image.shape}")
+    return encoded.tobytes()
+
+
+def decode_jpeg(buffer: memoryview, shape: tuple[int, ...]) -> np.ndarray:
+    """Decode JPEG bytes into a (H, W, C) uint8 RGB or grayscale image."""
+    import cv2  # type: ignore  # TODO: add type stubs for OpenCV
+
+    encoded = np.frombuffer(buffer, dtype=np.uint8)
+    if shape[-1] == 3:
+        return cv2.cvtColor(cv2.imdecode(encoded, cv2.IMREAD_COLOR), cv2.COLOR_BGR2RGB)
+    return cv2.imdecode(encoded, cv2.IMREAD_GRAYSCALE)[..., None]
+
+
+def _to_numpy(value: np.ndarray | torch.Tensor) -> tuple[np.ndarray, str | None]:
+    """Convert a value to a contiguous numpy array, returning the torch dtype to restore, if any."""
+    if isinstance(value, np.ndarray):
+        # np.ascontiguousarray would turn 0-d arrays into 1-d arrays
+        return (value if value.flags.c_contiguous else np.ascontiguousarray(value)), None
+
+    tensor = value.detach().cpu().contiguous()
+    torch_dtype = str(tensor.dtype).removeprefix("torch.")
+    if tensor.dtype in TORCH_ONLY_DTYPES:
+        tensor = tensor.view(TORCH_ONLY_DTYPES[tensor.dtype])
+    return tensor.numpy(), torch_dtype
+
+
+def serialize(
+    data: dict[str, Any],
+    image_encoding: str = "raw",
+    jpeg_quality: int = 90,
+) -> bytes:
+    """Serialize a flat dict of numpy arrays, torch tensors and JSON-compatible scalars.
+
+    Args:
+        data: Dict to serialize. Arrays and tensors are stored as raw buffers, other values in the header.
+        image_encoding: "raw" to store images as is, or "jpeg" to JPEG-compress uint8 (H, W, C) images.
+        jpeg_quality: JPEG quality, between 0 and 100.
+
+    Returns:
+        The serialized bytes.
+    """
+    if image_encoding not in ENCODINGS:
+        raise ValueError(f"Unknown image encoding '{image_encoding}'. Available: {ENCODINGS}")
+
+    scalars = {}
+    arrays = []
+    buffers = []
+    offset = 0
+    for key, value in data.items():
+        if not isinstance(value, np.ndarray | torch.Tensor):
+            scalars[key] = value.item() if isinstance(value, np.generic) else value
+            continue
+
+        array, torch_dtype = _to_numpy(value)
+        encoding = "jpeg" if image_encoding == "jpeg" and _is_image(array) else "raw"
+        buffer = encode_jpeg(array, jpeg_quality) if encoding == "jpeg" else memoryview(array).cast("B")
+
+        padding = -offset % ALIGNMENT
+        offset += padding
+        arrays.append(
+            {
+                "key": key,
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+                "torch_dtype": torch_dtype,
+                "encoding": encoding,
+                "offset": offset,
+                "nbytes": len(buffer),
+            }
+        )
+        buffers.extend([bytes(padding), buffer])
+        offset += len(buffer)
+
+    header = json.dumps({"scalars": scalars, "arrays": arrays}).encode()
+    preamble = PREAMBLE.pack(MAGIC, len(header))
+    padding = bytes(-(len(preamble) + len(header)) % ALIGNMENT)
+
+    # Every buffer is copied exactly once, into the output bytes
+    return b"".join([preamble, header, padding, *buffers])
+
+
+def deserialize(buffer: bytes | bytearray | memoryview) -> dict[str, Any]:
+    """Deserialize bytes produced by `serialize`.
+
+    Raw arrays are returned as numpy views of `buffer` (read-only if `buffer` is), without any copy. Values
+    that were torch tensors are returned as torch tensors, which are copied only if `buffer` is read-only.
+    """
+    buffer = memoryview(buffer).cast("B")
+    magic, header_length = PREAMBLE.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Invalid magic bytes {bytes(magic)!r}, expected {MAGIC!r}")
+
+    header = json.loads(bytes(buffer[PREAMBLE.size : PREAMBLE.size + header_length]))
+    data_start = PREAMBLE.size + header_length
+    data_start += -data_start % ALIGNMENT
+
+    data = dict(header["scalars"])
+    for spec in header["arrays"]:
+        start = data_start + spec["offset"]
+        array_buffer = buffer[start : start + spec["nbytes"]]
+        shape = tuple(spec["shape"])
+        if spec["encoding"] == "jpeg":
+            array = decode_jpeg(array_buffer, shape)
+        else:
+            array = np.frombuffer(array_buffer, dtype=np.dtype(spec["dtype"])).reshape(shape)
+
+        if spec["torch_dtype"] is not None:
+            tensor = torch.from_numpy(array if array.flags.writeable else array.copy())
+            torch_dtype = getattr(torch, spec["torch_dtype"])
+            array = tensor.view(torch_dtype) if tensor.dtype != torch_dtype else tensor
+
+        data[spec["key"]] = array
+
+    return data
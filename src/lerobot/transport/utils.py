@@ -23,9 +23,12 @@ from multiprocessing import Event
 from queue import Queue
 from typing import Any
 
+import numpy as np
 import torch
 
 from lerobot.transport import services_pb2
+from lerobot.transport.serialization import deserialize, serialize
+from lerobot.utils.constants import OBS_IMAGE
 from lerobot.utils.transition import Transition
 
 CHUNK_SIZE = 2 * 1024 * 1024  # 2 MB
@@ -147,6 +150,56 @@ def transitions_to_bytes(transitions: list[Transition]) -> bytes:
     return buffer.getvalue()
 
 
+def batch_transition_to_bytes(
+    batch: dict[str, Any], image_encoding: str = "raw", jpeg_quality: int = 90
+) -> bytes:
+    """Serialize a columnar batch of transitions (see `lerobot.rl.buffer.stack_transitions`).
+
+    Every key holds one stacked tensor. With `image_encoding="jpeg"`, the (N, C, H, W) images in [0, 1] of the
+    states are converted to uint8 and JPEG-compressed frame by frame.
+    """
+    data = {}
+    jpeg_keys = []
+    for field in ("state", "next_state"):
+        for key, value in batch[field].items():
+            name = f"{field}/{key}"
+            if image_encoding == "jpeg" and key.startswith(OBS_IMAGE) and value.ndim == 4:
+                frames = (value.detach().cpu().clamp(0, 1) * 255).round().to(torch.uint8)
+                for i, frame in enumerate(frames.permute(0, 2, 3, 1).numpy()):
+                    data[f"{name}/{i}"] = frame
+                jpeg_keys.append(name)
+            else:
+                data[name] = value
+    for field in ("action", "reward", "done", "truncated"):
+        data[field] = batch[field]
+    for key, value in (batch.get("complementary_info") or {}).items():
+        data[f"complementary_info/{key}"] = value
+    data["num_transitions"] = len(batch["action"])
+    data["jpeg_keys"] = jpeg_keys
+    return serialize(data, image_encoding=image_encoding, jpeg_quality=jpeg_quality)
+
+
+def bytes_to_batch_transition(buffer: bytes) -> dict[str, Any]:
+    """Deserialize a columnar batch of transitions produced by `batch_transition_to_bytes`."""
+    data = deserialize(buffer)
+    num_transitions = data.pop("num_transitions")
+    for name in data.pop("jpeg_keys"):
+        frames = [data.pop(f"{name}/{i}") for i in range(num_transitions)]
+        data[name] = torch.from_numpy(np.stack(frames)).permute(0, 3, 1, 2).float().div_(255)
+
+    batch = {"state": {}, "next_state": {}, "complementary_info": None}
+    for name, value in data.items():
+        field, _, key = name.partition("/")
+        if field == "complementary_info":
+            batch["complementary_info"] = batch["complementary_info"] or {}
+            batch["complementary_info"][key] = value
+        elif key:
+            batch[field][key] = value
+        else:
+            batch[field] = value
+    return batch
+
+
 def grpc_channel_options(
     max_receive_message_length: int = MAX_MESSAGE_SIZE,
     max_send_message_length: int = MAX_MESSAGE_SIZE,
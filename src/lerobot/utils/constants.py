@@ -31,6 +31,8 @@ ACTION = "action"
 REWARD = "next.reward"
 TRUNCATED = "next.truncated"
 DONE = "next.done"
+# Identifiers of the sources (e.g. the robots of a policy server) of the samples of an inference batch
+BATCH_SOURCES = "batch_sources"
 
 ROBOTS = "robots"
 TELEOPERATORS = "teleoperators"
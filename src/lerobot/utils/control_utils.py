@@ -108,7 +108,10 @@ def predict_action(
 
         # Compute the next action with the policy
         # based on the current observation
-        action = policy.select_action(observation)
+        if policy.config.chunk_prefetch_threshold is not None:
+            action = policy.select_action_with_prefetch(observation)
+        else:
+            action = policy.select_action(observation)
 
         action = postprocessor(action)
 